@@ -5,28 +5,85 @@ Main CLI entry point for the application.
 """
 
 import argparse
+import asyncio
+import atexit
+import logging
+import queue
 import sys
-import json
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
 from rich.console import Console
-from rich.table import Table
 from rich.panel import Panel
-from rich.markdown import Markdown
 from dotenv import load_dotenv
 
-from src.orchestrator import TaskCoordinator, MultiLLMRouter
-from src.agents import (
-    StockAnalystAgent,
-    CryptoAnalystAgent,
-    TechnicalAgent,
-    FundamentalAgent
-)
+from src.utils import fastjson, install_uvloop, iter_sync, run_in_background
+
+# Agents, the orchestrator and LangChain are imported inside each command so
+# that a subcommand only pays for the modules it actually uses.
 
 # Load environment variables
 load_dotenv()
 
-# Initialize Rich console for beautiful output
+# Initialize Rich console for beautiful output. Results go to stdout; the
+# banner and progress messages go to stderr so JSON on stdout stays parseable.
 console = Console()
+status_console = Console(stderr=True)
+
+logger = logging.getLogger(__name__)
+
+
+class _InProcessQueueHandler(QueueHandler):
+    """QueueHandler that keeps exc_info so Rich can still render tracebacks."""
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def setup_logging(level: int = logging.INFO):
+    """
+    Route log records (including tracebacks) through Rich on stderr.
+    
+    Records are handed to a background listener thread, so warnings logged
+    from the concurrent data fetches never block on terminal output.
+    """
+    from rich.logging import RichHandler
+    
+    rich_handler = RichHandler(console=Console(stderr=True), rich_tracebacks=True)
+    rich_handler.setFormatter(logging.Formatter("%(message)s", datefmt="[%X]"))
+    
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    listener = QueueListener(log_queue, rich_handler)
+    listener.start()
+    atexit.register(listener.stop)
+    
+    logging.basicConfig(level=level, handlers=[_InProcessQueueHandler(log_queue)])
+
+
+def warm_up_connections(asset_type: str):
+    """
+    Start connecting to the data APIs an analysis of asset_type will call.
+    
+    Runs in the background on the shared event loop the agents fetch on, so
+    the handshakes overlap with agent and LLM setup instead of delaying the
+    first fetch.
+    """
+    from src.mcp_clients import (
+        CryptoClient,
+        FinancialDatasetsClient,
+        StockFlowClient,
+        StockScreenClient,
+        TradingViewClient,
+    )
+    
+    if asset_type == "crypto":
+        clients = [CryptoClient]
+    else:
+        clients = [FinancialDatasetsClient, TradingViewClient, StockScreenClient, StockFlowClient]
+    
+    async def warm_up():
+        await asyncio.gather(*[client.shared().awarm_up() for client in clients])
+    
+    run_in_background(warm_up())
 
 
 def print_banner():
@@ -40,7 +97,19 @@ def print_banner():
     ║                                                           ║
     ╚═══════════════════════════════════════════════════════════╝
     """
-    console.print(banner, style="bold cyan")
+    status_console.print(banner, style="bold cyan")
+
+
+def _use_json_output(output_format: str) -> bool:
+    """JSON is used when requested or when stdout is piped, skipping Rich rendering."""
+    return output_format == "json" or not sys.stdout.isatty()
+
+
+def print_json_result(result: dict):
+    """Write a result as indented JSON bytes straight to stdout."""
+    sys.stdout.flush()
+    sys.stdout.buffer.write(fastjson.dumps(result, indent=True) + b"\n")
+    sys.stdout.buffer.flush()
 
 
 def analyze_stock(
@@ -49,9 +118,12 @@ def analyze_stock(
     output_format: str = "text"
 ):
     """Analyze a stock."""
-    console.print(f"\n[bold green]Analyzing {ticker}...[/bold green]\n")
+    status_console.print(f"\n[bold green]Analyzing {ticker}...[/bold green]\n")
     
     try:
+        from src.agents import FundamentalAgent, TechnicalAgent
+        from src.orchestrator import TaskCoordinator
+        
         coordinator = TaskCoordinator()
         
         if analysis_type == "comprehensive":
@@ -63,30 +135,35 @@ def analyze_stock(
             agent = TechnicalAgent()
             result = agent.analyze_technical(ticker)
         else:
-            console.print(f"[red]Unknown analysis type: {analysis_type}[/red]")
+            status_console.print(f"[red]Unknown analysis type: {analysis_type}[/red]")
             return
         
         # Display results
-        if output_format == "json":
-            console.print_json(data=result)
+        if _use_json_output(output_format):
+            print_json_result(result)
         else:
-            display_analysis_result(result, ticker)
+            display_analysis_result(result, ticker, output_format)
     
-    except Exception as e:
-        console.print(f"[red]Error analyzing {ticker}: {e}[/red]")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception("Error analyzing %s", ticker)
 
 
 def analyze_crypto(
     symbol: str,
     include_onchain: bool = True,
-    output_format: str = "text"
+    output_format: str = "text",
+    stream: bool = False
 ):
     """Analyze a cryptocurrency."""
-    console.print(f"\n[bold green]Analyzing {symbol}...[/bold green]\n")
+    status_console.print(f"\n[bold green]Analyzing {symbol}...[/bold green]\n")
     
     try:
+        if stream and not _use_json_output(output_format):
+            stream_crypto_analysis(symbol, include_onchain)
+            return
+        
+        from src.orchestrator import TaskCoordinator
+        
         coordinator = TaskCoordinator()
         result = coordinator.analyze_crypto_comprehensive(
             symbol,
@@ -94,66 +171,102 @@ def analyze_crypto(
         )
         
         # Display results
-        if output_format == "json":
-            console.print_json(data=result)
+        if _use_json_output(output_format):
+            print_json_result(result)
         else:
-            display_analysis_result(result, symbol)
+            display_analysis_result(result, symbol, output_format)
+    
+    except Exception:
+        logger.exception("Error analyzing %s", symbol)
+
+
+def stream_crypto_analysis(symbol: str, include_onchain: bool = True):
+    """
+    Render a crypto analysis progressively as the LLM generates it.
+    
+    The stream runs on the shared event loop the other commands use, so it
+    reuses the warmed, pooled connections and the LLM pool's rate limit.
+    """
+    from rich.live import Live
+    from rich.markdown import Markdown
+    from src.agents import CryptoAnalystAgent
+    
+    agent = CryptoAnalystAgent()
+    text = ""
+    
+    console.print(Panel(
+        f"[bold cyan]Analysis Report for {symbol}[/bold cyan]",
+        expand=False
+    ))
     
-    except Exception as e:
-        console.print(f"[red]Error analyzing {symbol}: {e}[/red]")
-        import traceback
-        traceback.print_exc()
+    with Live(Markdown(text), console=console, refresh_per_second=8) as live:
+        for chunk in iter_sync(agent.astream_crypto(symbol, include_onchain=include_onchain)):
+            text += chunk
+            live.update(Markdown(text))
+
+
+def _make_coordinator(tickers: list, concurrency: int = None):
+    """
+    TaskCoordinator for a multi-asset command.
+    
+    --concurrency sets both the number of assets in flight and the number of
+    agent calls in flight across them; without it assets run one per ticker
+    (up to 16) and agent calls keep the coordinator's default limit.
+    """
+    from src.orchestrator import TaskCoordinator
+    
+    if concurrency:
+        return TaskCoordinator(max_workers=concurrency, max_inflight=concurrency)
+    return TaskCoordinator(max_workers=min(len(tickers), 16))
 
 
 def compare_assets(
     tickers: list,
     asset_type: str = "stock",
-    output_format: str = "text"
+    output_format: str = "text",
+    concurrency: int = None
 ):
     """Compare multiple assets."""
-    console.print(f"\n[bold green]Comparing {', '.join(tickers)}...[/bold green]\n")
+    status_console.print(f"\n[bold green]Comparing {', '.join(tickers)}...[/bold green]\n")
     
     try:
-        coordinator = TaskCoordinator()
+        coordinator = _make_coordinator(tickers, concurrency)
         result = coordinator.compare_assets(tickers, asset_type=asset_type)
         
         # Display results
-        if output_format == "json":
-            console.print_json(data=result)
+        if _use_json_output(output_format):
+            print_json_result(result)
         else:
             display_comparison_result(result, tickers)
     
-    except Exception as e:
-        console.print(f"[red]Error comparing assets: {e}[/red]")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception("Error comparing assets")
 
 
 def batch_analyze(
     tickers: list,
     asset_type: str = "stock",
-    output_format: str = "text"
+    output_format: str = "text",
+    concurrency: int = None
 ):
     """Batch analyze multiple assets."""
-    console.print(f"\n[bold green]Batch analyzing {len(tickers)} {asset_type}s...[/bold green]\n")
+    status_console.print(f"\n[bold green]Batch analyzing {len(tickers)} {asset_type}s...[/bold green]\n")
     
     try:
-        coordinator = TaskCoordinator()
+        coordinator = _make_coordinator(tickers, concurrency)
         result = coordinator.batch_analyze(tickers, asset_type=asset_type)
         
         # Display results
-        if output_format == "json":
-            console.print_json(data=result)
+        if _use_json_output(output_format):
+            print_json_result(result)
         else:
             display_batch_result(result)
     
-    except Exception as e:
-        console.print(f"[red]Error in batch analysis: {e}[/red]")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception("Error in batch analysis")
 
 
-def display_analysis_result(result: dict, ticker: str):
+def display_analysis_result(result: dict, ticker: str, output_format: str = "text"):
     """Display analysis result in a formatted way."""
     # Title
     console.print(Panel(
@@ -194,20 +307,29 @@ def display_analysis_result(result: dict, ticker: str):
             console.print(f"[bold yellow]▶ {agent_type.replace('_', ' ').title()}[/bold yellow]")
             
             if "analysis" in analysis_data:
-                # Display as markdown for better formatting
-                md = Markdown(analysis_data["analysis"])
-                console.print(md)
+                _print_analysis(analysis_data["analysis"], output_format)
             
             console.print("\n" + "─" * 80 + "\n")
     
     # Single analysis (non-comprehensive)
     elif "analysis" in result:
-        md = Markdown(result["analysis"])
-        console.print(md)
+        _print_analysis(result["analysis"], output_format)
+
+
+def _print_analysis(analysis: str, output_format: str = "text"):
+    """Print analysis text, rendering Markdown only for text output."""
+    if output_format == "text":
+        # Display as markdown for better formatting
+        from rich.markdown import Markdown
+        console.print(Markdown(analysis))
+    else:
+        console.print(analysis, markup=False, highlight=False)
 
 
 def display_comparison_result(result: dict, tickers: list):
     """Display comparison result."""
+    from rich.markdown import Markdown
+    
     console.print(Panel(
         f"[bold cyan]Comparison: {', '.join(tickers)}[/bold cyan]",
         expand=False
@@ -225,6 +347,8 @@ def display_comparison_result(result: dict, tickers: list):
 
 def display_batch_result(result: dict):
     """Display batch analysis result."""
+    from rich.table import Table
+    
     console.print(Panel(
         f"[bold cyan]Batch Analysis Results[/bold cyan]",
         expand=False
@@ -259,6 +383,8 @@ def list_models():
     """List available LLM models."""
     console.print("\n[bold cyan]Available LLM Models[/bold cyan]\n")
     
+    from src.orchestrator import MultiLLMRouter
+    
     router = MultiLLMRouter()
     available = router.get_available_models()
     
@@ -315,6 +441,11 @@ def main():
         default="text",
         help="Output format"
     )
+    crypto_parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream the analysis as it is generated (text output only)"
+    )
     
     # Compare command
     compare_parser = subparsers.add_parser("compare", help="Compare multiple assets")
@@ -331,6 +462,16 @@ def main():
         default="text",
         help="Output format"
     )
+    compare_parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help=(
+            "Number of assets to analyze in parallel, and of agent calls in flight "
+            "across them (default: one asset per ticker, up to 16, with agent calls "
+            "separately limited to 4)"
+        )
+    )
     
     # Batch analysis command
     batch_parser = subparsers.add_parser("batch", help="Batch analyze multiple assets")
@@ -347,12 +488,35 @@ def main():
         default="text",
         help="Output format"
     )
+    batch_parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help=(
+            "Number of assets to analyze in parallel, and of agent calls in flight "
+            "across them (default: one asset per ticker, up to 16, with agent calls "
+            "separately limited to 4)"
+        )
+    )
     
     # List models command
     subparsers.add_parser("models", help="List available LLM models")
     
     args = parser.parse_args()
     
+    setup_logging()
+    
+    # Faster event loop for the async LLM/HTTP fan-out, when available
+    install_uvloop()
+    
+    # Warm the connections while the banner prints and the agents load
+    if args.command == "stock":
+        warm_up_connections("stock")
+    elif args.command == "crypto":
+        warm_up_connections("crypto")
+    elif args.command in ("compare", "batch"):
+        warm_up_connections(args.type)
+    
     # Print banner
     print_banner()
     
@@ -360,11 +524,11 @@ def main():
     if args.command == "stock":
         analyze_stock(args.ticker, args.type, args.format)
     elif args.command == "crypto":
-        analyze_crypto(args.symbol, not args.no_onchain, args.format)
+        analyze_crypto(args.symbol, not args.no_onchain, args.format, args.stream)
     elif args.command == "compare":
-        compare_assets(args.tickers, args.type, args.format)
+        compare_assets(args.tickers, args.type, args.format, args.concurrency)
     elif args.command == "batch":
-        batch_analyze(args.tickers, args.type, args.format)
+        batch_analyze(args.tickers, args.type, args.format, args.concurrency)
     elif args.command == "models":
         list_models()
     else:
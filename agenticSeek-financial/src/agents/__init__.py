@@ -1,9 +1,6 @@
 """Financial Analysis Agents."""
 
-from .stock_analyst_agent import StockAnalystAgent
-from .crypto_analyst_agent import CryptoAnalystAgent
-from .technical_agent import TechnicalAgent
-from .fundamental_agent import FundamentalAgent
+import importlib
 
 __all__ = [
     "StockAnalystAgent",
@@ -11,3 +8,20 @@ __all__ = [
     "TechnicalAgent",
     "FundamentalAgent",
 ]
+
+# Each agent pulls in LangChain and its LLM SDKs, so an agent's module is
+# imported on first use rather than with the package.
+_AGENT_MODULES = {
+    "StockAnalystAgent": ".stock_analyst_agent",
+    "CryptoAnalystAgent": ".crypto_analyst_agent",
+    "TechnicalAgent": ".technical_agent",
+    "FundamentalAgent": ".fundamental_agent",
+}
+
+
+def __getattr__(name):
+    if name in _AGENT_MODULES:
+        value = getattr(importlib.import_module(_AGENT_MODULES[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
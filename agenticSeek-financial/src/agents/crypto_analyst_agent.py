@@ -1,12 +1,179 @@
 """Crypto Analyst Agent for cryptocurrency analysis."""
 
-from typing import Dict, List, Optional, Any
+import asyncio
+import copy
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+import numpy as np
 from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_openai import ChatOpenAI
-from langchain_anthropic import ChatAnthropic
-from langchain_groq import ChatGroq
 
 from ..mcp_clients import CryptoClient
+from ..llm import async_pool, get_llm
+from ..utils import fastjson, now_iso, run_sync
+from ..llm.generative_cache import GenerativeCache, response_cache, make_key, price_bucket, fear_greed_bucket
+
+
+def _summarize_ohlcv(ohlcv: List[Dict[str, Any]]) -> Optional[Dict[str, float]]:
+    """
+    Summarize OHLCV bars into a handful of prompt-sized statistics.
+    
+    All reductions are vectorized over one contiguous float64 array, so even
+    long intraday windows cost a few array passes rather than Python loops.
+    
+    Args:
+        ohlcv: Bars with "open", "high", "low", "close", "volume" keys, oldest first
+        
+    Returns:
+        Summary statistics, or None if there are fewer than two usable bars
+    """
+    rows = [
+        (bar.get("high"), bar.get("low"), bar.get("close"), bar.get("volume") or 0.0)
+        for bar in ohlcv
+        if bar.get("close") is not None
+    ]
+    if len(rows) < 2:
+        return None
+    
+    arr = np.asarray(rows, dtype=np.float64)
+    close, volume = arr[:, 2], arr[:, 3]
+    # Bars missing high/low fall back to the close
+    high = np.where(np.isnan(arr[:, 0]), close, arr[:, 0])
+    low = np.where(np.isnan(arr[:, 1]), close, arr[:, 1])
+    
+    returns = np.diff(close) / close[:-1]
+    running_max = np.maximum.accumulate(close)
+    drawdown = (close - running_max) / running_max
+    lookback = min(7, len(close) - 1)
+    
+    return {
+        "periods": len(close),
+        "period_return": float(close[-1] / close[0] - 1) * 100,
+        "return_7": float(close[-1] / close[-1 - lookback] - 1) * 100,
+        "mean_close": float(close.mean()),
+        "volatility": float(returns.std()) * 100,
+        "max_drawdown": float(drawdown.min()) * 100,
+        "period_high": float(high.max()),
+        "period_low": float(low.min()),
+        "avg_volume": float(volume.mean()),
+    }
+
+
+# Full analyze_crypto results from the last few minutes, so repeat requests
+# (e.g. analyze then compare) skip both the data fetches and the LLM call
+_analysis_memo = GenerativeCache(ttl=300, max_entries=128)
+
+
+_MISSING = (None, "", "N/A")
+
+# Section field specs: (label, key, format, keep_zero). Formats are applied to
+# numeric values; a zero is only shown where it carries meaning (e.g. % change).
+_PRICE_FIELDS = (
+    ("Current Price", "price", "${}", False),
+    ("24h Change", "price_change_24h", "{}%", True),
+    ("7d Change", "price_change_7d", "{}%", True),
+)
+
+_MARKET_FIELDS = (
+    ("Market Cap", "market_cap", "${:,.0f}", False),
+    ("24h Volume", "volume_24h", "${:,.0f}", False),
+    ("Circulating Supply", "circulating_supply", "{:,.0f}", False),
+    ("Max Supply", "max_supply", "{}", False),
+    ("Market Cap Rank", "market_cap_rank", "#{}", False),
+)
+
+_ONCHAIN_FIELDS = (
+    ("Active Addresses", "active_addresses", "{}", False),
+    ("Transaction Count", "transaction_count", "{}", False),
+    ("Network Activity", "network_activity", "{}", False),
+)
+
+_DEFI_FIELDS = (
+    ("TVL", "tvl", "${:,.0f}", False),
+    ("24h Volume", "volume_24h", "${:,.0f}", False),
+    ("Protocol Revenue", "revenue", "${:,.0f}", False),
+)
+
+_HISTORY_SECTION = """Periods: {periods}
+Period Return: {period_return:.2f}%
+Last 7 Periods Return: {return_7:.2f}%
+Range: ${period_low:,.2f} - ${period_high:,.2f}
+Mean Close: ${mean_close:,.2f}
+Volatility (per-period std): {volatility:.2f}%
+Max Drawdown: {max_drawdown:.2f}%
+Average Volume: {avg_volume:,.0f}
+"""
+
+_NEWS_TITLE_MAX_CHARS = 120
+
+
+def _render_fields(values: Dict[str, Any], fields: tuple) -> str:
+    """
+    Render the fields that have real values, one "Label: value" per line.
+    
+    Missing/N/A values (and zeros, unless keep_zero) are dropped so they don't
+    cost prompt tokens. Returns "" if nothing is left to show.
+    """
+    lines = []
+    
+    for label, key, fmt, keep_zero in fields:
+        value = values.get(key)
+        if value in _MISSING or (value == 0 and not keep_zero and not isinstance(value, bool)):
+            continue
+        try:
+            rendered = fmt.format(value)
+        except (TypeError, ValueError):
+            rendered = str(value)
+        lines.append(f"{label}: {rendered}")
+    
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def _compile_section_formatter(provider: str) -> Callable[[str, Optional[str], str], str]:
+    """
+    Build the section formatter for a provider's preferred prompt layout.
+    
+    Anthropic models are tuned to read XML-tagged context, so each section is
+    wrapped in a tag; other providers get compact "TITLE:" headers, which
+    spend fewer tokens on structure.
+    
+    Returns:
+        Function of (tag, title, body) returning the formatted section
+    """
+    if provider.lower() == "anthropic":
+        def format_section(tag: str, title: Optional[str], body: str) -> str:
+            return f"<{tag}>\n{body}</{tag}>\n"
+    else:
+        def format_section(tag: str, title: Optional[str], body: str) -> str:
+            return f"{title}:\n{body}" if title else body
+    
+    return format_section
+
+
+def _truncate(text: str, limit: int) -> str:
+    """Truncate text to limit characters, marking the cut with an ellipsis."""
+    return text if len(text) <= limit else text[:limit - 1].rstrip() + "…"
+
+
+_ANALYSIS_PROMPT = """Analyze {symbol} cryptocurrency based on the following data:
+
+{data}
+Provide a comprehensive analysis with:
+1. Current market position and trends
+2. Key strengths and weaknesses
+3. Investment recommendation (BUY/HOLD/SELL)
+4. Confidence level (1-10)
+5. Key risks and catalysts
+6. Price targets (short-term and long-term)
+7. Risk assessment (emphasize volatility)
+"""
+
+_BATCH_ANALYSIS_PROMPT = """Analyze and compare the following cryptocurrencies based on the data below.
+
+{blocks}Respond with a single JSON object and nothing else, in this shape:
+{{"analyses": [{{"symbol": "...", "analysis": "...", "recommendation": "BUY|HOLD|SELL", "confidence": 1-10}}], "ranking": ["best symbol first", "..."], "rationale": "..."}}
+Include one entry in "analyses" per cryptocurrency. Each analysis should cover market position, strengths and weaknesses, key risks and catalysts, and volatility. The rationale should justify each ranking position in terms of risk/reward.
+"""
 
 
 class CryptoAnalystAgent:
@@ -27,7 +194,9 @@ class CryptoAnalystAgent:
             temperature: Temperature for LLM
         """
         self.llm = self._initialize_llm(llm_provider, model_name, temperature)
-        self.crypto_client = CryptoClient()
+        self.model_name = model_name
+        self._format_section = _compile_section_formatter(llm_provider)
+        self.crypto_client = CryptoClient.shared()
         
         self.system_prompt = """You are an expert cryptocurrency analyst with deep knowledge of blockchain technology, DeFi, and crypto markets.
 Your role is to analyze cryptocurrencies comprehensively and provide actionable investment insights.
@@ -46,20 +215,14 @@ Always emphasize the high-risk nature of cryptocurrency investments."""
     
     def _initialize_llm(self, provider: str, model_name: str, temperature: float):
         """Initialize the appropriate LLM based on provider."""
-        if provider.lower() == "openai":
-            return ChatOpenAI(model=model_name, temperature=temperature)
-        elif provider.lower() == "anthropic":
-            return ChatAnthropic(model=model_name, temperature=temperature)
-        elif provider.lower() == "groq":
-            return ChatGroq(model=model_name, temperature=temperature)
-        else:
-            raise ValueError(f"Unsupported LLM provider: {provider}")
+        return get_llm(provider, model_name, temperature, streaming=True)
     
     def analyze_crypto(
         self,
         symbol: str,
         include_onchain: bool = True,
-        include_defi: bool = False
+        include_defi: bool = False,
+        force_refresh: bool = False
     ) -> Dict[str, Any]:
         """
         Analyze a cryptocurrency comprehensively.
@@ -68,65 +231,246 @@ Always emphasize the high-risk nature of cryptocurrency investments."""
             symbol: Crypto symbol (e.g., "BTC", "ETH")
             include_onchain: Include on-chain metrics
             include_defi: Include DeFi metrics (if applicable)
+            force_refresh: Re-fetch market data and skip cached analyses
             
         Returns:
             Analysis results with recommendation
         """
+        memo_key = self._memo_key(symbol, include_onchain, include_defi)
+        if not force_refresh:
+            recent = _analysis_memo.get(memo_key)
+            if recent is not None:
+                return copy.deepcopy(recent)
+        
         # Gather crypto data
-        data = self._gather_crypto_data(symbol, include_onchain, include_defi)
+        data = self._gather_crypto_data(symbol, include_onchain, include_defi, force_refresh)
+        
+        # Reuse a recent analysis if the market hasn't moved
+        cache_key = self._analysis_cache_key(symbol, data, include_onchain, include_defi)
+        analysis = None if force_refresh else response_cache.get(cache_key)
+        
+        if analysis is None:
+            # Create analysis prompt
+            prompt = self._create_analysis_prompt(symbol, data)
+            
+            # Get LLM analysis
+            messages = [
+                SystemMessage(content=self.system_prompt),
+                HumanMessage(content=prompt)
+            ]
+            
+            response = self.llm.invoke(messages)
+            analysis = response.content
+            response_cache.put(cache_key, analysis)
+        
+        result = {
+            "symbol": symbol,
+            "analysis": analysis,
+            "data": data,
+            "timestamp": self._get_timestamp()
+        }
+        _analysis_memo.put(memo_key, copy.deepcopy(result))
+        return result
+    
+    async def aanalyze_crypto(
+        self,
+        symbol: str,
+        include_onchain: bool = True,
+        include_defi: bool = False,
+        force_refresh: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Async variant of analyze_crypto.
+        
+        Data fetches run concurrently and the LLM call goes through the
+        rate-limited async pool, so several symbols can be analyzed at once
+        with asyncio.gather without bursting past the provider's QPM.
+        
+        Args:
+            symbol: Crypto symbol (e.g., "BTC", "ETH")
+            include_onchain: Include on-chain metrics
+            include_defi: Include DeFi metrics (if applicable)
+            force_refresh: Re-fetch market data and skip cached analyses
+            
+        Returns:
+            Analysis results with recommendation
+        """
+        memo_key = self._memo_key(symbol, include_onchain, include_defi)
+        if not force_refresh:
+            recent = _analysis_memo.get(memo_key)
+            if recent is not None:
+                return copy.deepcopy(recent)
+        
+        data = await self._agather_crypto_data(symbol, include_onchain, include_defi, force_refresh)
+        
+        cache_key = self._analysis_cache_key(symbol, data, include_onchain, include_defi)
+        analysis = None if force_refresh else response_cache.get(cache_key)
+        
+        if analysis is None:
+            prompt = self._create_analysis_prompt(symbol, data)
+            
+            messages = [
+                SystemMessage(content=self.system_prompt),
+                HumanMessage(content=prompt)
+            ]
+            
+            response = await async_pool.submit(lambda: self.llm.ainvoke(messages))
+            analysis = response.content
+            response_cache.put(cache_key, analysis)
+        
+        result = {
+            "symbol": symbol,
+            "analysis": analysis,
+            "data": data,
+            "timestamp": self._get_timestamp()
+        }
+        _analysis_memo.put(memo_key, copy.deepcopy(result))
+        return result
+    
+    async def astream_crypto(
+        self,
+        symbol: str,
+        include_onchain: bool = True,
+        include_defi: bool = False,
+        force_refresh: bool = False
+    ) -> AsyncIterator[str]:
+        """
+        Stream an analysis of a cryptocurrency as it is generated.
+        
+        Args:
+            symbol: Crypto symbol (e.g., "BTC", "ETH")
+            include_onchain: Include on-chain metrics
+            include_defi: Include DeFi metrics (if applicable)
+            force_refresh: Re-fetch market data and skip cached analyses
+            
+        Yields:
+            Chunks of analysis text
+        """
+        data = await self._agather_crypto_data(symbol, include_onchain, include_defi, force_refresh)
+        
+        cache_key = self._analysis_cache_key(symbol, data, include_onchain, include_defi)
+        cached = None if force_refresh else response_cache.get(cache_key)
+        if cached is not None:
+            yield cached
+            return
         
-        # Create analysis prompt
         prompt = self._create_analysis_prompt(symbol, data)
         
-        # Get LLM analysis
         messages = [
             SystemMessage(content=self.system_prompt),
             HumanMessage(content=prompt)
         ]
         
-        response = self.llm.invoke(messages)
+        parts = []
+        async with async_pool.slot():
+            async for chunk in self.llm.astream(messages):
+                if chunk.content:
+                    parts.append(chunk.content)
+                    yield chunk.content
         
-        return {
-            "symbol": symbol,
-            "analysis": response.content,
-            "data": data,
-            "timestamp": self._get_timestamp()
-        }
+        response_cache.put(cache_key, "".join(parts))
     
     def _gather_crypto_data(
         self,
         symbol: str,
         include_onchain: bool,
-        include_defi: bool
+        include_defi: bool,
+        force_refresh: bool = False
     ) -> Dict[str, Any]:
-        """Gather cryptocurrency data from multiple sources."""
-        data = {}
+        """Gather cryptocurrency data from multiple sources in parallel."""
+        calls = self._crypto_data_calls(symbol, include_onchain, include_defi, force_refresh)
+        
+        with ThreadPoolExecutor(max_workers=len(calls)) as executor:
+            futures = {
+                executor.submit(getattr(self.crypto_client, method), *args, **kwargs): name
+                for name, (method, args, kwargs) in calls.items()
+            }
+            results = {futures[future]: future.result() for future in as_completed(futures)}
+        
+        # Keep the usual key order for prompt building and output
+        return {name: results[name] for name in calls}
+    
+    async def _agather_crypto_data(
+        self,
+        symbol: str,
+        include_onchain: bool,
+        include_defi: bool,
+        force_refresh: bool = False
+    ) -> Dict[str, Any]:
+        """Gather cryptocurrency data over the client's pooled async HTTP connection."""
+        calls = self._crypto_data_calls(symbol, include_onchain, include_defi, force_refresh)
+        
+        results = await asyncio.gather(*[
+            getattr(self.crypto_client, f"a{method}")(*args, **kwargs)
+            for method, args, kwargs in calls.values()
+        ])
+        return dict(zip(calls.keys(), results))
+    
+    def _crypto_data_calls(
+        self,
+        symbol: str,
+        include_onchain: bool,
+        include_defi: bool,
+        force_refresh: bool
+    ) -> Dict[str, tuple]:
+        """
+        Map each data key to the client call that fetches it.
+        
+        Values are (method_name, args, kwargs); the async path calls the
+        "a"-prefixed variant of the same CryptoClient method.
+        """
+        refresh = {"force_refresh": force_refresh}
         
         # Basic price and market data
-        data["price"] = self.crypto_client.get_crypto_price(symbol)
-        data["market_data"] = self.crypto_client.get_market_data(symbol)
-        data["ohlcv"] = self.crypto_client.get_crypto_ohlcv(symbol)
+        calls = {
+            "price": ("get_crypto_price", (symbol,), refresh),
+            "market_data": ("get_market_data", (symbol,), refresh),
+            "ohlcv": ("get_crypto_ohlcv", (symbol,), refresh),
+        }
         
         # On-chain metrics
         if include_onchain:
-            data["onchain_metrics"] = self.crypto_client.get_on_chain_metrics(symbol)
+            calls["onchain_metrics"] = ("get_on_chain_metrics", (symbol,), refresh)
         
-        # DeFi metrics
+        # DeFi metrics (may not be available for all cryptos)
         if include_defi:
-            # Try to get DeFi metrics (may not be available for all cryptos)
-            protocol_name = symbol.lower()
-            data["defi_metrics"] = self.crypto_client.get_defi_metrics(protocol_name)
-        
-        # Market sentiment
-        data["fear_greed"] = self.crypto_client.get_fear_greed_index()
-        
-        # News
-        data["news"] = self.crypto_client.get_crypto_news(symbol, limit=10)
+            calls["defi_metrics"] = ("get_defi_metrics", (symbol.lower(),), refresh)
         
-        # Exchange listings
-        data["exchanges"] = self.crypto_client.get_crypto_exchanges(symbol)
+        # Market sentiment, news and exchange listings
+        calls["fear_greed"] = ("get_fear_greed_index", (), refresh)
+        calls["news"] = ("get_crypto_news", (symbol,), {"limit": 10, **refresh})
+        calls["exchanges"] = ("get_crypto_exchanges", (symbol,), refresh)
         
-        return data
+        return calls
+    
+    def _memo_key(self, symbol: str, include_onchain: bool, include_defi: bool) -> tuple:
+        """Key for memoized analyze_crypto results."""
+        return (self.model_name, symbol.upper(), include_onchain, include_defi)
+    
+    def _recent_analysis(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Return any still-fresh memoized analysis of symbol, whatever its options."""
+        for include_onchain in (False, True):
+            for include_defi in (False, True):
+                recent = _analysis_memo.get(self._memo_key(symbol, include_onchain, include_defi))
+                if recent is not None:
+                    return copy.deepcopy(recent)
+        return None
+    
+    def _analysis_cache_key(
+        self,
+        symbol: str,
+        data: Dict[str, Any],
+        include_onchain: bool,
+        include_defi: bool
+    ) -> str:
+        """Cache key for an analysis: only the fields that move the answer."""
+        price_data = data.get("price") or {}
+        return make_key(
+            "crypto", self.system_prompt, self.model_name, symbol.upper(),
+            include_onchain, include_defi,
+            price_bucket(price_data.get("price")),
+            fear_greed_bucket(data.get("fear_greed"))
+        )
     
     def _create_analysis_prompt(
         self,
@@ -134,62 +478,94 @@ Always emphasize the high-risk nature of cryptocurrency investments."""
         data: Dict[str, Any]
     ) -> str:
         """Create analysis prompt for LLM."""
-        prompt = f"Analyze {symbol} cryptocurrency based on the following data:\n\n"
+        return _ANALYSIS_PROMPT.format(symbol=symbol, data=self._format_crypto_data(data))
+    
+    def _create_batch_analysis_prompt(
+        self,
+        symbols: List[str],
+        data_by_symbol: Dict[str, Dict[str, Any]]
+    ) -> str:
+        """Create a single prompt that analyzes and ranks several cryptos."""
+        blocks = "".join(
+            f"=== {symbol} ===\n{self._format_crypto_data(data_by_symbol[symbol])}\n"
+            for symbol in symbols
+        )
+        return _BATCH_ANALYSIS_PROMPT.format(blocks=blocks)
+    
+    def _parse_batch_analysis(self, content: str) -> Optional[Dict[str, Any]]:
+        """Parse the JSON object returned for a batch analysis prompt."""
+        start = content.find("{")
+        end = content.rfind("}")
+        if start == -1 or end <= start:
+            return None
+        
+        try:
+            parsed = fastjson.loads(content[start:end + 1])
+        except ValueError:
+            return None
+        
+        if not isinstance(parsed, dict) or not isinstance(parsed.get("analyses"), list):
+            return None
+        return parsed
+    
+    def _format_crypto_data(self, data: Dict[str, Any]) -> str:
+        """Format gathered crypto data as prompt sections, skipping empty fields."""
+        # (tag, title, body) per section, laid out by the provider's formatter
+        sections = []
         
         # Price and market data
         if data.get("price"):
-            price_data = data["price"]
-            prompt += f"Current Price: ${price_data.get('price', 'N/A')}\n"
-            prompt += f"24h Change: {price_data.get('price_change_24h', 'N/A')}%\n"
-            prompt += f"7d Change: {price_data.get('price_change_7d', 'N/A')}%\n\n"
+            sections.append(("price", None, _render_fields(data["price"], _PRICE_FIELDS)))
+        
+        # Price history statistics
+        summary = _summarize_ohlcv(data["ohlcv"]) if data.get("ohlcv") else None
+        if summary:
+            sections.append(("price_history", "PRICE HISTORY", _HISTORY_SECTION.format_map(summary)))
         
         if data.get("market_data"):
-            market = data["market_data"]
-            prompt += "MARKET METRICS:\n"
-            prompt += f"Market Cap: ${market.get('market_cap', 'N/A'):,.0f}\n"
-            prompt += f"24h Volume: ${market.get('volume_24h', 'N/A'):,.0f}\n"
-            prompt += f"Circulating Supply: {market.get('circulating_supply', 'N/A'):,.0f}\n"
-            prompt += f"Max Supply: {market.get('max_supply', 'N/A')}\n"
-            prompt += f"Market Cap Rank: #{market.get('market_cap_rank', 'N/A')}\n\n"
+            sections.append((
+                "market_metrics", "MARKET METRICS",
+                _render_fields(data["market_data"], _MARKET_FIELDS)
+            ))
         
         # On-chain metrics
         if data.get("onchain_metrics"):
-            onchain = data["onchain_metrics"]
-            prompt += "ON-CHAIN METRICS:\n"
-            prompt += f"Active Addresses: {onchain.get('active_addresses', 'N/A')}\n"
-            prompt += f"Transaction Count: {onchain.get('transaction_count', 'N/A')}\n"
-            prompt += f"Network Activity: {onchain.get('network_activity', 'N/A')}\n\n"
+            sections.append((
+                "onchain_metrics", "ON-CHAIN METRICS",
+                _render_fields(data["onchain_metrics"], _ONCHAIN_FIELDS)
+            ))
         
         # DeFi metrics
         if data.get("defi_metrics"):
-            defi = data["defi_metrics"]
-            prompt += "DEFI METRICS:\n"
-            prompt += f"TVL: ${defi.get('tvl', 'N/A'):,.0f}\n"
-            prompt += f"24h Volume: ${defi.get('volume_24h', 'N/A'):,.0f}\n"
-            prompt += f"Protocol Revenue: ${defi.get('revenue', 'N/A'):,.0f}\n\n"
+            sections.append((
+                "defi_metrics", "DEFI METRICS",
+                _render_fields(data["defi_metrics"], _DEFI_FIELDS)
+            ))
         
         # Market sentiment
-        if data.get("fear_greed"):
-            fg = data["fear_greed"]
-            prompt += f"Fear & Greed Index: {fg.get('value', 'N/A')} ({fg.get('classification', 'N/A')})\n\n"
+        fg = data.get("fear_greed") or {}
+        if fg.get("value") not in _MISSING:
+            classification = fg.get("classification")
+            label = f" ({classification})" if classification not in _MISSING else ""
+            sections.append(("sentiment", None, f"Fear & Greed Index: {fg['value']}{label}\n"))
         
         # Recent news
-        if data.get("news"):
-            prompt += "RECENT NEWS:\n"
-            for i, news_item in enumerate(data["news"][:3], 1):
-                prompt += f"{i}. {news_item.get('title', 'N/A')}\n"
-            prompt += "\n"
-        
-        prompt += "\nProvide a comprehensive analysis with:\n"
-        prompt += "1. Current market position and trends\n"
-        prompt += "2. Key strengths and weaknesses\n"
-        prompt += "3. Investment recommendation (BUY/HOLD/SELL)\n"
-        prompt += "4. Confidence level (1-10)\n"
-        prompt += "5. Key risks and catalysts\n"
-        prompt += "6. Price targets (short-term and long-term)\n"
-        prompt += "7. Risk assessment (emphasize volatility)\n"
-        
-        return prompt
+        titles = [
+            item["title"] for item in (data.get("news") or [])
+            if item.get("title") not in _MISSING
+        ][:3]
+        if titles:
+            headlines = "\n".join(
+                f"{i}. {_truncate(title, _NEWS_TITLE_MAX_CHARS)}"
+                for i, title in enumerate(titles, 1)
+            )
+            sections.append(("news", "RECENT NEWS", headlines + "\n"))
+        
+        return "".join(
+            self._format_section(tag, title, body) + "\n"
+            for tag, title, body in sections
+            if body
+        )
     
     def get_top_cryptos(
         self,
@@ -236,31 +612,106 @@ Always emphasize the high-risk nature of cryptocurrency investments."""
         Returns:
             Comparative analysis
         """
-        analyses = []
+        # Reuse data from symbols analyzed moments ago, fetch the rest
+        # concurrently, then analyze and rank them all in one LLM round-trip
+        data_by_symbol = {}
         for symbol in symbols:
-            analysis = self.analyze_crypto(symbol, include_onchain=False)
-            analyses.append(analysis)
-        
-        # Create comparison prompt
-        prompt = "Compare the following cryptocurrencies and rank them:\n\n"
-        for analysis in analyses:
-            prompt += f"{analysis['symbol']}:\n{analysis['analysis']}\n\n"
+            recent = self._recent_analysis(symbol)
+            if recent is not None:
+                data_by_symbol[symbol] = recent["data"]
+        
+        missing = [symbol for symbol in symbols if symbol not in data_by_symbol]
+        if missing:
+            data_by_symbol.update(run_sync(self._agather_many(missing, include_onchain=False)))
+        
+        # Same symbols in the same order at the same market buckets compare
+        # the same way
+        cache_key = make_key("compare", self.system_prompt, self.model_name, [
+            self._analysis_cache_key(symbol, data_by_symbol[symbol], False, False)
+            for symbol in symbols
+        ])
+        content = response_cache.get(cache_key)
+        if content is None:
+            prompt = self._create_batch_analysis_prompt(symbols, data_by_symbol)
+            
+            messages = [
+                SystemMessage(content=self.system_prompt),
+                HumanMessage(content=prompt)
+            ]
+            
+            response = run_sync(async_pool.submit(lambda: self.llm.ainvoke(messages)))
+            content = response.content
+            parsed = self._parse_batch_analysis(content)
+            # Don't pin a reply that ignored the JSON format for the whole TTL
+            if parsed is not None:
+                response_cache.put(cache_key, content)
+        else:
+            parsed = self._parse_batch_analysis(content)
+        timestamp = self._get_timestamp()
         
-        prompt += "\nProvide a ranking with rationale for each position, considering risk/reward profiles."
+        if parsed is None:
+            # Model ignored the JSON format; keep its free-text answer in the
+            # same result shape, with nothing per symbol
+            return {
+                "comparison": content,
+                "ranking": [],
+                "cryptos": [
+                    {
+                        "symbol": symbol,
+                        "analysis": None,
+                        "recommendation": None,
+                        "confidence": None,
+                        "data": data_by_symbol[symbol],
+                        "timestamp": timestamp
+                    }
+                    for symbol in symbols
+                ],
+                "timestamp": timestamp
+            }
         
-        messages = [
-            SystemMessage(content=self.system_prompt),
-            HumanMessage(content=prompt)
-        ]
+        by_symbol = {
+            str(item.get("symbol", "")).upper(): item
+            for item in parsed["analyses"]
+            if isinstance(item, dict)
+        }
         
-        response = self.llm.invoke(messages)
+        cryptos = []
+        for symbol in symbols:
+            item = by_symbol.get(symbol.upper(), {})
+            cryptos.append({
+                "symbol": symbol,
+                "analysis": item.get("analysis"),
+                "recommendation": item.get("recommendation"),
+                "confidence": item.get("confidence"),
+                "data": data_by_symbol[symbol],
+                "timestamp": timestamp
+            })
+        
+        ranking = parsed.get("ranking")
+        if not isinstance(ranking, list):
+            ranking = []
+        comparison = "Ranking: " + ", ".join(str(r) for r in ranking) + "\n\n" if ranking else ""
+        comparison += str(parsed.get("rationale") or "")
         
         return {
-            "comparison": response.content,
-            "cryptos": analyses,
-            "timestamp": self._get_timestamp()
+            "comparison": comparison,
+            "ranking": ranking,
+            "cryptos": cryptos,
+            "timestamp": timestamp
         }
     
+    async def _agather_many(
+        self,
+        symbols: List[str],
+        include_onchain: bool = True
+    ) -> Dict[str, Dict[str, Any]]:
+        """Gather data for several symbols concurrently."""
+        results = await asyncio.gather(*[
+            self._agather_crypto_data(symbol, include_onchain, False)
+            for symbol in symbols
+        ])
+        return dict(zip(symbols, results))
+    
     def analyze_defi_protocol(
         self,
         protocol: str
@@ -284,6 +735,19 @@ Always emphasize the high-risk nature of cryptocurrency investments."""
                 "timestamp": self._get_timestamp()
             }
         
+        cache_key = make_key(
+            "defi", self.system_prompt, self.model_name, protocol.lower(),
+            *[price_bucket(defi_data.get(field)) for field in ("tvl", "volume_24h", "revenue", "users")]
+        )
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return {
+                "protocol": protocol,
+                "analysis": cached,
+                "data": defi_data,
+                "timestamp": self._get_timestamp()
+            }
+        
         # Create analysis prompt
         prompt = f"Analyze {protocol} DeFi protocol based on the following metrics:\n\n"
         prompt += f"TVL: ${defi_data.get('tvl', 'N/A'):,.0f}\n"
@@ -303,6 +767,7 @@ Always emphasize the high-risk nature of cryptocurrency investments."""
         ]
         
         response = self.llm.invoke(messages)
+        response_cache.put(cache_key, response.content)
         
         return {
             "protocol": protocol,
@@ -313,5 +778,4 @@ Always emphasize the high-risk nature of cryptocurrency investments."""
     
     def _get_timestamp(self) -> str:
         """Get current timestamp."""
-        from datetime import datetime
-        return datetime.now().isoformat()
+        return now_iso()
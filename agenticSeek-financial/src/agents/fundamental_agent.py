@@ -1,13 +1,110 @@
 """Fundamental Agent for fundamental analysis of stocks."""
 
-from typing import Dict, List, Optional, Any
-from datetime import datetime
-from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_openai import ChatOpenAI
-from langchain_anthropic import ChatAnthropic
-from langchain_groq import ChatGroq
+import asyncio
+import logging
+from collections import Counter
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+import numpy as np
+from langchain_core.prompts import ChatPromptTemplate
 
 from ..mcp_clients import FinancialDatasetsClient
+from ..llm import async_pool, get_llm
+from ..llm.generative_cache import response_cache, make_key
+from ..utils import normalize_ticker, normalize_tickers, now_iso, run_sync
+
+logger = logging.getLogger(__name__)
+
+# Tickers fetched at once when comparing, to stay within the API rate limit
+_COMPARE_CONCURRENCY = 8
+
+# Income statement columns used for margin analysis, revenue first
+_MARGIN_FIELDS = ("revenue", "gross_profit", "operating_income", "net_income")
+
+
+# Prompt verbosity accepted by _create_analysis_prompt
+_DETAIL_LEVELS = ("full", "compact")
+
+# (label, metrics key) rows of the KEY FINANCIAL RATIOS prompt section
+_RATIO_FIELDS = (
+    ("P/E Ratio", "price_to_earnings_ratio"),
+    ("P/B Ratio", "price_to_book_ratio"),
+    ("P/S Ratio", "price_to_sales_ratio"),
+    ("ROE", "return_on_equity"),
+    ("ROA", "return_on_assets"),
+    ("Current Ratio", "current_ratio"),
+    ("Quick Ratio", "quick_ratio"),
+    ("Debt/Equity", "debt_to_equity"),
+)
+
+# Metrics compare_companies uses when the caller doesn't pick any
+_DEFAULT_COMPARE_METRICS = (
+    "price_to_earnings_ratio",
+    "price_to_book_ratio",
+    "return_on_equity",
+    "debt_to_equity",
+    "revenue_growth",
+)
+
+# Display names for metric keys, precomputed for the defaults
+_PRETTY_METRICS = {key: key.replace("_", " ").title() for key in _DEFAULT_COMPARE_METRICS}
+
+
+def _pretty_metric(key: str) -> str:
+    """Display name for a metric key."""
+    pretty = _PRETTY_METRICS.get(key)
+    if pretty is None:
+        pretty = key.replace("_", " ").title()
+    return pretty
+
+
+def _income_margins(statements: List[Dict[str, Any]]) -> np.ndarray:
+    """
+    Compute gross, operating and net margins for each income statement.
+    
+    The statements are flattened into one float array so all margins come
+    from a single vectorized division instead of per-period Python math.
+    
+    Args:
+        statements: Income statements
+        
+    Returns:
+        Array of shape (len(statements), 3) holding margins in percent;
+        rows with non-positive revenue are NaN
+    """
+    values = np.array(
+        [[stmt.get(field) or 0 for field in _MARGIN_FIELDS] for stmt in statements],
+        dtype=float
+    ).reshape(-1, len(_MARGIN_FIELDS))
+    revenue = values[:, :1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(revenue > 0, values[:, 1:] / revenue * 100, np.nan)
+
+
+def _compact_income_line(
+    year: Any,
+    statements: List[Dict[str, Any]],
+    margins: np.ndarray,
+    i: int
+) -> str:
+    """
+    One-line income summary for compact prompts: margins plus growth.
+    
+    Statements are newest first, so growth compares period i with the
+    older period i + 1.
+    """
+    line = f"{year}:"
+    if not np.isnan(margins[i, 0]):
+        gross_margin, operating_margin, net_margin = margins[i]
+        line += f" GM {gross_margin:.1f}% | OM {operating_margin:.1f}% | NM {net_margin:.1f}%"
+    
+    if i + 1 < len(statements):
+        revenue = statements[i].get("revenue") or 0
+        prior = statements[i + 1].get("revenue") or 0
+        if prior > 0:
+            line += f" | Rev growth {(revenue / prior - 1) * 100:+.1f}%"
+        if not np.isnan(margins[i + 1, 1]) and not np.isnan(margins[i, 1]):
+            line += f" | OM change {margins[i, 1] - margins[i + 1, 1]:+.1f}pp"
+    return line + "\n"
 
 
 class FundamentalAgent:
@@ -28,7 +125,8 @@ class FundamentalAgent:
             temperature: Temperature for LLM
         """
         self.llm = self._initialize_llm(llm_provider, model_name, temperature)
-        self.financial_client = FinancialDatasetsClient()
+        self.model_name = model_name
+        self.financial_client = FinancialDatasetsClient.shared()
         
         self.system_prompt = """You are an expert fundamental analyst with deep knowledge of financial statements, valuation, and company analysis.
 Your role is to analyze companies using fundamental data and provide investment insights based on intrinsic value.
@@ -45,23 +143,24 @@ You should consider:
 
 Provide clear, data-driven analysis with specific recommendations (BUY, HOLD, SELL) based on fundamental value.
 Always include margin of safety considerations and key risks."""
+        
+        # Compiled once; every call only fills in the user prompt
+        self.prompt_template = ChatPromptTemplate.from_messages([
+            ("system", self.system_prompt),
+            ("human", "{user_prompt}")
+        ])
+        self.chain = self.prompt_template | self.llm
     
     def _initialize_llm(self, provider: str, model_name: str, temperature: float):
         """Initialize the appropriate LLM based on provider."""
-        if provider.lower() == "openai":
-            return ChatOpenAI(model=model_name, temperature=temperature)
-        elif provider.lower() == "anthropic":
-            return ChatAnthropic(model=model_name, temperature=temperature)
-        elif provider.lower() == "groq":
-            return ChatGroq(model=model_name, temperature=temperature)
-        else:
-            raise ValueError(f"Unsupported LLM provider: {provider}")
+        return get_llm(provider, model_name, temperature)
     
     def analyze_fundamentals(
         self,
         ticker: str,
         periods: int = 4,
-        include_ratios: bool = True
+        include_ratios: bool = True,
+        detail_level: str = "full"
     ) -> Dict[str, Any]:
         """
         Perform comprehensive fundamental analysis on a stock.
@@ -70,31 +169,120 @@ Always include margin of safety considerations and key risks."""
             ticker: Stock ticker symbol
             periods: Number of periods to analyze
             include_ratios: Include detailed ratio analysis
+            detail_level: "full", or "compact" to send only ratios and trends
             
         Returns:
             Fundamental analysis results with recommendation
         """
+        ticker = normalize_ticker(ticker)
+        
         # Gather fundamental data
         data = self._gather_fundamental_data(ticker, periods, include_ratios)
         
         # Create analysis prompt
-        prompt = self._create_analysis_prompt(ticker, data)
+        prompt = self._create_analysis_prompt(ticker, data, detail_level)
         
         # Get LLM analysis
-        messages = [
-            SystemMessage(content=self.system_prompt),
-            HumanMessage(content=prompt)
-        ]
+        analysis = self._invoke(prompt)
+        
+        return {
+            "ticker": ticker,
+            "analysis": analysis,
+            "data": data,
+            "timestamp": self._get_timestamp()
+        }
+    
+    async def aanalyze_fundamentals(
+        self,
+        ticker: str,
+        periods: int = 4,
+        include_ratios: bool = True,
+        detail_level: str = "full"
+    ) -> Dict[str, Any]:
+        """
+        Async variant of analyze_fundamentals.
+        
+        Prefer this from code that already runs an event loop (e.g. an API
+        server); the sync methods drive the shared background loop instead.
+        """
+        ticker = normalize_ticker(ticker)
         
-        response = self.llm.invoke(messages)
+        data = await self._agather_fundamental_data(ticker, periods, include_ratios)
+        prompt = self._create_analysis_prompt(ticker, data, detail_level)
+        analysis = await self._ainvoke(prompt)
         
         return {
             "ticker": ticker,
-            "analysis": response.content,
+            "analysis": analysis,
             "data": data,
             "timestamp": self._get_timestamp()
         }
     
+    def analyze_fundamentals_stream(
+        self,
+        ticker: str,
+        periods: int = 4,
+        include_ratios: bool = True,
+        detail_level: str = "full"
+    ) -> Iterator[str]:
+        """
+        Stream a fundamental analysis as it is generated.
+        
+        Args:
+            ticker: Stock ticker symbol
+            periods: Number of periods to analyze
+            include_ratios: Include detailed ratio analysis
+            detail_level: "full", or "compact" to send only ratios and trends
+            
+        Yields:
+            Chunks of analysis text
+        """
+        ticker = normalize_ticker(ticker)
+        
+        data = self._gather_fundamental_data(ticker, periods, include_ratios)
+        prompt = self._create_analysis_prompt(ticker, data, detail_level)
+        
+        key = self._cache_key(prompt)
+        cached = response_cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+        
+        parts = []
+        for chunk in self.chain.stream({"user_prompt": prompt}):
+            if chunk.content:
+                parts.append(chunk.content)
+                yield chunk.content
+        
+        response_cache.put(key, "".join(parts))
+    
+    async def astream_fundamentals(
+        self,
+        ticker: str,
+        periods: int = 4,
+        include_ratios: bool = True,
+        detail_level: str = "full"
+    ) -> AsyncIterator[str]:
+        """Async variant of analyze_fundamentals_stream."""
+        ticker = normalize_ticker(ticker)
+        
+        data = await self._agather_fundamental_data(ticker, periods, include_ratios)
+        prompt = self._create_analysis_prompt(ticker, data, detail_level)
+        
+        key = self._cache_key(prompt)
+        cached = response_cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+        
+        parts = []
+        async for chunk in self.chain.astream({"user_prompt": prompt}):
+            if chunk.content:
+                parts.append(chunk.content)
+                yield chunk.content
+        
+        response_cache.put(key, "".join(parts))
+    
     def _gather_fundamental_data(
         self,
         ticker: str,
@@ -102,79 +290,144 @@ Always include margin of safety considerations and key risks."""
         include_ratios: bool
     ) -> Dict[str, Any]:
         """Gather fundamental data from Financial Datasets client."""
+        return run_sync(self._agather_fundamental_data(ticker, periods, include_ratios))
+    
+    async def _agather_fundamental_data(
+        self,
+        ticker: str,
+        periods: int,
+        include_ratios: bool
+    ) -> Dict[str, Any]:
+        """Fetch every fundamental endpoint concurrently over the client's async pool."""
+        calls = self._fundamental_data_calls(ticker, periods, include_ratios)
+        
+        results = await asyncio.gather(
+            *[
+                getattr(self.financial_client, f"a{method}")(*args, **kwargs)
+                for method, args, kwargs in calls.values()
+            ],
+            return_exceptions=True
+        )
+        
         data = {}
+        for name, result in zip(calls.keys(), results):
+            if isinstance(result, Exception):
+                logger.warning("Failed to fetch %s for %s: %s", name, ticker, result)
+                result = None
+            data[name] = result
+        return data
+    
+    def _fundamental_data_calls(
+        self,
+        ticker: str,
+        periods: int,
+        include_ratios: bool
+    ) -> Dict[str, tuple]:
+        """
+        Map each data key to the client call that fetches it.
         
+        Values are (method_name, args, kwargs) naming a FinancialDatasetsClient
+        method; the async path calls its "a"-prefixed variant.
+        """
         # Company facts
-        data["company_facts"] = self.financial_client.get_company_facts(ticker)
+        calls = {"company_facts": ("get_company_facts", (ticker,), {})}
         
         # Financial statements
-        data["income_statements"] = self.financial_client.get_income_statement(
-            ticker, period="annual", limit=periods
+        calls["income_statements"] = (
+            "get_income_statement", (ticker,), {"period": "annual", "limit": periods}
         )
-        data["balance_sheets"] = self.financial_client.get_balance_sheet(
-            ticker, period="annual", limit=periods
+        calls["balance_sheets"] = (
+            "get_balance_sheet", (ticker,), {"period": "annual", "limit": periods}
         )
-        data["cash_flows"] = self.financial_client.get_cash_flow_statement(
-            ticker, period="annual", limit=periods
+        calls["cash_flows"] = (
+            "get_cash_flow_statement", (ticker,), {"period": "annual", "limit": periods}
         )
         
         # Financial metrics and ratios
         if include_ratios:
-            data["financial_metrics"] = self.financial_client.get_financial_metrics(
-                ticker, period="ttm", limit=periods
+            calls["financial_metrics"] = (
+                "get_financial_metrics", (ticker,), {"period": "ttm", "limit": periods}
             )
         
         # Insider trades
-        data["insider_trades"] = self.financial_client.get_insider_trades(ticker, limit=20)
+        calls["insider_trades"] = ("get_insider_trades", (ticker,), {"limit": 20})
         
         # Price data for valuation
-        data["prices"] = self.financial_client.get_prices(ticker, interval="day")
+        calls["prices"] = ("get_prices", (ticker,), {"interval": "day"})
         
-        return data
+        return calls
     
     def _create_analysis_prompt(
         self,
         ticker: str,
-        data: Dict[str, Any]
+        data: Dict[str, Any],
+        detail_level: str = "full"
     ) -> str:
-        """Create fundamental analysis prompt for LLM."""
-        prompt = f"Perform fundamental analysis on {ticker} based on the following data:\n\n"
+        """
+        Create fundamental analysis prompt for LLM.
+        
+        Args:
+            ticker: Stock ticker symbol
+            data: Gathered fundamental data
+            detail_level: "full" for absolute figures, or "compact" to send
+                only ratios, margins and growth, which the model needs for
+                its verdict, at a fraction of the tokens
+                
+        Returns:
+            Prompt text
+        """
+        if detail_level not in _DETAIL_LEVELS:
+            raise ValueError(f"Unsupported detail level: {detail_level}")
+        compact = detail_level == "compact"
+        
+        parts = [f"Perform fundamental analysis on {ticker} based on the following data:\n\n"]
         
         # Company overview
         if data.get("company_facts"):
             facts = data["company_facts"]
-            prompt += f"COMPANY OVERVIEW:\n"
-            prompt += f"Name: {facts.get('name', ticker)}\n"
-            prompt += f"Sector: {facts.get('sector', 'N/A')}\n"
-            prompt += f"Industry: {facts.get('industry', 'N/A')}\n"
-            prompt += f"Market Cap: ${facts.get('market_cap', 0):,.0f}\n"
-            prompt += f"Description: {facts.get('description', 'N/A')[:200]}...\n\n"
+            parts.append(f"COMPANY OVERVIEW:\n")
+            parts.append(f"Name: {facts.get('name', ticker)}\n")
+            parts.append(f"Sector: {facts.get('sector', 'N/A')}\n")
+            parts.append(f"Industry: {facts.get('industry', 'N/A')}\n")
+            parts.append(f"Market Cap: ${facts.get('market_cap', 0):,.0f}\n")
+            if compact:
+                parts.append("\n")
+            else:
+                parts.append(f"Description: {facts.get('description', 'N/A')[:200]}...\n\n")
         
         # Income statement analysis
         if data.get("income_statements") and len(data["income_statements"]) > 0:
-            prompt += "INCOME STATEMENT TRENDS:\n"
-            for i, stmt in enumerate(data["income_statements"][:3]):
+            parts.append("INCOME STATEMENT TRENDS:\n")
+            statements = data["income_statements"][:3]
+            margins = _income_margins(statements)
+            for i, stmt in enumerate(statements):
                 year = stmt.get('fiscal_year', f'Period {i+1}')
+                if compact:
+                    parts.append(_compact_income_line(year, statements, margins, i))
+                    continue
+                
                 revenue = stmt.get('revenue', 0)
-                net_income = stmt.get('net_income', 0)
-                gross_profit = stmt.get('gross_profit', 0)
-                operating_income = stmt.get('operating_income', 0)
                 
-                prompt += f"\n{year}:\n"
-                prompt += f"  Revenue: ${revenue:,.0f}\n"
-                prompt += f"  Gross Profit: ${gross_profit:,.0f}\n"
-                prompt += f"  Operating Income: ${operating_income:,.0f}\n"
-                prompt += f"  Net Income: ${net_income:,.0f}\n"
+                parts.append(
+                    f"\n{year}:\n"
+                    f"  Revenue: ${revenue:,.0f}\n"
+                    f"  Gross Profit: ${stmt.get('gross_profit', 0):,.0f}\n"
+                    f"  Operating Income: ${stmt.get('operating_income', 0):,.0f}\n"
+                    f"  Net Income: ${stmt.get('net_income', 0):,.0f}\n"
+                )
                 
                 if revenue > 0:
-                    prompt += f"  Gross Margin: {(gross_profit/revenue)*100:.2f}%\n"
-                    prompt += f"  Operating Margin: {(operating_income/revenue)*100:.2f}%\n"
-                    prompt += f"  Net Margin: {(net_income/revenue)*100:.2f}%\n"
-            prompt += "\n"
+                    gross_margin, operating_margin, net_margin = margins[i]
+                    parts.append(
+                        f"  Gross Margin: {gross_margin:.2f}%\n"
+                        f"  Operating Margin: {operating_margin:.2f}%\n"
+                        f"  Net Margin: {net_margin:.2f}%\n"
+                    )
+            parts.append("\n")
         
         # Balance sheet analysis
         if data.get("balance_sheets") and len(data["balance_sheets"]) > 0:
-            prompt += "BALANCE SHEET HIGHLIGHTS:\n"
+            parts.append("BALANCE SHEET HIGHLIGHTS:\n")
             bs = data["balance_sheets"][0]
             total_assets = bs.get('total_assets', 0)
             total_liabilities = bs.get('total_liabilities', 0)
@@ -182,63 +435,69 @@ Always include margin of safety considerations and key risks."""
             cash = bs.get('cash_and_equivalents', 0)
             total_debt = bs.get('total_debt', 0)
             
-            prompt += f"Total Assets: ${total_assets:,.0f}\n"
-            prompt += f"Total Liabilities: ${total_liabilities:,.0f}\n"
-            prompt += f"Total Equity: ${total_equity:,.0f}\n"
-            prompt += f"Cash & Equivalents: ${cash:,.0f}\n"
-            prompt += f"Total Debt: ${total_debt:,.0f}\n"
+            if compact:
+                if total_debt and cash:
+                    parts.append(f"Cash-to-Debt: {cash/total_debt:.2f}\n")
+                if total_assets and total_liabilities:
+                    parts.append(f"Liabilities-to-Assets: {total_liabilities/total_assets:.2f}\n")
+            else:
+                parts.append(f"Total Assets: ${total_assets:,.0f}\n")
+                parts.append(f"Total Liabilities: ${total_liabilities:,.0f}\n")
+                parts.append(f"Total Equity: ${total_equity:,.0f}\n")
+                parts.append(f"Cash & Equivalents: ${cash:,.0f}\n")
+                parts.append(f"Total Debt: ${total_debt:,.0f}\n")
             
             if total_equity > 0:
-                prompt += f"Debt-to-Equity: {total_debt/total_equity:.2f}\n"
-            prompt += "\n"
+                parts.append(f"Debt-to-Equity: {total_debt/total_equity:.2f}\n")
+            parts.append("\n")
         
         # Cash flow analysis
         if data.get("cash_flows") and len(data["cash_flows"]) > 0:
-            prompt += "CASH FLOW ANALYSIS:\n"
+            parts.append("CASH FLOW ANALYSIS:\n")
             cf = data["cash_flows"][0]
             operating_cf = cf.get('operating_cash_flow', 0)
             investing_cf = cf.get('investing_cash_flow', 0)
             financing_cf = cf.get('financing_cash_flow', 0)
             free_cf = cf.get('free_cash_flow', 0)
             
-            prompt += f"Operating Cash Flow: ${operating_cf:,.0f}\n"
-            prompt += f"Investing Cash Flow: ${investing_cf:,.0f}\n"
-            prompt += f"Financing Cash Flow: ${financing_cf:,.0f}\n"
-            prompt += f"Free Cash Flow: ${free_cf:,.0f}\n\n"
+            if compact:
+                parts.append(f"Free Cash Flow: {'positive' if (free_cf or 0) > 0 else 'negative'}\n")
+                if operating_cf and operating_cf > 0:
+                    parts.append(f"FCF Conversion: {(free_cf or 0)/operating_cf:.2f}\n")
+                parts.append("\n")
+            else:
+                parts.append(f"Operating Cash Flow: ${operating_cf:,.0f}\n")
+                parts.append(f"Investing Cash Flow: ${investing_cf:,.0f}\n")
+                parts.append(f"Financing Cash Flow: ${financing_cf:,.0f}\n")
+                parts.append(f"Free Cash Flow: ${free_cf:,.0f}\n\n")
         
         # Financial metrics and ratios
         if data.get("financial_metrics") and len(data["financial_metrics"]) > 0:
-            prompt += "KEY FINANCIAL RATIOS:\n"
+            parts.append("KEY FINANCIAL RATIOS:\n")
             metrics = data["financial_metrics"][0]
             
-            prompt += f"P/E Ratio: {metrics.get('price_to_earnings_ratio', 'N/A')}\n"
-            prompt += f"P/B Ratio: {metrics.get('price_to_book_ratio', 'N/A')}\n"
-            prompt += f"P/S Ratio: {metrics.get('price_to_sales_ratio', 'N/A')}\n"
-            prompt += f"ROE: {metrics.get('return_on_equity', 'N/A')}\n"
-            prompt += f"ROA: {metrics.get('return_on_assets', 'N/A')}\n"
-            prompt += f"Current Ratio: {metrics.get('current_ratio', 'N/A')}\n"
-            prompt += f"Quick Ratio: {metrics.get('quick_ratio', 'N/A')}\n"
-            prompt += f"Debt/Equity: {metrics.get('debt_to_equity', 'N/A')}\n\n"
+            for label, key in _RATIO_FIELDS:
+                parts.append(f"{label}: {metrics.get(key, 'N/A')}\n")
+            parts.append("\n")
         
         # Insider trading activity
         if data.get("insider_trades") and len(data["insider_trades"]) > 0:
-            prompt += "RECENT INSIDER TRADING:\n"
-            buys = sum(1 for t in data["insider_trades"] if t.get('transaction_type') == 'BUY')
-            sells = sum(1 for t in data["insider_trades"] if t.get('transaction_type') == 'SELL')
-            prompt += f"Recent Insider Buys: {buys}\n"
-            prompt += f"Recent Insider Sells: {sells}\n\n"
-        
-        prompt += "\nProvide a comprehensive fundamental analysis with:\n"
-        prompt += "1. Financial health assessment (profitability, liquidity, solvency)\n"
-        prompt += "2. Growth trajectory and sustainability\n"
-        prompt += "3. Competitive advantages and moat strength\n"
-        prompt += "4. Valuation assessment (overvalued, fairly valued, undervalued)\n"
-        prompt += "5. Investment recommendation (BUY/HOLD/SELL) with confidence level (1-10)\n"
-        prompt += "6. Margin of safety analysis\n"
-        prompt += "7. Key risks and catalysts\n"
-        prompt += "8. Fair value estimate and target price\n"
-        
-        return prompt
+            parts.append("RECENT INSIDER TRADING:\n")
+            counts = Counter(t.get('transaction_type') for t in data["insider_trades"])
+            parts.append(f"Recent Insider Buys: {counts['BUY']}\n")
+            parts.append(f"Recent Insider Sells: {counts['SELL']}\n\n")
+        
+        parts.append("\nProvide a comprehensive fundamental analysis with:\n")
+        parts.append("1. Financial health assessment (profitability, liquidity, solvency)\n")
+        parts.append("2. Growth trajectory and sustainability\n")
+        parts.append("3. Competitive advantages and moat strength\n")
+        parts.append("4. Valuation assessment (overvalued, fairly valued, undervalued)\n")
+        parts.append("5. Investment recommendation (BUY/HOLD/SELL) with confidence level (1-10)\n")
+        parts.append("6. Margin of safety analysis\n")
+        parts.append("7. Key risks and catalysts\n")
+        parts.append("8. Fair value estimate and target price\n")
+        
+        return "".join(parts)
     
     def compare_companies(
         self,
@@ -255,27 +514,30 @@ Always include margin of safety considerations and key risks."""
         Returns:
             Comparison analysis
         """
-        if metrics is None:
-            metrics = [
-                "price_to_earnings_ratio",
-                "price_to_book_ratio",
-                "return_on_equity",
-                "debt_to_equity",
-                "revenue_growth"
-            ]
-        
-        comparison_data = {}
-        
-        for ticker in tickers:
-            financial_metrics = self.financial_client.get_financial_metrics(ticker, limit=1)
-            if financial_metrics:
-                comparison_data[ticker] = financial_metrics[0]
+        return run_sync(self.acompare_companies(tickers, metrics))
+    
+    async def acompare_companies(
+        self,
+        tickers: List[str],
+        metrics: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Async variant of compare_companies that fetches all tickers concurrently.
+        
+        A ticker whose metrics cannot be fetched is left out of the comparison
+        rather than failing the whole batch.
+        """
+        tickers = normalize_tickers(tickers)
+        
+        metrics = metrics or _DEFAULT_COMPARE_METRICS
+        
+        comparison_data = await self._afetch_latest_metrics(tickers)
         
         # Create comparison prompt
         prompt = f"Compare the following companies based on fundamental metrics:\n\n"
         
         for metric in metrics:
-            prompt += f"\n{metric.replace('_', ' ').title()}:\n"
+            prompt += f"\n{_pretty_metric(metric)}:\n"
             for ticker, data in comparison_data.items():
                 value = data.get(metric, 'N/A')
                 prompt += f"  {ticker}: {value}\n"
@@ -287,16 +549,11 @@ Always include margin of safety considerations and key risks."""
         prompt += "4. Risk profile comparison\n"
         prompt += "5. Investment ranking (best to worst)\n"
         
-        messages = [
-            SystemMessage(content=self.system_prompt),
-            HumanMessage(content=prompt)
-        ]
-        
-        response = self.llm.invoke(messages)
+        comparison = await self._ainvoke(prompt)
         
         return {
             "tickers": tickers,
-            "comparison": response.content,
+            "comparison": comparison,
             "data": comparison_data,
             "timestamp": self._get_timestamp()
         }
@@ -305,7 +562,8 @@ Always include margin of safety considerations and key risks."""
         self,
         max_pe: float = 15,
         min_roe: float = 15,
-        max_debt_equity: float = 0.5
+        max_debt_equity: float = 0.5,
+        universe: Optional[List[str]] = None
     ) -> List[str]:
         """
         Screen for potentially undervalued stocks based on fundamental criteria.
@@ -314,14 +572,106 @@ Always include margin of safety considerations and key risks."""
             max_pe: Maximum P/E ratio
             min_roe: Minimum ROE percentage
             max_debt_equity: Maximum debt-to-equity ratio
+            universe: Ticker symbols to screen
             
         Returns:
             List of ticker symbols meeting criteria
         """
-        # This would integrate with a screening service
-        # For now, return placeholder
-        return []
+        if not universe:
+            # No universe to screen without a screening service
+            return []
+        return run_sync(
+            self.ascreen_undervalued_stocks(universe, max_pe, min_roe, max_debt_equity)
+        )
+    
+    async def ascreen_undervalued_stocks(
+        self,
+        universe: List[str],
+        max_pe: float = 15,
+        min_roe: float = 15,
+        max_debt_equity: float = 0.5
+    ) -> List[str]:
+        """
+        Async variant of screen_undervalued_stocks.
+        
+        Metrics for the whole universe are fetched in one concurrent batch,
+        then filtered with a single vectorized mask. Tickers with missing
+        metrics never match, and neither do negative P/E ratios (losses).
+        """
+        universe = normalize_tickers(universe)
+        latest = await self._afetch_latest_metrics(universe)
+        if not latest:
+            return []
+        
+        tickers = list(latest)
+        values = np.array(
+            [
+                [
+                    latest[t].get("price_to_earnings_ratio"),
+                    latest[t].get("return_on_equity"),
+                    latest[t].get("debt_to_equity")
+                ]
+                for t in tickers
+            ],
+            dtype=float
+        )
+        pe, roe, de = values.T
+        
+        with np.errstate(invalid="ignore"):
+            mask = (pe > 0) & (pe <= max_pe) & (roe >= min_roe) & (de <= max_debt_equity)
+        return [tickers[i] for i in np.flatnonzero(mask)]
+    
+    async def _afetch_latest_metrics(self, tickers: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch the latest financial metrics for each ticker concurrently.
+        
+        A ticker whose metrics cannot be fetched is left out rather than
+        failing the whole batch.
+        """
+        semaphore = asyncio.Semaphore(_COMPARE_CONCURRENCY)
+        
+        async def fetch(ticker: str) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await self.financial_client.aget_financial_metrics(ticker, limit=1)
+        
+        results = await asyncio.gather(*[fetch(t) for t in tickers], return_exceptions=True)
+        
+        latest = {}
+        for ticker, financial_metrics in zip(tickers, results):
+            if isinstance(financial_metrics, Exception):
+                logger.warning("Failed to fetch metrics for %s: %s", ticker, financial_metrics)
+            elif financial_metrics:
+                latest[ticker] = financial_metrics[0]
+        return latest
+    
+    def _invoke(self, prompt: str) -> str:
+        """Run a prompt through the LLM, reusing the cached answer for identical input."""
+        key = self._cache_key(prompt)
+        analysis = response_cache.get(key)
+        if analysis is None:
+            analysis = self.chain.invoke({"user_prompt": prompt}).content
+            response_cache.put(key, analysis)
+        return analysis
+    
+    async def _ainvoke(self, prompt: str) -> str:
+        """Async variant of _invoke, paced by the shared LLM pool."""
+        key = self._cache_key(prompt)
+        analysis = response_cache.get(key)
+        if analysis is None:
+            response = await async_pool.submit(lambda: self.chain.ainvoke({"user_prompt": prompt}))
+            analysis = response.content
+            response_cache.put(key, analysis)
+        return analysis
+    
+    def _cache_key(self, prompt: str) -> str:
+        """
+        Response-cache key for a prompt.
+        
+        The prompt is rendered from the ticker, analysis type and fetched
+        data, so hashing it keys on exactly the inputs the model sees.
+        """
+        return make_key("fundamental", self.system_prompt, self.model_name, prompt)
     
     def _get_timestamp(self) -> str:
         """Get current timestamp."""
-        return datetime.now().isoformat()
+        return now_iso()
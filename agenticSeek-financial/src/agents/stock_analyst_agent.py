@@ -1,11 +1,9 @@
 """Stock Analyst Agent for comprehensive stock analysis."""
 
-from typing import Dict, List, Optional, Any
-from langchain_core.messages import HumanMessage, SystemMessage
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_openai import ChatOpenAI
-from langchain_anthropic import ChatAnthropic
-from langchain_groq import ChatGroq
 
 from ..mcp_clients import (
     StockScreenClient,
@@ -13,6 +11,14 @@ from ..mcp_clients import (
     FinancialDatasetsClient,
     TradingViewClient
 )
+from ..llm import async_pool, get_llm
+from ..llm.generative_cache import response_cache, make_key
+from ..utils import normalize_ticker, normalize_tickers, now_iso, run_sync
+
+logger = logging.getLogger(__name__)
+
+# Stocks analyzed at once by compare_stocks
+_COMPARE_CONCURRENCY = 8
 
 
 class StockAnalystAgent:
@@ -33,10 +39,11 @@ class StockAnalystAgent:
             temperature: Temperature for LLM
         """
         self.llm = self._initialize_llm(llm_provider, model_name, temperature)
-        self.stockscreen_client = StockScreenClient()
-        self.stockflow_client = StockFlowClient()
-        self.financial_client = FinancialDatasetsClient()
-        self.tradingview_client = TradingViewClient()
+        self.model_name = model_name
+        self.stockscreen_client = StockScreenClient.shared()
+        self.stockflow_client = StockFlowClient.shared()
+        self.financial_client = FinancialDatasetsClient.shared()
+        self.tradingview_client = TradingViewClient.shared()
         
         self.system_prompt = """You are an expert stock analyst with deep knowledge of fundamental and technical analysis.
 Your role is to analyze stocks comprehensively using multiple data sources and provide actionable investment insights.
@@ -49,17 +56,30 @@ You should consider:
 5. Valuation relative to peers and historical averages
 
 Provide clear, concise analysis with specific recommendations (BUY, HOLD, SELL) and confidence levels."""
+        
+        # Compiled once; every call only fills in the user prompt
+        self.prompt_template = ChatPromptTemplate.from_messages([
+            ("system", self.system_prompt),
+            ("human", "{user_prompt}")
+        ])
+        self.chain = self.prompt_template | self.llm
+        
+        # Prompt sections per analysis type, mirroring what _stock_data_calls
+        # fetches for it, so e.g. fundamental prompts skip technical lookups
+        self._prompt_sections = {
+            "fundamental": (self._overview_section, self._fundamental_section),
+            "technical": (self._overview_section, self._technical_section),
+            "comprehensive": (
+                self._overview_section,
+                self._fundamental_section,
+                self._technical_section,
+                self._volume_section
+            ),
+        }
     
     def _initialize_llm(self, provider: str, model_name: str, temperature: float):
         """Initialize the appropriate LLM based on provider."""
-        if provider.lower() == "openai":
-            return ChatOpenAI(model=model_name, temperature=temperature)
-        elif provider.lower() == "anthropic":
-            return ChatAnthropic(model=model_name, temperature=temperature)
-        elif provider.lower() == "groq":
-            return ChatGroq(model=model_name, temperature=temperature)
-        else:
-            raise ValueError(f"Unsupported LLM provider: {provider}")
+        return get_llm(provider, model_name, temperature)
     
     def analyze_stock(
         self,
@@ -76,6 +96,8 @@ Provide clear, concise analysis with specific recommendations (BUY, HOLD, SELL)
         Returns:
             Analysis results with recommendation
         """
+        ticker = normalize_ticker(ticker)
+        
         # Gather data from multiple sources
         data = self._gather_stock_data(ticker, analysis_type)
         
@@ -83,16 +105,31 @@ Provide clear, concise analysis with specific recommendations (BUY, HOLD, SELL)
         prompt = self._create_analysis_prompt(ticker, data, analysis_type)
         
         # Get LLM analysis
-        messages = [
-            SystemMessage(content=self.system_prompt),
-            HumanMessage(content=prompt)
-        ]
+        analysis = self._invoke(prompt)
+        
+        return {
+            "ticker": ticker,
+            "analysis": analysis,
+            "data": data,
+            "timestamp": self._get_timestamp()
+        }
+    
+    async def aanalyze_stock(
+        self,
+        ticker: str,
+        analysis_type: str = "comprehensive"
+    ) -> Dict[str, Any]:
+        """Async variant of analyze_stock."""
+        ticker = normalize_ticker(ticker)
+        
+        data = await self._agather_stock_data(ticker, analysis_type)
+        prompt = self._create_analysis_prompt(ticker, data, analysis_type)
         
-        response = self.llm.invoke(messages)
+        analysis = await self._ainvoke(prompt)
         
         return {
             "ticker": ticker,
-            "analysis": response.content,
+            "analysis": analysis,
             "data": data,
             "timestamp": self._get_timestamp()
         }
@@ -103,35 +140,74 @@ Provide clear, concise analysis with specific recommendations (BUY, HOLD, SELL)
         analysis_type: str
     ) -> Dict[str, Any]:
         """Gather data from multiple sources."""
+        return run_sync(self._agather_stock_data(ticker, analysis_type))
+    
+    async def _agather_stock_data(
+        self,
+        ticker: str,
+        analysis_type: str
+    ) -> Dict[str, Any]:
+        """Fetch every source concurrently so the slowest call bounds the wait."""
+        calls = self._stock_data_calls(ticker, analysis_type)
+        
+        results = await asyncio.gather(
+            *[self._acall(client, method, args, kwargs) for client, method, args, kwargs in calls.values()],
+            return_exceptions=True
+        )
+        
         data = {}
+        for name, result in zip(calls.keys(), results):
+            if isinstance(result, Exception):
+                logger.warning("Failed to fetch %s for %s: %s", name, ticker, result)
+                result = None
+            data[name] = result
+        return data
+    
+    @staticmethod
+    async def _acall(client: Any, method: str, args: tuple, kwargs: Dict[str, Any]) -> Any:
+        """Call the client's async variant of a method, or run the sync one in a thread."""
+        async_method = getattr(client, f"a{method}", None)
+        if async_method is not None:
+            return await async_method(*args, **kwargs)
+        return await asyncio.to_thread(getattr(client, method), *args, **kwargs)
+    
+    def _stock_data_calls(
+        self,
+        ticker: str,
+        analysis_type: str
+    ) -> Dict[str, tuple]:
+        """Map each data key to its (client, method_name, args, kwargs) call."""
+        fin = self.financial_client
+        tv = self.tradingview_client
+        flow = self.stockflow_client
         
         # Always get basic company info
-        data["company_facts"] = self.financial_client.get_company_facts(ticker)
+        calls = {"company_facts": (fin, "get_company_facts", (ticker,), {})}
         
         if analysis_type in ["comprehensive", "fundamental"]:
             # Fundamental data
-            data["financial_metrics"] = self.financial_client.get_financial_metrics(ticker, limit=4)
-            data["income_statement"] = self.financial_client.get_income_statement(ticker, limit=2)
-            data["balance_sheet"] = self.financial_client.get_balance_sheet(ticker, limit=2)
-            data["cash_flow"] = self.financial_client.get_cash_flow_statement(ticker, limit=2)
+            calls["financial_metrics"] = (fin, "get_financial_metrics", (ticker,), {"limit": 4})
+            calls["income_statement"] = (fin, "get_income_statement", (ticker,), {"limit": 2})
+            calls["balance_sheet"] = (fin, "get_balance_sheet", (ticker,), {"limit": 2})
+            calls["cash_flow"] = (fin, "get_cash_flow_statement", (ticker,), {"limit": 2})
         
         if analysis_type in ["comprehensive", "technical"]:
             # Technical data
-            data["technical_indicators"] = self.tradingview_client.get_technical_indicators(ticker)
-            data["technical_summary"] = self.tradingview_client.get_technical_summary(ticker)
-            data["chart_patterns"] = self.tradingview_client.get_chart_patterns(ticker)
-            data["support_resistance"] = self.tradingview_client.get_support_resistance(ticker)
+            calls["technical_indicators"] = (tv, "get_technical_indicators", (ticker,), {})
+            calls["technical_summary"] = (tv, "get_technical_summary", (ticker,), {})
+            calls["chart_patterns"] = (tv, "get_chart_patterns", (ticker,), {})
+            calls["support_resistance"] = (tv, "get_support_resistance", (ticker,), {})
         
         if analysis_type == "comprehensive":
             # Volume and flow data
-            data["volume_analysis"] = self.stockflow_client.get_volume_analysis(ticker)
-            data["order_flow"] = self.stockflow_client.get_order_flow(ticker)
-            data["institutional_flow"] = self.stockflow_client.get_institutional_flow(ticker)
+            calls["volume_analysis"] = (flow, "get_volume_analysis", (ticker,), {})
+            calls["order_flow"] = (flow, "get_order_flow", (ticker,), {})
+            calls["institutional_flow"] = (flow, "get_institutional_flow", (ticker,), {})
             
             # Additional insights
-            data["insider_trades"] = self.financial_client.get_insider_trades(ticker, limit=20)
+            calls["insider_trades"] = (fin, "get_insider_trades", (ticker,), {"limit": 20})
         
-        return data
+        return calls
     
     def _create_analysis_prompt(
         self,
@@ -140,49 +216,57 @@ Provide clear, concise analysis with specific recommendations (BUY, HOLD, SELL)
         analysis_type: str
     ) -> str:
         """Create analysis prompt for LLM."""
-        prompt = f"Analyze {ticker} stock based on the following data:\n\n"
+        parts = [f"Analyze {ticker} stock based on the following data:\n\n"]
         
-        # Add company overview
+        # Only the sections whose data was gathered for this analysis type
+        for section in self._prompt_sections.get(analysis_type, (self._overview_section,)):
+            section(ticker, data, parts)
+        
+        parts.append(f"\nProvide a {analysis_type} analysis with:\n")
+        parts.append("1. Key strengths and weaknesses\n")
+        parts.append("2. Investment recommendation (BUY/HOLD/SELL)\n")
+        parts.append("3. Confidence level (1-10)\n")
+        parts.append("4. Key risks and catalysts\n")
+        parts.append("5. Price target (if applicable)\n")
+        
+        return "".join(parts)
+    
+    def _overview_section(self, ticker: str, data: Dict[str, Any], parts: List[str]) -> None:
+        """Add company overview."""
         if data.get("company_facts"):
             facts = data["company_facts"]
-            prompt += f"Company: {facts.get('name', ticker)}\n"
-            prompt += f"Sector: {facts.get('sector', 'N/A')}\n"
-            prompt += f"Industry: {facts.get('industry', 'N/A')}\n"
-            prompt += f"Market Cap: ${facts.get('market_cap', 0):,.0f}\n\n"
-        
-        # Add fundamental data
+            parts.append(f"Company: {facts.get('name', ticker)}\n")
+            parts.append(f"Sector: {facts.get('sector', 'N/A')}\n")
+            parts.append(f"Industry: {facts.get('industry', 'N/A')}\n")
+            parts.append(f"Market Cap: ${facts.get('market_cap', 0):,.0f}\n\n")
+    
+    def _fundamental_section(self, ticker: str, data: Dict[str, Any], parts: List[str]) -> None:
+        """Add fundamental data."""
         if data.get("financial_metrics"):
-            prompt += "FUNDAMENTAL METRICS:\n"
-            metrics = data["financial_metrics"][0] if data["financial_metrics"] else {}
-            prompt += f"P/E Ratio: {metrics.get('price_to_earnings_ratio', 'N/A')}\n"
-            prompt += f"Revenue Growth: {metrics.get('revenue_growth', 'N/A')}\n"
-            prompt += f"Profit Margin: {metrics.get('net_profit_margin', 'N/A')}\n"
-            prompt += f"ROE: {metrics.get('return_on_equity', 'N/A')}\n"
-            prompt += f"Debt/Equity: {metrics.get('debt_to_equity', 'N/A')}\n\n"
-        
-        # Add technical data
+            parts.append("FUNDAMENTAL METRICS:\n")
+            metrics = data["financial_metrics"][0]
+            parts.append(f"P/E Ratio: {metrics.get('price_to_earnings_ratio', 'N/A')}\n")
+            parts.append(f"Revenue Growth: {metrics.get('revenue_growth', 'N/A')}\n")
+            parts.append(f"Profit Margin: {metrics.get('net_profit_margin', 'N/A')}\n")
+            parts.append(f"ROE: {metrics.get('return_on_equity', 'N/A')}\n")
+            parts.append(f"Debt/Equity: {metrics.get('debt_to_equity', 'N/A')}\n\n")
+    
+    def _technical_section(self, ticker: str, data: Dict[str, Any], parts: List[str]) -> None:
+        """Add technical data."""
         if data.get("technical_summary"):
-            prompt += "TECHNICAL ANALYSIS:\n"
+            parts.append("TECHNICAL ANALYSIS:\n")
             tech = data["technical_summary"]
-            prompt += f"Overall Signal: {tech.get('summary', 'N/A')}\n"
-            prompt += f"RSI: {tech.get('rsi', 'N/A')}\n"
-            prompt += f"MACD: {tech.get('macd_signal', 'N/A')}\n\n"
-        
-        # Add volume insights
+            parts.append(f"Overall Signal: {tech.get('summary', 'N/A')}\n")
+            parts.append(f"RSI: {tech.get('rsi', 'N/A')}\n")
+            parts.append(f"MACD: {tech.get('macd_signal', 'N/A')}\n\n")
+    
+    def _volume_section(self, ticker: str, data: Dict[str, Any], parts: List[str]) -> None:
+        """Add volume insights."""
         if data.get("volume_analysis"):
-            prompt += "VOLUME ANALYSIS:\n"
+            parts.append("VOLUME ANALYSIS:\n")
             vol = data["volume_analysis"]
-            prompt += f"Average Volume: {vol.get('avg_volume', 'N/A')}\n"
-            prompt += f"Volume Trend: {vol.get('trend', 'N/A')}\n\n"
-        
-        prompt += f"\nProvide a {analysis_type} analysis with:\n"
-        prompt += "1. Key strengths and weaknesses\n"
-        prompt += "2. Investment recommendation (BUY/HOLD/SELL)\n"
-        prompt += "3. Confidence level (1-10)\n"
-        prompt += "4. Key risks and catalysts\n"
-        prompt += "5. Price target (if applicable)\n"
-        
-        return prompt
+            parts.append(f"Average Volume: {vol.get('avg_volume', 'N/A')}\n")
+            parts.append(f"Volume Trend: {vol.get('trend', 'N/A')}\n\n")
     
     def screen_stocks(
         self,
@@ -214,32 +298,202 @@ Provide clear, concise analysis with specific recommendations (BUY, HOLD, SELL)
         Returns:
             Comparative analysis
         """
+        return run_sync(self.acompare_stocks(tickers))
+    
+    async def acompare_stocks(
+        self,
+        tickers: List[str]
+    ) -> Dict[str, Any]:
+        """
+        Async variant of compare_stocks.
+        
+        Data for every ticker is gathered concurrently first, then all
+        per-ticker analyses go to the LLM as one paced batch. A ticker whose
+        data or analysis fails is left out of the ranking rather than failing
+        the whole batch.
+        """
+        tickers = normalize_tickers(tickers)
+        
+        semaphore = asyncio.Semaphore(_COMPARE_CONCURRENCY)
+        
+        async def gather(ticker: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._agather_stock_data(ticker, "fundamental")
+        
+        datasets = await asyncio.gather(*[gather(t) for t in tickers], return_exceptions=True)
+        
+        gathered = []
+        for ticker, data in zip(tickers, datasets):
+            if isinstance(data, Exception):
+                logger.warning("Failed to gather data for %s: %s", ticker, data)
+            else:
+                gathered.append((ticker, data))
+        
+        prompts = [self._create_analysis_prompt(t, d, "fundamental") for t, d in gathered]
+        results = await self._abatch_invoke(prompts)
+        
         analyses = []
-        for ticker in tickers:
-            analysis = self.analyze_stock(ticker, analysis_type="fundamental")
-            analyses.append(analysis)
+        for (ticker, data), analysis in zip(gathered, results):
+            if isinstance(analysis, Exception):
+                logger.warning("Failed to analyze %s: %s", ticker, analysis)
+                continue
+            analyses.append({
+                "ticker": ticker,
+                "analysis": analysis,
+                "data": data,
+                "timestamp": self._get_timestamp()
+            })
         
         # Create comparison prompt
+        prompt = self._create_comparison_prompt(analyses)
+        
+        comparison = await self._ainvoke(prompt)
+        
+        return {
+            "comparison": comparison,
+            "stocks": analyses,
+            "timestamp": self._get_timestamp()
+        }
+    
+    def _create_comparison_prompt(self, analyses: List[Dict[str, Any]]) -> str:
+        """Create the ranking prompt from per-ticker analyses."""
         prompt = "Compare the following stocks and rank them:\n\n"
         for analysis in analyses:
             prompt += f"{analysis['ticker']}:\n{analysis['analysis']}\n\n"
         
         prompt += "\nProvide a ranking with rationale for each position."
+        return prompt
+    
+    async def astream_compare_stocks(
+        self,
+        tickers: List[str]
+    ) -> AsyncIterator[Tuple[Optional[str], str]]:
+        """
+        Stream a stock comparison as it is generated.
         
-        messages = [
-            SystemMessage(content=self.system_prompt),
-            HumanMessage(content=prompt)
-        ]
+        Per-ticker analyses stream concurrently through a queue, so chunks
+        from different tickers interleave as they arrive. The final ranking
+        streams once every analysis is complete.
         
-        response = self.llm.invoke(messages)
+        Args:
+            tickers: List of stock tickers
+            
+        Yields:
+            (ticker, chunk) pairs for the per-ticker analyses, then
+            (None, chunk) pairs for the ranking
+        """
+        tickers = normalize_tickers(tickers)
         
-        return {
-            "comparison": response.content,
-            "stocks": analyses,
-            "timestamp": self._get_timestamp()
-        }
+        semaphore = asyncio.Semaphore(_COMPARE_CONCURRENCY)
+        queue: "asyncio.Queue[Tuple[str, Optional[str]]]" = asyncio.Queue()
+        analyses: Dict[str, str] = {}
+        
+        async def stream_one(ticker: str) -> None:
+            try:
+                async with semaphore:
+                    data = await self._agather_stock_data(ticker, "fundamental")
+                prompt = self._create_analysis_prompt(ticker, data, "fundamental")
+                
+                key = self._cache_key(prompt)
+                cached = response_cache.get(key)
+                if cached is not None:
+                    analyses[ticker] = cached
+                    await queue.put((ticker, cached))
+                    return
+                
+                async def consume() -> str:
+                    parts = []
+                    async for chunk in self.chain.astream({"user_prompt": prompt}):
+                        if chunk.content:
+                            parts.append(chunk.content)
+                            await queue.put((ticker, chunk.content))
+                    return "".join(parts)
+                
+                analyses[ticker] = await async_pool.submit(consume)
+                response_cache.put(key, analyses[ticker])
+            except Exception as e:
+                logger.warning("Failed to analyze %s: %s", ticker, e)
+            finally:
+                await queue.put((ticker, None))
+        
+        tasks = [asyncio.create_task(stream_one(t)) for t in tickers]
+        try:
+            pending = len(tasks)
+            while pending:
+                ticker, chunk = await queue.get()
+                if chunk is None:
+                    pending -= 1
+                else:
+                    yield ticker, chunk
+        finally:
+            for task in tasks:
+                task.cancel()
+        
+        prompt = self._create_comparison_prompt([
+            {"ticker": t, "analysis": analyses[t]} for t in tickers if t in analyses
+        ])
+        
+        async for chunk in self.chain.astream({"user_prompt": prompt}):
+            if chunk.content:
+                yield None, chunk.content
+    
+    def _invoke(self, prompt: str) -> str:
+        """Run a prompt through the LLM, reusing the cached answer for identical input."""
+        key = self._cache_key(prompt)
+        analysis = response_cache.get(key)
+        if analysis is None:
+            analysis = self.chain.invoke({"user_prompt": prompt}).content
+            response_cache.put(key, analysis)
+        return analysis
+    
+    async def _ainvoke(self, prompt: str) -> str:
+        """Async variant of _invoke, paced by the shared LLM pool."""
+        key = self._cache_key(prompt)
+        analysis = response_cache.get(key)
+        if analysis is None:
+            response = await async_pool.submit(lambda: self.chain.ainvoke({"user_prompt": prompt}))
+            analysis = response.content
+            response_cache.put(key, analysis)
+        return analysis
+    
+    async def _abatch_invoke(self, prompts: List[str]) -> List[Any]:
+        """
+        Run several prompts as one concurrent, rate-limited burst.
+        
+        Cached answers are reused; only the misses reach the LLM.
+        
+        Returns:
+            Answer text per prompt, in order, or the exception a prompt raised
+        """
+        keys = [self._cache_key(prompt) for prompt in prompts]
+        results = [response_cache.get(key) for key in keys]
+        misses = [i for i, result in enumerate(results) if result is None]
+        
+        responses = await async_pool.submit_all(
+            [
+                lambda prompt=prompts[i]: self.chain.ainvoke({"user_prompt": prompt})
+                for i in misses
+            ],
+            return_exceptions=True
+        )
+        
+        for i, response in zip(misses, responses):
+            if isinstance(response, Exception):
+                results[i] = response
+            else:
+                results[i] = response.content
+                response_cache.put(keys[i], results[i])
+        return results
+    
+    def _cache_key(self, prompt: str) -> str:
+        """
+        Response-cache key for a prompt.
+        
+        The prompt is rendered from the ticker, analysis type and fetched
+        data, so hashing it keys on exactly the inputs the model sees.
+        """
+        return make_key("stock", self.system_prompt, self.model_name, prompt)
     
     def _get_timestamp(self) -> str:
         """Get current timestamp."""
-        from datetime import datetime
-        return datetime.now().isoformat()
+        return now_iso()
@@ -1,12 +1,178 @@
 """Technical Agent for technical analysis of stocks and cryptocurrencies."""
 
-from typing import Dict, List, Optional, Any
+import asyncio
+import copy
+import logging
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Any, TypedDict
+import numpy as np
 from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_openai import ChatOpenAI
-from langchain_anthropic import ChatAnthropic
-from langchain_groq import ChatGroq
 
 from ..mcp_clients import TradingViewClient
+from ..llm import async_pool, get_llm
+from ..llm.generative_cache import GenerativeCache, make_key
+from ..utils import fastjson, now_iso, run_sync
+
+logger = logging.getLogger(__name__)
+
+_SYSTEM_PROMPT = """You are an expert technical analyst with deep knowledge of chart patterns, indicators, and price action.
+Your role is to analyze price charts and technical indicators to identify trading opportunities.
+
+You should consider:
+1. Trend analysis (uptrend, downtrend, sideways)
+2. Support and resistance levels
+3. Technical indicators (RSI, MACD, Moving Averages, Bollinger Bands, Stochastic)
+4. Chart patterns (head and shoulders, triangles, flags, wedges)
+5. Volume analysis
+6. Momentum and volatility
+7. Entry and exit points
+
+Provide clear, actionable trading signals with specific price levels and risk management recommendations.
+Always include stop-loss and take-profit levels."""
+
+# Every request starts with the same system message, so one immutable instance
+# is shared rather than rebuilt per call; an identical prefix also lets
+# providers reuse their prompt cache across requests
+_SYSTEM_MESSAGE = SystemMessage(content=_SYSTEM_PROMPT)
+
+# Tickers analyzed at once by the multi-ticker methods
+_ANALYZE_CONCURRENCY = 10
+
+# Gathered TradingView data from the last minute, so a ticker checked and then
+# analyzed (or compared twice in a row) isn't fetched again
+_technical_data_memo = GenerativeCache(ttl=60, max_entries=1024)
+
+# Static section templates, filled per call with format_map(_OrNA(...))
+_SUMMARY_SECTION = """TECHNICAL SUMMARY:
+Overall Signal: {summary}
+Trend: {trend}
+Momentum: {momentum}
+
+"""
+
+_RSI_SECTION = """RSI(14): {value}
+RSI Signal: {signal}
+
+"""
+
+_MACD_SECTION = """MACD:
+MACD Line: {macd}
+Signal Line: {signal}
+Histogram: {histogram}
+Signal: {macd_signal}
+
+"""
+
+_BOLLINGER_SECTION = """BOLLINGER BANDS:
+Upper Band: {upper}
+Middle Band: {middle}
+Lower Band: {lower}
+Current Price Position: {position}
+
+"""
+
+_STOCHASTIC_SECTION = """STOCHASTIC OSCILLATOR:
+%K: {k}
+%D: {d}
+Signal: {signal}
+
+"""
+
+_PIVOT_SECTION = """PIVOT POINTS:
+Pivot: {pivot}
+R1: {r1}, R2: {r2}, R3: {r3}
+S1: {s1}, S2: {s2}, S3: {s3}
+
+"""
+
+
+class _OrNA:
+    """Read-only mapping view that renders missing keys as "N/A" in format_map."""
+    
+    __slots__ = ("values",)
+    
+    def __init__(self, values: Dict[str, Any]):
+        self.values = values
+    
+    def __getitem__(self, key: str) -> Any:
+        return self.values.get(key, "N/A")
+
+
+# Line prefixes for the standard moving-average periods (keys arrive as JSON
+# strings), rendered once instead of per line
+_MA_PREFIXES = {str(period): f"MA{period}: " for period in (5, 10, 20, 50, 100, 200)}
+
+# Signal keywords, each captured under the label it maps to
+_SIGNAL_RE = re.compile(
+    r"(?P<STRONG_BUY>strong\s+buy)|(?P<STRONG_SELL>strong\s+sell)|(?P<BUY>buy)|(?P<SELL>sell)",
+    re.IGNORECASE
+)
+
+_ANALYSIS_INSTRUCTIONS = """
+Provide technical analysis with:
+1. Current trend and momentum assessment
+2. Key support and resistance levels
+3. Trading signal (BUY/SELL/HOLD)
+4. Entry point (specific price)
+5. Stop-loss level
+6. Take-profit targets (multiple levels)
+7. Risk/reward ratio
+8. Timeframe for the trade
+"""
+
+# Tickers packed into one batch analysis prompt; larger batches are split so
+# each stays well inside the model's effective context
+_BATCH_SIZE = 8
+
+_BATCH_ANALYSIS_PROMPT = """Perform technical analysis on each of the following assets ({interval} timeframe).
+
+{blocks}Respond with a single JSON object and nothing else, in this shape:
+{{"analyses": [{{"ticker": "...", "analysis": "..."}}]}}
+Include one entry in "analyses" per asset. Each analysis should cover trend and momentum, key support and resistance levels, a trading signal (BUY/SELL/HOLD), entry point, stop-loss level, take-profit targets and risk/reward ratio.
+"""
+
+
+class TechnicalAnalysis(TypedDict):
+    """Result of a single-ticker technical analysis."""
+    
+    ticker: str
+    interval: str
+    analysis: str
+    data: Dict[str, Any]
+    timestamp: str
+
+
+def _screen_breakouts(datasets: List[Dict[str, Any]]) -> List[Optional[str]]:
+    """
+    Classify each ticker's technical data as a bullish or bearish breakout.
+    
+    Summaries and RSI values are stacked into arrays so the rule runs as one
+    vectorized pass over all tickers instead of a Python branch per ticker.
+    
+    Args:
+        datasets: Gathered technical data per ticker
+        
+    Returns:
+        "bullish_breakout", "bearish_breakout" or None per dataset
+    """
+    # Failed fetches are stored as None; missing RSI values become NaN,
+    # which fails both comparisons
+    summaries = np.array([(d.get("summary") or {}).get("summary") for d in datasets], dtype=object)
+    rsi = np.array(
+        [
+            value if isinstance(value, (int, float)) else np.nan
+            for value in ((d.get("rsi") or {}).get("value") for d in datasets)
+        ],
+        dtype=float
+    )
+    
+    with np.errstate(invalid="ignore"):
+        bullish = (summaries == "STRONG_BUY") & (rsi > 60)
+        bearish = (summaries == "STRONG_SELL") & (rsi < 40)
+    
+    labels = np.where(bullish, "bullish_breakout", np.where(bearish, "bearish_breakout", None))
+    return labels.tolist()
 
 
 class TechnicalAgent:
@@ -27,40 +193,20 @@ class TechnicalAgent:
             temperature: Temperature for LLM
         """
         self.llm = self._initialize_llm(llm_provider, model_name, temperature)
-        self.tradingview_client = TradingViewClient()
+        self.tradingview_client = TradingViewClient.shared()
         
-        self.system_prompt = """You are an expert technical analyst with deep knowledge of chart patterns, indicators, and price action.
-Your role is to analyze price charts and technical indicators to identify trading opportunities.
-
-You should consider:
-1. Trend analysis (uptrend, downtrend, sideways)
-2. Support and resistance levels
-3. Technical indicators (RSI, MACD, Moving Averages, Bollinger Bands, Stochastic)
-4. Chart patterns (head and shoulders, triangles, flags, wedges)
-5. Volume analysis
-6. Momentum and volatility
-7. Entry and exit points
-
-Provide clear, actionable trading signals with specific price levels and risk management recommendations.
-Always include stop-loss and take-profit levels."""
+        self.system_prompt = _SYSTEM_PROMPT
     
     def _initialize_llm(self, provider: str, model_name: str, temperature: float):
         """Initialize the appropriate LLM based on provider."""
-        if provider.lower() == "openai":
-            return ChatOpenAI(model=model_name, temperature=temperature)
-        elif provider.lower() == "anthropic":
-            return ChatAnthropic(model=model_name, temperature=temperature)
-        elif provider.lower() == "groq":
-            return ChatGroq(model=model_name, temperature=temperature)
-        else:
-            raise ValueError(f"Unsupported LLM provider: {provider}")
+        return get_llm(provider, model_name, temperature)
     
     def analyze_technical(
         self,
         ticker: str,
         interval: str = "1D",
         include_patterns: bool = True
-    ) -> Dict[str, Any]:
+    ) -> TechnicalAnalysis:
         """
         Perform technical analysis on a ticker.
         
@@ -80,7 +226,7 @@ Always include stop-loss and take-profit levels."""
         
         # Get LLM analysis
         messages = [
-            SystemMessage(content=self.system_prompt),
+            _SYSTEM_MESSAGE,
             HumanMessage(content=prompt)
         ]
         
@@ -94,39 +240,168 @@ Always include stop-loss and take-profit levels."""
             "timestamp": self._get_timestamp()
         }
     
-    def _gather_technical_data(
+    async def aanalyze_technical(
+        self,
+        ticker: str,
+        interval: str = "1D",
+        include_patterns: bool = True
+    ) -> TechnicalAnalysis:
+        """Async variant of analyze_technical, paced by the shared LLM pool."""
+        data = await self._agather_technical_data(ticker, interval, include_patterns)
+        return await self._aanalyze_from_data(ticker, interval, data)
+    
+    async def _aanalyze_from_data(
         self,
         ticker: str,
         interval: str,
-        include_patterns: bool
-    ) -> Dict[str, Any]:
-        """Gather technical data from TradingView."""
-        data = {}
+        data: Dict[str, Any]
+    ) -> TechnicalAnalysis:
+        """Run the LLM analysis over technical data that was already gathered."""
+        messages = self._analysis_messages(ticker, interval, data)
         
-        # Get comprehensive technical indicators
-        data["indicators"] = self.tradingview_client.get_technical_indicators(ticker, interval)
+        response = await async_pool.submit(lambda: self.llm.ainvoke(messages))
         
-        # Get technical summary
-        data["summary"] = self.tradingview_client.get_technical_summary(ticker, interval)
+        return {
+            "ticker": ticker,
+            "interval": interval,
+            "analysis": response.content,
+            "data": data,
+            "timestamp": self._get_timestamp()
+        }
+    
+    def _analysis_messages(
+        self,
+        ticker: str,
+        interval: str,
+        data: Dict[str, Any]
+    ) -> List[Any]:
+        """Build the chat messages for a single-ticker analysis."""
+        return [
+            _SYSTEM_MESSAGE,
+            HumanMessage(content=self._create_analysis_prompt(ticker, interval, data))
+        ]
+    
+    async def _aanalyze_many(
+        self,
+        tickers: List[str],
+        interval: str,
+        include_patterns: bool
+    ) -> List[TechnicalAnalysis]:
+        """
+        Analyze several tickers concurrently, at most _ANALYZE_CONCURRENCY at a time.
         
-        # Get specific indicators
-        data["rsi"] = self.tradingview_client.get_rsi(ticker, interval)
-        data["macd"] = self.tradingview_client.get_macd(ticker, interval)
-        data["moving_averages"] = self.tradingview_client.get_moving_averages(ticker, interval)
-        data["bollinger_bands"] = self.tradingview_client.get_bollinger_bands(ticker, interval)
-        data["stochastic"] = self.tradingview_client.get_stochastic(ticker, interval)
+        A ticker whose analysis fails is logged and left out of the results.
+        """
+        semaphore = asyncio.Semaphore(_ANALYZE_CONCURRENCY)
         
-        # Get support and resistance levels
-        data["support_resistance"] = self.tradingview_client.get_support_resistance(ticker, interval)
+        async def analyze(ticker: str) -> TechnicalAnalysis:
+            async with semaphore:
+                return await self.aanalyze_technical(ticker, interval, include_patterns)
         
-        # Get pivot points
-        data["pivot_points"] = self.tradingview_client.get_pivot_points(ticker, interval)
+        results = await asyncio.gather(*[analyze(t) for t in tickers], return_exceptions=True)
         
-        # Get chart patterns if requested
-        if include_patterns:
-            data["patterns"] = self.tradingview_client.get_chart_patterns(ticker, interval)
+        analyses = []
+        for ticker, result in zip(tickers, results):
+            if isinstance(result, Exception):
+                logger.warning("Failed to analyze %s: %s", ticker, result)
+            else:
+                analyses.append(result)
+        return analyses
+    
+    async def _aanalyze_batched(
+        self,
+        tickers: List[str],
+        interval: str,
+        include_patterns: bool
+    ) -> List[TechnicalAnalysis]:
+        """
+        Analyze several tickers with one LLM call per batch of _BATCH_SIZE.
         
-        return data
+        Tickers the model leaves out of a batch response (or a whole batch
+        whose response isn't valid JSON) are analyzed individually instead.
+        """
+        semaphore = asyncio.Semaphore(_ANALYZE_CONCURRENCY)
+        
+        async def gather(ticker: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._agather_technical_data(ticker, interval, include_patterns)
+        
+        datasets = await asyncio.gather(*[gather(t) for t in tickers], return_exceptions=True)
+        
+        data_by_ticker = {}
+        for ticker, data in zip(tickers, datasets):
+            if isinstance(data, Exception):
+                logger.warning("Failed to gather data for %s: %s", ticker, data)
+            else:
+                data_by_ticker[ticker] = data
+        
+        gathered = list(data_by_ticker)
+        batches = [gathered[i:i + _BATCH_SIZE] for i in range(0, len(gathered), _BATCH_SIZE)]
+        
+        def batch_call(batch: List[str]):
+            messages = [
+                _SYSTEM_MESSAGE,
+                HumanMessage(content=self._create_batch_analysis_prompt(
+                    interval, {t: data_by_ticker[t] for t in batch}
+                ))
+            ]
+            return lambda: self.llm.ainvoke(messages)
+        
+        responses = await async_pool.submit_all(
+            [batch_call(batch) for batch in batches],
+            return_exceptions=True
+        )
+        
+        texts = {}
+        for batch, response in zip(batches, responses):
+            if isinstance(response, Exception):
+                logger.warning("Batch analysis failed for %s: %s", ", ".join(batch), response)
+                continue
+            parsed = self._parse_batch_analysis(response.content)
+            for ticker in batch:
+                if ticker.upper() in parsed:
+                    texts[ticker] = parsed[ticker.upper()]
+        
+        missing = [t for t in gathered if t not in texts]
+        fallback = {a["ticker"]: a for a in await self._aanalyze_many(missing, interval, include_patterns)}
+        
+        timestamp = self._get_timestamp()
+        analyses = []
+        for ticker in gathered:
+            if ticker in texts:
+                analyses.append({
+                    "ticker": ticker,
+                    "interval": interval,
+                    "analysis": texts[ticker],
+                    "data": data_by_ticker[ticker],
+                    "timestamp": timestamp
+                })
+            elif ticker in fallback:
+                analyses.append(fallback[ticker])
+        return analyses
+    
+    def _gather_technical_data(
+        self,
+        ticker: str,
+        interval: str,
+        include_patterns: bool
+    ) -> Dict[str, Any]:
+        """Gather technical data from TradingView."""
+        return run_sync(self._agather_technical_data(ticker, interval, include_patterns))
+    
+    async def _agather_technical_data(
+        self,
+        ticker: str,
+        interval: str,
+        include_patterns: bool
+    ) -> Dict[str, Any]:
+        """Async variant of _gather_technical_data, reusing data fetched in the last minute."""
+        key = make_key(ticker, interval, include_patterns)
+        data = _technical_data_memo.get(key)
+        if data is None:
+            data = await self.tradingview_client.aget_full_analysis(ticker, interval, include_patterns)
+            _technical_data_memo.put(key, data)
+        return copy.deepcopy(data)
     
     def _create_analysis_prompt(
         self,
@@ -135,95 +410,103 @@ Always include stop-loss and take-profit levels."""
         data: Dict[str, Any]
     ) -> str:
         """Create technical analysis prompt for LLM."""
-        prompt = f"Perform technical analysis on {ticker} ({interval} timeframe):\n\n"
+        return "".join((
+            f"Perform technical analysis on {ticker} ({interval} timeframe):\n\n",
+            self._format_technical_data(data),
+            _ANALYSIS_INSTRUCTIONS
+        ))
+    
+    def _format_technical_data(self, data: Dict[str, Any]) -> str:
+        """Format gathered technical data as prompt sections, skipping empty fields."""
+        # Sections are rendered from the static templates and joined once
+        parts: List[str] = []
         
         # Technical summary
         if data.get("summary"):
-            summary = data["summary"]
-            prompt += "TECHNICAL SUMMARY:\n"
-            prompt += f"Overall Signal: {summary.get('summary', 'N/A')}\n"
-            prompt += f"Trend: {summary.get('trend', 'N/A')}\n"
-            prompt += f"Momentum: {summary.get('momentum', 'N/A')}\n\n"
+            parts.append(_SUMMARY_SECTION.format_map(_OrNA(data["summary"])))
         
         # RSI
         if data.get("rsi"):
-            rsi = data["rsi"]
-            prompt += f"RSI(14): {rsi.get('value', 'N/A')}\n"
-            prompt += f"RSI Signal: {rsi.get('signal', 'N/A')}\n\n"
+            parts.append(_RSI_SECTION.format_map(_OrNA(data["rsi"])))
         
         # MACD
         if data.get("macd"):
-            macd = data["macd"]
-            prompt += "MACD:\n"
-            prompt += f"MACD Line: {macd.get('macd', 'N/A')}\n"
-            prompt += f"Signal Line: {macd.get('signal', 'N/A')}\n"
-            prompt += f"Histogram: {macd.get('histogram', 'N/A')}\n"
-            prompt += f"Signal: {macd.get('macd_signal', 'N/A')}\n\n"
+            parts.append(_MACD_SECTION.format_map(_OrNA(data["macd"])))
         
         # Moving Averages
         if data.get("moving_averages"):
-            ma = data["moving_averages"]
-            prompt += "MOVING AVERAGES:\n"
-            for period, value in ma.items():
-                if isinstance(value, (int, float)):
-                    prompt += f"MA{period}: {value:.2f}\n"
-            prompt += "\n"
+            parts.append("MOVING AVERAGES:\n")
+            parts.extend(
+                "%s%.2f\n" % (_MA_PREFIXES.get(period) or f"MA{period}: ", value)
+                for period, value in data["moving_averages"].items()
+                if isinstance(value, (int, float))
+            )
+            parts.append("\n")
         
         # Bollinger Bands
         if data.get("bollinger_bands"):
-            bb = data["bollinger_bands"]
-            prompt += "BOLLINGER BANDS:\n"
-            prompt += f"Upper Band: {bb.get('upper', 'N/A')}\n"
-            prompt += f"Middle Band: {bb.get('middle', 'N/A')}\n"
-            prompt += f"Lower Band: {bb.get('lower', 'N/A')}\n"
-            prompt += f"Current Price Position: {bb.get('position', 'N/A')}\n\n"
+            parts.append(_BOLLINGER_SECTION.format_map(_OrNA(data["bollinger_bands"])))
         
         # Stochastic
         if data.get("stochastic"):
-            stoch = data["stochastic"]
-            prompt += "STOCHASTIC OSCILLATOR:\n"
-            prompt += f"%K: {stoch.get('k', 'N/A')}\n"
-            prompt += f"%D: {stoch.get('d', 'N/A')}\n"
-            prompt += f"Signal: {stoch.get('signal', 'N/A')}\n\n"
+            parts.append(_STOCHASTIC_SECTION.format_map(_OrNA(data["stochastic"])))
         
         # Support and Resistance
         if data.get("support_resistance"):
             sr = data["support_resistance"]
-            prompt += "SUPPORT & RESISTANCE LEVELS:\n"
+            parts.append("SUPPORT & RESISTANCE LEVELS:\n")
             if sr.get("resistance"):
-                prompt += f"Resistance: {', '.join(map(str, sr['resistance']))}\n"
+                parts.append(f"Resistance: {', '.join(map(str, sr['resistance']))}\n")
             if sr.get("support"):
-                prompt += f"Support: {', '.join(map(str, sr['support']))}\n"
-            prompt += "\n"
+                parts.append(f"Support: {', '.join(map(str, sr['support']))}\n")
+            parts.append("\n")
         
         # Pivot Points
         if data.get("pivot_points"):
-            pivot = data["pivot_points"]
-            prompt += "PIVOT POINTS:\n"
-            prompt += f"Pivot: {pivot.get('pivot', 'N/A')}\n"
-            prompt += f"R1: {pivot.get('r1', 'N/A')}, R2: {pivot.get('r2', 'N/A')}, R3: {pivot.get('r3', 'N/A')}\n"
-            prompt += f"S1: {pivot.get('s1', 'N/A')}, S2: {pivot.get('s2', 'N/A')}, S3: {pivot.get('s3', 'N/A')}\n\n"
+            parts.append(_PIVOT_SECTION.format_map(_OrNA(data["pivot_points"])))
         
         # Chart Patterns
         if data.get("patterns"):
-            patterns = data["patterns"]
-            if patterns:
-                prompt += "DETECTED CHART PATTERNS:\n"
-                for pattern in patterns[:5]:
-                    prompt += f"- {pattern.get('name', 'N/A')}: {pattern.get('signal', 'N/A')}\n"
-                prompt += "\n"
-        
-        prompt += "\nProvide technical analysis with:\n"
-        prompt += "1. Current trend and momentum assessment\n"
-        prompt += "2. Key support and resistance levels\n"
-        prompt += "3. Trading signal (BUY/SELL/HOLD)\n"
-        prompt += "4. Entry point (specific price)\n"
-        prompt += "5. Stop-loss level\n"
-        prompt += "6. Take-profit targets (multiple levels)\n"
-        prompt += "7. Risk/reward ratio\n"
-        prompt += "8. Timeframe for the trade\n"
-        
-        return prompt
+            parts.append("DETECTED CHART PATTERNS:\n")
+            parts.extend(
+                f"- {pattern.get('name', 'N/A')}: {pattern.get('signal', 'N/A')}\n"
+                for pattern in data["patterns"][:5]
+            )
+            parts.append("\n")
+        
+        return "".join(parts)
+    
+    def _create_batch_analysis_prompt(
+        self,
+        interval: str,
+        data_by_ticker: Dict[str, Dict[str, Any]]
+    ) -> str:
+        """Create a single prompt that analyzes several tickers."""
+        blocks = "".join(
+            f"=== TICKER: {ticker} ===\n{self._format_technical_data(data)}\n"
+            for ticker, data in data_by_ticker.items()
+        )
+        return _BATCH_ANALYSIS_PROMPT.format(interval=interval, blocks=blocks)
+    
+    def _parse_batch_analysis(self, content: str) -> Dict[str, str]:
+        """Map each ticker to its analysis text from a batch analysis response."""
+        start = content.find("{")
+        end = content.rfind("}")
+        if start == -1 or end <= start:
+            return {}
+        
+        try:
+            parsed = fastjson.loads(content[start:end + 1])
+        except ValueError:
+            return {}
+        
+        if not isinstance(parsed, dict) or not isinstance(parsed.get("analyses"), list):
+            return {}
+        return {
+            str(item.get("ticker", "")).upper(): item["analysis"]
+            for item in parsed["analyses"]
+            if isinstance(item, dict) and isinstance(item.get("analysis"), str)
+        }
     
     def get_trading_signals(
         self,
@@ -240,32 +523,51 @@ Always include stop-loss and take-profit levels."""
         Returns:
             List of trading signals
         """
-        signals = []
+        return run_sync(self.aget_trading_signals(tickers, interval))
+    
+    async def aget_trading_signals(
+        self,
+        tickers: List[str],
+        interval: str = "1D"
+    ) -> List[Dict[str, Any]]:
+        """
+        Async variant of get_trading_signals.
         
-        for ticker in tickers:
-            analysis = self.analyze_technical(ticker, interval, include_patterns=False)
-            signals.append({
-                "ticker": ticker,
+        Tickers are analyzed concurrently, so the wait is bounded by the
+        slowest ticker rather than the sum over all of them.
+        """
+        analyses = await self._aanalyze_many(tickers, interval, include_patterns=False)
+        
+        return [
+            {
+                "ticker": analysis["ticker"],
                 "signal": self._extract_signal(analysis["analysis"]),
                 "analysis": analysis["analysis"]
-            })
-        
-        return signals
+            }
+            for analysis in analyses
+        ]
     
     def _extract_signal(self, analysis_text: str) -> str:
-        """Extract trading signal from analysis text."""
-        analysis_lower = analysis_text.lower()
-        
-        if "buy" in analysis_lower and "strong buy" in analysis_lower:
-            return "STRONG_BUY"
-        elif "buy" in analysis_lower:
-            return "BUY"
-        elif "sell" in analysis_lower and "strong sell" in analysis_lower:
-            return "STRONG_SELL"
-        elif "sell" in analysis_lower:
-            return "SELL"
-        else:
-            return "HOLD"
+        """
+        Extract trading signal from analysis text.
+        
+        The side (buy or sell) mentioned more often wins, so a text that
+        mentions both no longer resolves to BUY just because buy is checked
+        first; it is STRONG_ when any of that side's mentions is. An even
+        split, or no mention at all, is HOLD.
+        """
+        # One case-insensitive pass over the text instead of lowering a copy
+        # and scanning it once per keyword
+        counts = Counter(match.lastgroup for match in _SIGNAL_RE.finditer(analysis_text))
+        
+        buys = counts["STRONG_BUY"] + counts["BUY"]
+        sells = counts["STRONG_SELL"] + counts["SELL"]
+        
+        if buys > sells:
+            return "STRONG_BUY" if counts["STRONG_BUY"] else "BUY"
+        if sells > buys:
+            return "STRONG_SELL" if counts["STRONG_SELL"] else "SELL"
+        return "HOLD"
     
     def compare_technical_strength(
         self,
@@ -282,10 +584,20 @@ Always include stop-loss and take-profit levels."""
         Returns:
             Comparative technical analysis
         """
-        analyses = []
-        for ticker in tickers:
-            analysis = self.analyze_technical(ticker, interval, include_patterns=False)
-            analyses.append(analysis)
+        return run_sync(self.acompare_technical_strength(tickers, interval))
+    
+    async def acompare_technical_strength(
+        self,
+        tickers: List[str],
+        interval: str = "1D"
+    ) -> Dict[str, Any]:
+        """
+        Async variant of compare_technical_strength.
+        
+        Per-ticker analyses are batched up to _BATCH_SIZE tickers per prompt,
+        so the system prompt is sent once per batch instead of once per ticker.
+        """
+        analyses = await self._aanalyze_batched(tickers, interval, include_patterns=False)
         
         # Create comparison prompt
         prompt = "Compare the technical strength of the following assets and rank them:\n\n"
@@ -295,11 +607,11 @@ Always include stop-loss and take-profit levels."""
         prompt += "\nRank them from strongest to weakest technical setup with rationale."
         
         messages = [
-            SystemMessage(content=self.system_prompt),
+            _SYSTEM_MESSAGE,
             HumanMessage(content=prompt)
         ]
         
-        response = self.llm.invoke(messages)
+        response = await async_pool.submit(lambda: self.llm.ainvoke(messages))
         
         return {
             "comparison": response.content,
@@ -322,40 +634,76 @@ Always include stop-loss and take-profit levels."""
         Returns:
             List of breakout opportunities
         """
-        opportunities = []
+        return run_sync(self.aidentify_breakout_opportunities(tickers, interval))
+    
+    async def aidentify_breakout_opportunities(
+        self,
+        tickers: List[str],
+        interval: str = "1D"
+    ) -> List[Dict[str, Any]]:
+        """
+        Async variant of identify_breakout_opportunities.
         
-        for ticker in tickers:
-            data = self._gather_technical_data(ticker, interval, include_patterns=True)
-            
-            # Check for breakout conditions
-            is_breakout = self._check_breakout_conditions(data)
-            
-            if is_breakout:
-                analysis = self.analyze_technical(ticker, interval, include_patterns=True)
-                opportunities.append({
-                    "ticker": ticker,
-                    "breakout_type": is_breakout,
-                    "analysis": analysis
-                })
+        Data for every ticker is gathered concurrently and screened locally;
+        the breakouts found then go to the LLM as one paced batch, reusing the
+        data already gathered.
+        """
+        semaphore = asyncio.Semaphore(_ANALYZE_CONCURRENCY)
+        
+        async def gather(ticker: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._agather_technical_data(ticker, interval, include_patterns=True)
+        
+        datasets = await asyncio.gather(*[gather(t) for t in tickers], return_exceptions=True)
+        
+        gathered = []
+        for ticker, data in zip(tickers, datasets):
+            if isinstance(data, Exception):
+                logger.warning("Failed to check %s for a breakout: %s", ticker, data)
+            else:
+                gathered.append((ticker, data))
+        
+        # Check for breakout conditions across all tickers at once
+        breakout_types = _screen_breakouts([data for _, data in gathered])
+        breakouts = [
+            (ticker, breakout_type, data)
+            for (ticker, data), breakout_type in zip(gathered, breakout_types)
+            if breakout_type
+        ]
+        
+        responses = await async_pool.submit_all(
+            [
+                lambda messages=self._analysis_messages(ticker, interval, data): self.llm.ainvoke(messages)
+                for ticker, _, data in breakouts
+            ],
+            return_exceptions=True
+        )
         
+        timestamp = self._get_timestamp()
+        opportunities = []
+        for (ticker, breakout_type, data), response in zip(breakouts, responses):
+            if isinstance(response, Exception):
+                logger.warning("Failed to analyze %s: %s", ticker, response)
+                continue
+            opportunities.append({
+                "ticker": ticker,
+                "breakout_type": breakout_type,
+                "analysis": {
+                    "ticker": ticker,
+                    "interval": interval,
+                    "analysis": response.content,
+                    "data": data,
+                    "timestamp": timestamp
+                }
+            })
         return opportunities
     
     def _check_breakout_conditions(self, data: Dict[str, Any]) -> Optional[str]:
         """Check if technical data indicates a breakout."""
         # Simple breakout detection logic
         # In production, this would be more sophisticated
-        
-        summary = data.get("summary", {})
-        rsi = data.get("rsi", {})
-        
-        if summary.get("summary") == "STRONG_BUY" and rsi.get("value", 0) > 60:
-            return "bullish_breakout"
-        elif summary.get("summary") == "STRONG_SELL" and rsi.get("value", 100) < 40:
-            return "bearish_breakout"
-        
-        return None
+        return _screen_breakouts([data])[0]
     
     def _get_timestamp(self) -> str:
         """Get current timestamp."""
-        from datetime import datetime
-        return datetime.now().isoformat()
+        return now_iso()
@@ -0,0 +1,13 @@
+"""Shared LLM plumbing used by the agents."""
+
+from .async_pool import submit, submit_all
+from .generative_cache import GenerativeCache, response_cache
+from .factory import get_llm
+
+__all__ = [
+    "submit",
+    "submit_all",
+    "GenerativeCache",
+    "response_cache",
+    "get_llm",
+]
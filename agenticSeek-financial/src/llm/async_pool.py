@@ -0,0 +1,100 @@
+"""
+Rate-limited async pool for LLM calls.
+
+Requests are started no faster than ``LLM_QPM`` per minute and at most
+``LLM_CONCURRENCY`` are in flight at once, so fanning out many prompts with
+asyncio.gather stays under the provider's rate limit instead of tripping
+retries.
+"""
+
+import asyncio
+import contextlib
+import os
+import threading
+import time
+import weakref
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, List
+
+LLM_QPM = int(os.getenv("LLM_QPM", "500"))
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "16"))
+
+# Earliest monotonic time the next request may start. Guarded by a thread lock
+# (not an asyncio lock) so pacing holds across event loops and threads.
+_next_slot = 0.0
+_slot_lock = threading.Lock()
+
+# asyncio.Semaphore is bound to the loop it is first used on
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _semaphores[loop] = asyncio.Semaphore(LLM_CONCURRENCY)
+    return semaphore
+
+
+def _reserve_slot() -> float:
+    """Reserve the next start slot and return how long to wait for it."""
+    global _next_slot
+    
+    interval = 60.0 / LLM_QPM if LLM_QPM > 0 else 0.0
+    with _slot_lock:
+        now = time.monotonic()
+        start = max(now, _next_slot)
+        _next_slot = start + interval
+    return start - now
+
+
+@contextlib.asynccontextmanager
+async def slot() -> AsyncIterator[None]:
+    """
+    Hold one of the pool's slots, waiting for the rate limit first.
+    
+    For calls submit can't wrap, such as streaming: run the whole
+    ``llm.astream`` loop inside the block so it counts as in flight.
+    """
+    async with _get_semaphore():
+        delay = _reserve_slot()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        yield
+
+
+async def submit(coro_factory: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Run an LLM call through the pool.
+    
+    Args:
+        coro_factory: Zero-argument callable returning the awaitable to run,
+            e.g. ``lambda: llm.ainvoke(messages)``
+            
+    Returns:
+        Result of the awaitable
+    """
+    async with slot():
+        return await coro_factory()
+
+
+async def submit_all(
+    coro_factories: Iterable[Callable[[], Awaitable[Any]]],
+    return_exceptions: bool = False
+) -> List[Any]:
+    """
+    Queue several LLM calls and drain them at the rate limit, preserving order.
+    
+    Args:
+        coro_factories: Zero-argument callables as accepted by submit
+        return_exceptions: Return a failed call's exception in its slot
+            instead of raising it
+            
+    Returns:
+        Results in the order of coro_factories
+    """
+    return list(await asyncio.gather(
+        *[submit(factory) for factory in coro_factories],
+        return_exceptions=return_exceptions
+    ))
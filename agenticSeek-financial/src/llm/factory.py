@@ -0,0 +1,45 @@
+"""Shared chat model instances keyed by provider, model and settings."""
+
+from functools import lru_cache
+from typing import Any
+
+
+@lru_cache(maxsize=32)
+def get_llm(
+    provider: str,
+    model_name: str,
+    temperature: float = 0.1,
+    streaming: bool = False
+) -> Any:
+    """
+    Get a chat model, reusing one instance per configuration.
+    
+    Constructing a LangChain chat model builds a fresh HTTP client and re-reads
+    credentials, so agents created per ticker share instances from here and
+    keep their connection pools warm. Provider packages are imported lazily.
+    
+    Args:
+        provider: LLM provider ("openai", "anthropic", "groq", "google")
+        model_name: Model name
+        temperature: Temperature for LLM
+        streaming: Enable token streaming
+        
+    Returns:
+        LangChain chat model
+    """
+    provider = provider.lower()
+    
+    if provider == "openai":
+        from langchain_openai import ChatOpenAI
+        return ChatOpenAI(model=model_name, temperature=temperature, streaming=streaming)
+    elif provider == "anthropic":
+        from langchain_anthropic import ChatAnthropic
+        return ChatAnthropic(model=model_name, temperature=temperature, streaming=streaming)
+    elif provider == "groq":
+        from langchain_groq import ChatGroq
+        return ChatGroq(model=model_name, temperature=temperature, streaming=streaming)
+    elif provider == "google":
+        from langchain_google_genai import ChatGoogleGenerativeAI
+        return ChatGoogleGenerativeAI(model=model_name, temperature=temperature)
+    else:
+        raise ValueError(f"Unsupported LLM provider: {provider}")
@@ -0,0 +1,116 @@
+"""
+Response cache for LLM analyses.
+
+Entries are keyed by a hash of the inputs that actually move the answer
+(system prompt, model, symbol, rounded price, sentiment bucket), so repeat
+requests within the TTL skip the LLM call entirely while a real market move
+produces a new key.
+"""
+
+import hashlib
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+from ..utils import fastjson
+
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", "300"))
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", "512"))
+
+
+def make_key(*parts: Any) -> str:
+    """
+    Build a stable cache key from the given parts.
+    
+    Strings are hashed as-is and containers (e.g. fetched data dicts) as
+    key-sorted JSON, so equal inputs hash equally regardless of dict order.
+    Each part is tagged with its kind so "1" and 1 don't collide.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        if isinstance(part, str):
+            digest.update(b"s")
+            digest.update(part.encode("utf-8"))
+        elif isinstance(part, (dict, list, tuple)):
+            digest.update(b"j")
+            digest.update(fastjson.dumps(part, sort_keys=True))
+        else:
+            digest.update(b"r")
+            digest.update(repr(part).encode("utf-8"))
+        digest.update(b"\x1f")
+    return digest.hexdigest()
+
+
+def price_bucket(value: Any, sig_figs: int = 3) -> Any:
+    """
+    Round a numeric field to sig_figs significant figures for keying.
+    
+    Rounding is relative to magnitude, so a $0.0005 token and a $60,000 coin
+    both get buckets about 0.1% wide. Non-numeric values pass through.
+    """
+    if isinstance(value, (int, float)) and math.isfinite(value) and value != 0:
+        return round(value, sig_figs - 1 - math.floor(math.log10(abs(value))))
+    return value
+
+
+def fear_greed_bucket(index: Optional[dict], width: int = 10) -> Any:
+    """Bucket the fear/greed value so small sentiment drift still hits."""
+    if not index:
+        return None
+    value = index.get("value")
+    try:
+        return int(value) // width
+    except (TypeError, ValueError):
+        return value
+
+
+class GenerativeCache:
+    """Thread-safe TTL + LRU cache of LLM responses."""
+    
+    def __init__(self, ttl: float = LLM_CACHE_TTL, max_entries: int = LLM_CACHE_SIZE):
+        """
+        Initialize the cache.
+        
+        Args:
+            ttl: Seconds a response stays valid
+            max_entries: Maximum number of cached responses
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached response for key, or None on miss/expiry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+    
+    def put(self, key: str, value: Any) -> None:
+        """Store a response under key."""
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Drop all cached responses."""
+        with self._lock:
+            self._entries.clear()
+
+
+# Process-wide cache shared by the agents
+response_cache = GenerativeCache()
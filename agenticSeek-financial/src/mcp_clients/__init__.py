@@ -5,6 +5,7 @@ from .stockflow_client import StockFlowClient
 from .financial_datasets_client import FinancialDatasetsClient
 from .tradingview_client import TradingViewClient
 from .crypto_clients import CryptoClient
+from .http_cache import HTTPCache, RedisCache
 
 __all__ = [
     "StockScreenClient",
@@ -12,4 +13,6 @@ __all__ = [
     "FinancialDatasetsClient",
     "TradingViewClient",
     "CryptoClient",
+    "HTTPCache",
+    "RedisCache",
 ]
@@ -0,0 +1,31 @@
+"""Columnar (struct-of-arrays) views of bar data returned by the MCP clients."""
+
+from typing import Any, Dict, List
+import numpy as np
+
+_OHLCV_FIELDS = ("open", "high", "low", "close", "volume")
+
+
+def ohlcv_arrays(bars: List[Dict[str, Any]], time_field: str = "timestamp") -> Dict[str, np.ndarray]:
+    """
+    Convert OHLCV bars (one dict per bar) into one array per column.
+    
+    The price and volume columns are parsed in a single np.array call and
+    stored as contiguous float64 arrays, ready for vectorized indicators.
+    
+    Args:
+        bars: Bars as returned by get_crypto_ohlcv or get_prices
+        time_field: Key holding each bar's time ("timestamp" for crypto,
+            "time" for stock prices)
+        
+    Returns:
+        time_field plus one float array per OHLCV field; missing values are NaN
+    """
+    values = np.array(
+        [[bar.get(field) for field in _OHLCV_FIELDS] for bar in bars],
+        dtype=np.float64
+    ).reshape(-1, len(_OHLCV_FIELDS))
+    
+    arrays = {time_field: np.array([bar.get(time_field) for bar in bars])}
+    arrays.update(zip(_OHLCV_FIELDS, np.ascontiguousarray(values.T)))
+    return arrays
@@ -0,0 +1,688 @@
+"""Shared HTTP plumbing for the MCP data clients."""
+
+import asyncio
+import concurrent.futures
+import contextlib
+import copy
+import functools
+import logging
+import threading
+import time
+import weakref
+from datetime import date, timedelta
+from typing import Dict, Optional, Any, Tuple
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from ..utils import fastjson
+from .http_cache import HTTPCache, get_default_cache
+
+try:
+    import h2  # noqa: F401  (enables httpx HTTP/2 support)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - depends on environment
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+# Accept-Encoding is left to each HTTP stack: requests and httpx both default
+# to every encoding they can decode (gzip and deflate, plus br and zstd when
+# brotli / zstandard are installed), which can differ between the two.
+# With msgpack installed, APIs that can answer in MessagePack are asked to:
+# it is smaller and decodes faster than JSON. Others still send JSON.
+DEFAULT_HEADERS = {
+    "Accept": "application/x-msgpack, application/json;q=0.5" if msgpack is not None else "application/json",
+}
+
+_MSGPACK_TYPES = ("application/x-msgpack", "application/msgpack")
+
+
+def _decode_body(response: Any) -> Any:
+    """
+    Decode a requests or httpx response body by its Content-Type.
+    
+    Raises:
+        ValueError: If the body is malformed
+    """
+    content_type = response.headers.get("Content-Type", "")
+    if msgpack is not None and content_type.startswith(_MSGPACK_TYPES):
+        return msgpack.unpackb(response.content)
+    return fastjson.loads(response.content)
+
+
+@functools.lru_cache(maxsize=16)
+def _iso_date(days_ago: int, minute: int) -> str:
+    return (date.today() - timedelta(days=days_ago)).isoformat()
+
+
+def iso_date(days_ago: int = 0) -> str:
+    """
+    Date N days before today as YYYY-MM-DD, for default request ranges.
+    
+    Rendered at most once a minute per offset, since every fanned-out call
+    without explicit dates asks for the same few values.
+    """
+    return _iso_date(days_ago, int(time.time() // 60))
+
+
+class BaseMCPClient:
+    """Base class providing pooled sync/async GETs through the response cache."""
+    
+    # Seconds each endpoint's responses stay fresh in the HTTP cache;
+    # endpoints without an entry are never cached
+    CACHE_TTLS: Dict[str, float] = {}
+    
+    # Endpoints whose "limit" param truncates a newest-first list, mapped to
+    # that list's field. They share one cache entry across limits, so a
+    # request for fewer rows is served from a cached larger response.
+    LIMIT_FIELDS: Dict[str, str] = {}
+    
+    # Fall back to an expired cached body when the API errors, rather than
+    # handing callers an empty result, but only within STALE_TTL_MULTIPLE
+    # TTLs of its expiry: a 60 s price may be minutes old, not days
+    SERVE_STALE = True
+    STALE_TTL_MULTIPLE = 5
+    
+    # Connection pool sizing; clients that fan out wider raise MAX_CONNECTIONS.
+    # Idle connections are kept up to MAX_KEEPALIVE_CONNECTIONS (defaults to
+    # the full pool) so the next burst reuses their TCP/TLS state. Agents
+    # spend seconds on LLM calls between bursts, so idle async connections
+    # live for KEEPALIVE_EXPIRY seconds rather than httpx's 5 s default.
+    MAX_CONNECTIONS = 32
+    MAX_KEEPALIVE_CONNECTIONS: Optional[int] = None
+    KEEPALIVE_EXPIRY = 60.0
+    
+    # Connection attempts the async transport retries before giving up
+    CONNECT_RETRIES = 2
+    
+    # Requests retry transient failures (throttling, gateway errors) with
+    # exponential backoff, honoring Retry-After. POSTs are retried too: the
+    # screening and search endpoints are read-only queries.
+    STATUS_RETRIES = 3
+    RETRY_BACKOFF = 0.3
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+    
+    # Fail fast on unreachable hosts instead of waiting out a long timeout
+    CONNECT_TIMEOUT = 3.05
+    READ_TIMEOUT = 10
+    
+    # After CIRCUIT_FAILURES consecutive outages (network errors, throttling
+    # or 5xx once retries are exhausted) an endpoint's requests fail at once
+    # for CIRCUIT_COOLDOWN seconds. Then a single request probes it while the
+    # rest keep failing fast: a response closes the circuit, another outage
+    # holds it open for a further cooldown.
+    CIRCUIT_FAILURES = 3
+    CIRCUIT_COOLDOWN = 30.0
+    
+    # Optional client-side limits that keep fan-outs under an API's quota
+    # instead of tripping 429 retries: requests start no faster than
+    # REQUESTS_PER_MINUTE (0 = unpaced), and at most MAX_IN_FLIGHT async
+    # requests run at once (None = bounded only by the connection pool)
+    REQUESTS_PER_MINUTE = 0.0
+    MAX_IN_FLIGHT: Optional[int] = None
+    
+    def __init__(
+        self,
+        api_key: Optional[str],
+        base_url: str,
+        cache: Optional[HTTPCache] = None
+    ):
+        """
+        Initialize the shared session and caches.
+        
+        Args:
+            api_key: API key for authentication
+            base_url: Base URL for the API
+            cache: Response cache (defaults to the shared on-disk cache)
+        """
+        self.api_key = api_key
+        self.base_url = base_url
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            max_retries=Retry(
+                total=self.STATUS_RETRIES,
+                backoff_factor=self.RETRY_BACKOFF,
+                status_forcelist=self.RETRY_STATUSES,
+                allowed_methods=["GET", "POST"],
+                respect_retry_after_header=True,
+                raise_on_status=False
+            ),
+            pool_maxsize=self.MAX_CONNECTIONS
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update(DEFAULT_HEADERS)
+        self.session.headers.update(self._auth_headers())
+        self.cache = cache if cache is not None else get_default_cache()
+        # httpx.AsyncClient is bound to the event loop it was created on
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+            weakref.WeakKeyDictionary()
+        )
+        # Earliest monotonic time the next request may start; a thread lock so
+        # pacing holds across threads and event loops
+        self._next_slot = 0.0
+        self._slot_lock = threading.Lock()
+        # asyncio.Semaphore is bound to the loop it is first used on
+        self._in_flight: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+        # endpoint -> (consecutive outages, monotonic time of the last one)
+        self._outages: Dict[str, Tuple[int, float]] = {}
+        self._outages_lock = threading.Lock()
+        # Identical GETs in flight, joined rather than re-sent: futures shared
+        # across threads for _get, tasks per event loop for _aget
+        self._flights: Dict[Tuple[str, bool], concurrent.futures.Future] = {}
+        self._flights_lock = threading.Lock()
+        self._aflights: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[str, bool], asyncio.Task]]" = (
+            weakref.WeakKeyDictionary()
+        )
+    
+    @classmethod
+    @functools.cache
+    def shared(cls):
+        """
+        Get a process-wide client configured from the environment.
+        
+        Reusing one client keeps a single requests.Session, so its connection
+        pool and TLS sessions are amortized across agents and tickers.
+        """
+        return cls()
+    
+    def _auth_headers(self) -> Dict[str, str]:
+        """Headers used to authenticate every request."""
+        return {"X-API-KEY": self.api_key} if self.api_key else {}
+    
+    def _reserve_slot(self) -> float:
+        """Reserve the next request start slot and return how long to wait for it."""
+        if self.REQUESTS_PER_MINUTE <= 0:
+            return 0.0
+        with self._slot_lock:
+            now = time.monotonic()
+            start = max(now, self._next_slot)
+            self._next_slot = start + 60.0 / self.REQUESTS_PER_MINUTE
+        return start - now
+    
+    def _pace(self) -> None:
+        """Block until the next sync request may start."""
+        delay = self._reserve_slot()
+        if delay > 0:
+            time.sleep(delay)
+    
+    def _in_flight_limit(self) -> Any:
+        """Async context manager holding one of MAX_IN_FLIGHT slots, if limited."""
+        if not self.MAX_IN_FLIGHT:
+            return contextlib.nullcontext()
+        loop = asyncio.get_running_loop()
+        semaphore = self._in_flight.get(loop)
+        if semaphore is None:
+            semaphore = self._in_flight[loop] = asyncio.Semaphore(self.MAX_IN_FLIGHT)
+        return semaphore
+    
+    def _circuit_open(self, endpoint: str) -> bool:
+        """
+        Whether endpoint failed too often recently to be worth calling.
+        
+        Once the cooldown has passed, the first caller is let through as the
+        probe and the cooldown restarts, so concurrent callers don't all hit
+        a still-dead endpoint.
+        """
+        with self._outages_lock:
+            failures, last = self._outages.get(endpoint, (0, 0.0))
+            if failures < self.CIRCUIT_FAILURES:
+                return False
+            now = time.monotonic()
+            if now - last < self.CIRCUIT_COOLDOWN:
+                return True
+            self._outages[endpoint] = (failures, now)
+            return False
+    
+    def _record_outcome(self, endpoint: str, outage: bool) -> None:
+        """Count an outage against endpoint, or reset it after a response."""
+        with self._outages_lock:
+            if outage:
+                failures = self._outages.get(endpoint, (0, 0.0))[0] + 1
+                self._outages[endpoint] = (failures, time.monotonic())
+                if failures == self.CIRCUIT_FAILURES:
+                    logger.warning(
+                        "%s failing, pausing requests for %.0fs", endpoint, self.CIRCUIT_COOLDOWN
+                    )
+            else:
+                self._outages.pop(endpoint, None)
+    
+    @staticmethod
+    def _status_is_outage(status: int) -> bool:
+        """Whether a final HTTP status means the endpoint, not the request, is failing."""
+        return status == 429 or status >= 500
+    
+    def _cache_ttl(self, endpoint: str) -> float:
+        """TTL for an endpoint, or 0 when it should bypass the cache."""
+        return self.CACHE_TTLS.get(endpoint, 0) if self.cache is not None else 0
+    
+    def _entry_ttl(self, endpoint: str, params: Optional[Dict[str, Any]]) -> float:
+        """TTL for one fetched response; clients shorten it for time-bucketed data."""
+        return self._cache_ttl(endpoint)
+    
+    def _limit(self, endpoint: str, params: Optional[Dict[str, Any]]) -> Optional[int]:
+        """Requested row count for a LIMIT_FIELDS endpoint, else None."""
+        if endpoint in self.LIMIT_FIELDS and params and "limit" in params:
+            return params["limit"]
+        return None
+    
+    def _cache_key(
+        self,
+        endpoint: str,
+        url: str,
+        params: Optional[Dict[str, Any]]
+    ) -> Optional[str]:
+        """Cache key for a request, or None when the endpoint isn't cached."""
+        if not self._cache_ttl(endpoint):
+            return None
+        if self._limit(endpoint, params) is not None:
+            params = {k: v for k, v in params.items() if k != "limit"}
+        return HTTPCache.make_key(url, params)
+    
+    def _cached(
+        self,
+        endpoint: str,
+        key: str,
+        params: Optional[Dict[str, Any]],
+        allow_stale: bool = False,
+        max_stale: Optional[float] = None
+    ) -> Optional[Any]:
+        """Cached body for a request, truncated to its limit where one applies."""
+        entry = self.cache.get(key, allow_stale=allow_stale, max_stale=max_stale)
+        limit = self._limit(endpoint, params)
+        if entry is None or limit is None:
+            return entry
+        
+        field = self.LIMIT_FIELDS[endpoint]
+        rows = entry["body"].get(field) or []
+        # A short list means the API had no more rows to give
+        if entry["limit"] < limit and len(rows) >= entry["limit"]:
+            return None
+        return {**entry["body"], field: rows[:limit]}
+    
+    def _store(
+        self,
+        endpoint: str,
+        key: str,
+        params: Optional[Dict[str, Any]],
+        body: Any,
+        ttl: float
+    ) -> None:
+        """Cache a fetched body, recording the limit it was fetched with."""
+        limit = self._limit(endpoint, params)
+        self.cache.set(key, body if limit is None else {"limit": limit, "body": body}, ttl)
+    
+    @staticmethod
+    def _etag_key(key: str) -> str:
+        """Cache key of the ETag that validates the entry under key."""
+        return f"etag:{key}"
+    
+    def _store_etag(self, key: str, etag: Optional[str], ttl: float) -> None:
+        """Keep a response's ETag for as long as its entry may be revalidated."""
+        if etag:
+            self.cache.set(self._etag_key(key), etag, ttl + self.cache.STALE_GRACE)
+    
+    def _conditional_headers(
+        self,
+        endpoint: str,
+        key: str,
+        params: Optional[Dict[str, Any]]
+    ) -> Optional[Dict[str, str]]:
+        """If-None-Match for an expired entry that could still answer this request."""
+        etag = self.cache.get(self._etag_key(key))
+        if etag is None or self._cached(endpoint, key, params, allow_stale=True) is None:
+            return None
+        return {"If-None-Match": etag}
+    
+    def _revalidated(
+        self,
+        endpoint: str,
+        key: str,
+        params: Optional[Dict[str, Any]]
+    ) -> Optional[Any]:
+        """After a 304, renew the expired entry's TTL and return its body."""
+        ttl = self._entry_ttl(endpoint, params)
+        entry = self.cache.get(key, allow_stale=True)
+        if entry is None:
+            return None
+        self.cache.set(key, entry, ttl)
+        self._store_etag(key, self.cache.get(self._etag_key(key)), ttl)
+        return self._cached(endpoint, key, params)
+    
+    def _stale(
+        self,
+        endpoint: str,
+        key: Optional[str],
+        params: Optional[Dict[str, Any]],
+        error: Exception
+    ) -> Optional[Any]:
+        """Recently expired cached body to serve after a failed fetch, if one is kept."""
+        if not key or not self.SERVE_STALE:
+            return None
+        max_stale = self.STALE_TTL_MULTIPLE * self._cache_ttl(endpoint)
+        body = self._cached(endpoint, key, params, allow_stale=True, max_stale=max_stale)
+        if body is not None:
+            logger.warning("Serving stale %s after fetch error: %s", key, error)
+        return body
+    
+    def _flight_key(self, path: str, params: Optional[Dict[str, Any]], force_refresh: bool) -> Tuple[str, bool]:
+        """Identity of a GET for coalescing; unlike cache keys, limit is kept."""
+        return HTTPCache.make_key(f"{self.base_url}{path}", params), force_refresh
+    
+    def _get(
+        self,
+        endpoint: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        force_refresh: bool = False
+    ) -> Any:
+        """
+        GET a JSON endpoint through the response cache.
+        
+        Concurrent identical calls from other threads wait for the first
+        one's response instead of sending their own request. Each of them
+        gets its own copy of the body, so callers may mutate what they get.
+        
+        Args:
+            endpoint: Endpoint name used to look up its TTL in CACHE_TTLS
+            path: Path relative to base_url
+            params: Query parameters
+            force_refresh: Skip the cached copy and re-fetch
+        
+        Returns:
+            Decoded JSON body
+        
+        Raises:
+            requests.exceptions.RequestException: On HTTP or network errors,
+                or if the body is malformed
+        """
+        flight = self._flight_key(path, params, force_refresh)
+        with self._flights_lock:
+            future = self._flights.get(flight)
+            leader = future is None
+            if leader:
+                future = self._flights[flight] = concurrent.futures.Future()
+        
+        if not leader:
+            return copy.deepcopy(future.result())
+        
+        try:
+            body = self._get_once(endpoint, path, params, force_refresh)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(body)
+            return body
+        finally:
+            with self._flights_lock:
+                del self._flights[flight]
+    
+    def _get_once(
+        self,
+        endpoint: str,
+        path: str,
+        params: Optional[Dict[str, Any]],
+        force_refresh: bool
+    ) -> Any:
+        """Body of _get for one caller: cache lookup, request, store."""
+        url = f"{self.base_url}{path}"
+        key = self._cache_key(endpoint, url, params)
+        headers = None
+        
+        if key and not force_refresh:
+            cached = self._cached(endpoint, key, params)
+            if cached is not None:
+                return cached
+            headers = self._conditional_headers(endpoint, key, params)
+        
+        try:
+            if self._circuit_open(endpoint):
+                raise requests.exceptions.ConnectionError(f"{endpoint} circuit open after repeated failures")
+            try:
+                self._pace()
+                response = self.session.get(
+                    url,
+                    params=params,
+                    headers=headers,
+                    timeout=(self.CONNECT_TIMEOUT, self.READ_TIMEOUT)
+                )
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                self._record_outcome(endpoint, outage=True)
+                raise
+            self._record_outcome(endpoint, outage=self._status_is_outage(response.status_code))
+            if response.status_code == 304:
+                body = self._revalidated(endpoint, key, params)
+                if body is None:
+                    raise requests.exceptions.HTTPError("304 for an evicted cache entry", response=response)
+                return body
+            response.raise_for_status()
+            try:
+                body = _decode_body(response)
+            except ValueError as e:
+                # Keep the RequestException contract callers already handle
+                raise requests.exceptions.InvalidJSONError(str(e), response=response) from e
+        except requests.exceptions.RequestException as e:
+            stale = self._stale(endpoint, key, params, e)
+            if stale is None:
+                raise
+            return stale
+        
+        if key:
+            ttl = self._entry_ttl(endpoint, params)
+            self._store(endpoint, key, params, body, ttl)
+            self._store_etag(key, response.headers.get("ETag"), ttl)
+        return body
+    
+    def _post(self, path: str, json: Dict[str, Any]) -> Any:
+        """
+        POST a JSON payload and decode the reply (never cached).
+        
+        Raises:
+            requests.exceptions.RequestException: On HTTP or network errors,
+                or if the body is malformed
+        """
+        self._pace()
+        response = self.session.post(
+            f"{self.base_url}{path}",
+            data=fastjson.dumps(json),
+            headers={"Content-Type": "application/json"},
+            timeout=(self.CONNECT_TIMEOUT, self.READ_TIMEOUT)
+        )
+        response.raise_for_status()
+        try:
+            return _decode_body(response)
+        except ValueError as e:
+            raise requests.exceptions.InvalidJSONError(str(e), response=response) from e
+    
+    def aio(self) -> httpx.AsyncClient:
+        """
+        Get the async HTTP client for the running event loop.
+        
+        One pooled client per loop multiplexes concurrent requests over a few
+        connections (HTTP/2 when the h2 package is installed).
+        """
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            transport = httpx.AsyncHTTPTransport(
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_connections=self.MAX_CONNECTIONS,
+                    max_keepalive_connections=self.MAX_KEEPALIVE_CONNECTIONS or self.MAX_CONNECTIONS,
+                    keepalive_expiry=self.KEEPALIVE_EXPIRY
+                ),
+                retries=self.CONNECT_RETRIES
+            )
+            client = httpx.AsyncClient(
+                headers={**DEFAULT_HEADERS, **self._auth_headers()},
+                transport=transport,
+                timeout=httpx.Timeout(self.READ_TIMEOUT, connect=self.CONNECT_TIMEOUT)
+            )
+            self._async_clients[loop] = client
+        return client
+    
+    def _retry_delay(self, response: httpx.Response, attempt: int) -> float:
+        """Seconds to wait before retrying: Retry-After if given, else backoff."""
+        retry_after = response.headers.get("Retry-After")
+        if retry_after is not None:
+            try:
+                return max(float(retry_after), 0.0)
+            except ValueError:
+                pass
+        return self.RETRY_BACKOFF * (2 ** attempt)
+    
+    async def _asend(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """
+        Send an async request with the same status retry policy as the sync session.
+        
+        The httpx transport only retries failed connections, so throttled
+        (429) and gateway-error responses are retried here.
+        """
+        client = self.aio()
+        async with self._in_flight_limit():
+            for attempt in range(self.STATUS_RETRIES + 1):
+                delay = self._reserve_slot()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                response = await client.request(method, url, **kwargs)
+                if response.status_code not in self.RETRY_STATUSES or attempt == self.STATUS_RETRIES:
+                    return response
+                await response.aclose()
+                await asyncio.sleep(self._retry_delay(response, attempt))
+    
+    async def awarm_up(self) -> None:
+        """
+        Open a pooled connection to the API host ahead of the first request.
+        
+        Sends a HEAD to base_url on the running loop's client so DNS, TCP and
+        TLS (and HTTP/2 negotiation) are done before the first real call. The
+        response itself is ignored, and failures only mean no warm connection.
+        """
+        try:
+            await self.aio().head(self.base_url)
+        except httpx.HTTPError as e:
+            logger.debug("Connection warm-up for %s failed: %s", self.base_url, e)
+    
+    async def aclose(self) -> None:
+        """Close the async client bound to the running event loop, if any."""
+        client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+    
+    def close(self) -> None:
+        """Close the sync session's pooled connections."""
+        self.session.close()
+    
+    async def _aget(
+        self,
+        endpoint: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        force_refresh: bool = False
+    ) -> Any:
+        """
+        Async variant of _get, sharing the same response cache.
+        
+        Concurrent identical calls on the same event loop await one shared
+        fetch; cancelling one caller doesn't cancel it for the others. As in
+        _get, callers that joined it get their own copy of the body.
+        
+        Raises:
+            httpx.HTTPError: On HTTP or network errors
+            ValueError: If the body is malformed
+        """
+        loop = asyncio.get_running_loop()
+        flights = self._aflights.get(loop)
+        if flights is None:
+            flights = self._aflights[loop] = {}
+        
+        flight = self._flight_key(path, params, force_refresh)
+        task = flights.get(flight)
+        leader = task is None
+        if leader:
+            task = flights[flight] = loop.create_task(self._aget_once(endpoint, path, params, force_refresh))
+            
+            def land(done: asyncio.Task) -> None:
+                flights.pop(flight, None)
+                # Mark the error retrieved in case every caller was cancelled
+                if not done.cancelled():
+                    done.exception()
+            
+            task.add_done_callback(land)
+        body = await asyncio.shield(task)
+        return body if leader else copy.deepcopy(body)
+    
+    async def _aget_once(
+        self,
+        endpoint: str,
+        path: str,
+        params: Optional[Dict[str, Any]],
+        force_refresh: bool
+    ) -> Any:
+        """Async variant of _get_once."""
+        url = f"{self.base_url}{path}"
+        key = self._cache_key(endpoint, url, params)
+        headers = None
+        
+        if key and not force_refresh:
+            cached = self._cached(endpoint, key, params)
+            if cached is not None:
+                return cached
+            headers = self._conditional_headers(endpoint, key, params)
+        
+        try:
+            if self._circuit_open(endpoint):
+                raise httpx.ConnectError(f"{endpoint} circuit open after repeated failures")
+            try:
+                response = await self._asend("GET", url, params=params, headers=headers)
+            except httpx.TransportError:
+                self._record_outcome(endpoint, outage=True)
+                raise
+            self._record_outcome(endpoint, outage=self._status_is_outage(response.status_code))
+            if response.status_code == 304:
+                body = self._revalidated(endpoint, key, params)
+                if body is None:
+                    raise httpx.HTTPStatusError(
+                        "304 for an evicted cache entry", request=response.request, response=response
+                    )
+                return body
+            response.raise_for_status()
+            body = _decode_body(response)
+        except (httpx.HTTPError, ValueError) as e:
+            stale = self._stale(endpoint, key, params, e)
+            if stale is None:
+                raise
+            return stale
+        
+        if key:
+            ttl = self._entry_ttl(endpoint, params)
+            self._store(endpoint, key, params, body, ttl)
+            self._store_etag(key, response.headers.get("ETag"), ttl)
+        return body
+    
+    async def _apost(self, path: str, json: Dict[str, Any]) -> Any:
+        """
+        Async variant of _post.
+        
+        Raises:
+            httpx.HTTPError: On HTTP or network errors
+            ValueError: If the body is malformed
+        """
+        response = await self._asend(
+            "POST",
+            f"{self.base_url}{path}",
+            content=fastjson.dumps(json),
+            headers={"Content-Type": "application/json"}
+        )
+        response.raise_for_status()
+        return _decode_body(response)
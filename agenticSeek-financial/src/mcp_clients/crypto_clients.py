@@ -1,32 +1,81 @@
 """Crypto MCP Client for cryptocurrency data and analysis."""
 
+import asyncio
+import logging
 import os
 from typing import Dict, List, Optional, Any
+import httpx
+import numpy as np
 import requests
-from datetime import datetime, timedelta
 
+from ..utils import run_sync
+from .arrays import ohlcv_arrays
+from .base import BaseMCPClient, iso_date
+from .http_cache import HTTPCache
 
-class CryptoClient:
+logger = logging.getLogger(__name__)
+
+
+def _ohlcv_params(
+    start_date: str,
+    end_date: str,
+    interval: str,
+    limit: Optional[int]
+) -> Dict[str, Any]:
+    """Query params for the OHLCV endpoint; limit is only sent when set."""
+    params = {
+        "start_date": start_date,
+        "end_date": end_date,
+        "interval": interval
+    }
+    if limit is not None:
+        params["limit"] = limit
+    return params
+
+
+class CryptoClient(BaseMCPClient):
     """Client for accessing cryptocurrency data via MCP protocol."""
     
-    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
+    # Seconds each endpoint's responses stay fresh in the HTTP cache
+    CACHE_TTLS = {
+        "price": 30,
+        "ohlcv": 300,
+        "market_data": 60,
+        "top": 300,
+        "exchanges": 3600,
+        "onchain": 300,
+        "defi": 300,
+        "news": 600,
+        "fear_greed": 3600,
+        "trending": 300,
+        "nft": 300,
+    }
+    
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        cache: Optional[HTTPCache] = None
+    ):
         """
         Initialize Crypto client.
         
         Args:
             api_key: API key for authentication
             base_url: Base URL for the MCP server
+            cache: Response cache (defaults to the shared on-disk cache)
         """
-        self.api_key = api_key or os.getenv("CRYPTO_API_KEY")
-        self.base_url = base_url or os.getenv("CRYPTO_BASE_URL", "https://api.crypto-data.io/v1")
-        self.session = requests.Session()
-        if self.api_key:
-            self.session.headers.update({"X-API-KEY": self.api_key})
+        super().__init__(
+            api_key or os.getenv("CRYPTO_API_KEY"),
+            base_url or os.getenv("CRYPTO_BASE_URL", "https://api.crypto-data.io/v1"),
+            cache
+        )
     
     def get_crypto_price(
         self,
         symbol: str,
-        vs_currency: str = "usd"
+        vs_currency: str = "usd",
+        force_refresh: bool = False
     ) -> Optional[Dict[str, Any]]:
         """
         Get current price for a cryptocurrency.
@@ -34,20 +83,20 @@ class CryptoClient:
         Args:
             symbol: Crypto symbol (e.g., "BTC", "ETH")
             vs_currency: Quote currency (e.g., "usd", "eur")
+            force_refresh: Bypass the response cache
             
         Returns:
             Current price data
         """
         try:
-            response = self.session.get(
-                f"{self.base_url}/price/{symbol}",
+            return self._get(
+                "price",
+                f"/price/{symbol}",
                 params={"vs_currency": vs_currency},
-                timeout=30
+                force_refresh=force_refresh
             )
-            response.raise_for_status()
-            return response.json()
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching crypto price for {symbol}: {e}")
+            logger.warning("Error fetching crypto price for %s: %s", symbol, e)
             return None
     
     def get_crypto_ohlcv(
@@ -55,7 +104,9 @@ class CryptoClient:
         symbol: str,
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
-        interval: str = "1d"
+        interval: str = "1d",
+        force_refresh: bool = False,
+        limit: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """
         Get OHLCV (Open, High, Low, Close, Volume) data for a cryptocurrency.
@@ -65,59 +116,77 @@ class CryptoClient:
             start_date: Start date (YYYY-MM-DD)
             end_date: End date (YYYY-MM-DD)
             interval: Time interval ("1m", "5m", "1h", "1d", "1w")
+            force_refresh: Bypass the response cache
+            limit: Maximum number of bars; sent to the API so it returns no more
             
         Returns:
             List of OHLCV data
         """
-        if not end_date:
-            end_date = datetime.now().strftime("%Y-%m-%d")
-        if not start_date:
-            start_date = (datetime.now() - timedelta(days=90)).strftime("%Y-%m-%d")
+        start_date = start_date or iso_date(90)
+        end_date = end_date or iso_date()
         
         try:
-            response = self.session.get(
-                f"{self.base_url}/ohlcv/{symbol}",
-                params={
-                    "start_date": start_date,
-                    "end_date": end_date,
-                    "interval": interval
-                },
-                timeout=30
-            )
-            response.raise_for_status()
-            return response.json().get("data", [])
+            bars = self._get(
+                "ohlcv",
+                f"/ohlcv/{symbol}",
+                params=_ohlcv_params(start_date, end_date, interval, limit),
+                force_refresh=force_refresh
+            ).get("data", [])
+            return bars[:limit] if limit is not None else bars
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching OHLCV for {symbol}: {e}")
+            logger.warning("Error fetching OHLCV for %s: %s", symbol, e)
             return []
     
+    def get_crypto_ohlcv_arrays(
+        self,
+        symbol: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        interval: str = "1d",
+        force_refresh: bool = False
+    ) -> Dict[str, np.ndarray]:
+        """
+        Get OHLCV data as column arrays (see ohlcv_arrays).
+        
+        Args:
+            symbol: Crypto symbol
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD)
+            interval: Time interval ("1m", "5m", "1h", "1d", "1w")
+            force_refresh: Bypass the response cache
+            
+        Returns:
+            "timestamp", "open", "high", "low", "close" and "volume" arrays
+            (empty if the fetch failed)
+        """
+        return ohlcv_arrays(self.get_crypto_ohlcv(symbol, start_date, end_date, interval, force_refresh))
+    
     def get_market_data(
         self,
-        symbol: str
+        symbol: str,
+        force_refresh: bool = False
     ) -> Optional[Dict[str, Any]]:
         """
         Get comprehensive market data for a cryptocurrency.
         
         Args:
             symbol: Crypto symbol
+            force_refresh: Bypass the response cache
             
         Returns:
             Market data including market cap, volume, supply, etc.
         """
         try:
-            response = self.session.get(
-                f"{self.base_url}/market/{symbol}",
-                timeout=30
-            )
-            response.raise_for_status()
-            return response.json()
+            return self._get("market_data", f"/market/{symbol}", force_refresh=force_refresh)
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching market data for {symbol}: {e}")
+            logger.warning("Error fetching market data for %s: %s", symbol, e)
             return None
     
     def get_top_cryptocurrencies(
         self,
         limit: int = 100,
-        sort_by: str = "market_cap"
+        sort_by: str = "market_cap",
+        force_refresh: bool = False
     ) -> List[Dict[str, Any]]:
         """
         Get top cryptocurrencies by market cap or other metrics.
@@ -125,101 +194,93 @@ class CryptoClient:
         Args:
             limit: Maximum number of results
             sort_by: Sort criteria ("market_cap", "volume", "price_change_24h")
+            force_refresh: Bypass the response cache
             
         Returns:
             List of top cryptocurrencies
         """
         try:
-            response = self.session.get(
-                f"{self.base_url}/top",
+            return self._get(
+                "top",
+                "/top",
                 params={
                     "limit": limit,
                     "sort_by": sort_by
                 },
-                timeout=30
-            )
-            response.raise_for_status()
-            return response.json().get("cryptocurrencies", [])
+                force_refresh=force_refresh
+            ).get("cryptocurrencies", [])
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching top cryptocurrencies: {e}")
+            logger.warning("Error fetching top cryptocurrencies: %s", e)
             return []
     
     def get_crypto_exchanges(
         self,
-        symbol: str
+        symbol: str,
+        force_refresh: bool = False
     ) -> List[Dict[str, Any]]:
         """
         Get exchange listings for a cryptocurrency.
         
         Args:
             symbol: Crypto symbol
+            force_refresh: Bypass the response cache
             
         Returns:
             List of exchanges where the crypto is traded
         """
         try:
-            response = self.session.get(
-                f"{self.base_url}/exchanges/{symbol}",
-                timeout=30
-            )
-            response.raise_for_status()
-            return response.json().get("exchanges", [])
+            return self._get("exchanges", f"/exchanges/{symbol}", force_refresh=force_refresh).get("exchanges", [])
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching exchanges for {symbol}: {e}")
+            logger.warning("Error fetching exchanges for %s: %s", symbol, e)
             return []
     
     def get_on_chain_metrics(
         self,
-        symbol: str
+        symbol: str,
+        force_refresh: bool = False
     ) -> Optional[Dict[str, Any]]:
         """
         Get on-chain metrics for a cryptocurrency.
         
         Args:
             symbol: Crypto symbol
+            force_refresh: Bypass the response cache
             
         Returns:
             On-chain metrics (active addresses, transaction count, etc.)
         """
         try:
-            response = self.session.get(
-                f"{self.base_url}/onchain/{symbol}",
-                timeout=30
-            )
-            response.raise_for_status()
-            return response.json()
+            return self._get("onchain", f"/onchain/{symbol}", force_refresh=force_refresh)
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching on-chain metrics for {symbol}: {e}")
+            logger.warning("Error fetching on-chain metrics for %s: %s", symbol, e)
             return None
     
     def get_defi_metrics(
         self,
-        protocol: str
+        protocol: str,
+        force_refresh: bool = False
     ) -> Optional[Dict[str, Any]]:
         """
         Get DeFi protocol metrics.
         
         Args:
             protocol: Protocol name (e.g., "uniswap", "aave", "compound")
+            force_refresh: Bypass the response cache
             
         Returns:
             DeFi metrics (TVL, volume, fees, etc.)
         """
         try:
-            response = self.session.get(
-                f"{self.base_url}/defi/{protocol}",
-                timeout=30
-            )
-            response.raise_for_status()
-            return response.json()
+            return self._get("defi", f"/defi/{protocol}", force_refresh=force_refresh)
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching DeFi metrics for {protocol}: {e}")
+            logger.warning("Error fetching DeFi metrics for %s: %s", protocol, e)
             return None
     
     def get_crypto_news(
         self,
         symbol: Optional[str] = None,
-        limit: int = 50
+        limit: int = 50,
+        force_refresh: bool = False
     ) -> List[Dict[str, Any]]:
         """
         Get cryptocurrency news.
@@ -227,6 +288,7 @@ class CryptoClient:
         Args:
             symbol: Crypto symbol (optional, for symbol-specific news)
             limit: Maximum number of results
+            force_refresh: Bypass the response cache
             
         Returns:
             List of news articles
@@ -236,80 +298,284 @@ class CryptoClient:
             if symbol:
                 params["symbol"] = symbol
             
-            response = self.session.get(
-                f"{self.base_url}/news",
+            return self._get(
+                "news",
+                "/news",
                 params=params,
-                timeout=30
-            )
-            response.raise_for_status()
-            return response.json().get("news", [])
+                force_refresh=force_refresh
+            ).get("news", [])
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching crypto news: {e}")
+            logger.warning("Error fetching crypto news: %s", e)
             return []
     
-    def get_fear_greed_index(self) -> Optional[Dict[str, Any]]:
+    def get_fear_greed_index(self, force_refresh: bool = False) -> Optional[Dict[str, Any]]:
         """
         Get crypto fear & greed index.
         
+        Args:
+            force_refresh: Bypass the response cache
+            
         Returns:
             Fear & greed index data
         """
         try:
-            response = self.session.get(
-                f"{self.base_url}/fear-greed",
-                timeout=30
-            )
-            response.raise_for_status()
-            return response.json()
+            return self._get("fear_greed", "/fear-greed", force_refresh=force_refresh)
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching fear & greed index: {e}")
+            logger.warning("Error fetching fear & greed index: %s", e)
             return None
     
     def get_trending_cryptos(
         self,
-        limit: int = 20
+        limit: int = 20,
+        force_refresh: bool = False
     ) -> List[Dict[str, Any]]:
         """
         Get trending cryptocurrencies.
         
         Args:
             limit: Maximum number of results
+            force_refresh: Bypass the response cache
             
         Returns:
             List of trending cryptocurrencies
         """
         try:
-            response = self.session.get(
-                f"{self.base_url}/trending",
+            return self._get(
+                "trending",
+                "/trending",
                 params={"limit": limit},
-                timeout=30
-            )
-            response.raise_for_status()
-            return response.json().get("trending", [])
+                force_refresh=force_refresh
+            ).get("trending", [])
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching trending cryptos: {e}")
+            logger.warning("Error fetching trending cryptos: %s", e)
             return []
     
     def get_nft_data(
         self,
-        collection: str
+        collection: str,
+        force_refresh: bool = False
     ) -> Optional[Dict[str, Any]]:
         """
         Get NFT collection data.
         
         Args:
             collection: NFT collection name or address
+            force_refresh: Bypass the response cache
             
         Returns:
             NFT collection data (floor price, volume, etc.)
         """
         try:
-            response = self.session.get(
-                f"{self.base_url}/nft/{collection}",
-                timeout=30
-            )
-            response.raise_for_status()
-            return response.json()
+            return self._get("nft", f"/nft/{collection}", force_refresh=force_refresh)
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching NFT data for {collection}: {e}")
+            logger.warning("Error fetching NFT data for %s: %s", collection, e)
+            return None
+    
+    async def aget_crypto_price(
+        self,
+        symbol: str,
+        vs_currency: str = "usd",
+        force_refresh: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """Async variant of get_crypto_price."""
+        try:
+            return await self._aget(
+                "price",
+                f"/price/{symbol}",
+                params={"vs_currency": vs_currency},
+                force_refresh=force_refresh
+            )
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning("Error fetching crypto price for %s: %s", symbol, e)
+            return None
+    
+    async def aget_crypto_ohlcv(
+        self,
+        symbol: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        interval: str = "1d",
+        force_refresh: bool = False,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Async variant of get_crypto_ohlcv."""
+        start_date = start_date or iso_date(90)
+        end_date = end_date or iso_date()
+        
+        try:
+            body = await self._aget(
+                "ohlcv",
+                f"/ohlcv/{symbol}",
+                params=_ohlcv_params(start_date, end_date, interval, limit),
+                force_refresh=force_refresh
+            )
+            bars = body.get("data", [])
+            return bars[:limit] if limit is not None else bars
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning("Error fetching OHLCV for %s: %s", symbol, e)
+            return []
+    
+    def get_prices(
+        self,
+        symbols: List[str],
+        vs_currency: str = "usd",
+        force_refresh: bool = False
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Get current prices for several cryptocurrencies at once.
+        
+        Args:
+            symbols: Crypto symbols
+            vs_currency: Quote currency
+            force_refresh: Bypass the response cache
+            
+        Returns:
+            Price data per symbol (None where the fetch failed)
+        """
+        return run_sync(self.aget_prices(symbols, vs_currency, force_refresh))
+    
+    async def aget_prices(
+        self,
+        symbols: List[str],
+        vs_currency: str = "usd",
+        force_refresh: bool = False
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Async variant of get_prices; the requests share one pooled connection set."""
+        prices = await asyncio.gather(*[
+            self.aget_crypto_price(symbol, vs_currency, force_refresh)
+            for symbol in symbols
+        ])
+        return dict(zip(symbols, prices))
+    
+    async def aget_crypto_ohlcv_arrays(
+        self,
+        symbol: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        interval: str = "1d",
+        force_refresh: bool = False
+    ) -> Dict[str, np.ndarray]:
+        """Async variant of get_crypto_ohlcv_arrays."""
+        return ohlcv_arrays(await self.aget_crypto_ohlcv(symbol, start_date, end_date, interval, force_refresh))
+    
+    async def aget_market_data(
+        self,
+        symbol: str,
+        force_refresh: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """Async variant of get_market_data."""
+        try:
+            return await self._aget("market_data", f"/market/{symbol}", force_refresh=force_refresh)
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning("Error fetching market data for %s: %s", symbol, e)
+            return None
+    
+    async def aget_top_cryptocurrencies(
+        self,
+        limit: int = 100,
+        sort_by: str = "market_cap",
+        force_refresh: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Async variant of get_top_cryptocurrencies."""
+        try:
+            body = await self._aget(
+                "top",
+                "/top",
+                params={
+                    "limit": limit,
+                    "sort_by": sort_by
+                },
+                force_refresh=force_refresh
+            )
+            return body.get("cryptocurrencies", [])
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning("Error fetching top cryptocurrencies: %s", e)
+            return []
+    
+    async def aget_crypto_exchanges(
+        self,
+        symbol: str,
+        force_refresh: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Async variant of get_crypto_exchanges."""
+        try:
+            body = await self._aget("exchanges", f"/exchanges/{symbol}", force_refresh=force_refresh)
+            return body.get("exchanges", [])
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning("Error fetching exchanges for %s: %s", symbol, e)
+            return []
+    
+    async def aget_on_chain_metrics(
+        self,
+        symbol: str,
+        force_refresh: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """Async variant of get_on_chain_metrics."""
+        try:
+            return await self._aget("onchain", f"/onchain/{symbol}", force_refresh=force_refresh)
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning("Error fetching on-chain metrics for %s: %s", symbol, e)
+            return None
+    
+    async def aget_defi_metrics(
+        self,
+        protocol: str,
+        force_refresh: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """Async variant of get_defi_metrics."""
+        try:
+            return await self._aget("defi", f"/defi/{protocol}", force_refresh=force_refresh)
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning("Error fetching DeFi metrics for %s: %s", protocol, e)
+            return None
+    
+    async def aget_crypto_news(
+        self,
+        symbol: Optional[str] = None,
+        limit: int = 50,
+        force_refresh: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Async variant of get_crypto_news."""
+        params = {"limit": limit}
+        if symbol:
+            params["symbol"] = symbol
+        
+        try:
+            body = await self._aget("news", "/news", params=params, force_refresh=force_refresh)
+            return body.get("news", [])
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning("Error fetching crypto news: %s", e)
+            return []
+    
+    async def aget_fear_greed_index(self, force_refresh: bool = False) -> Optional[Dict[str, Any]]:
+        """Async variant of get_fear_greed_index."""
+        try:
+            return await self._aget("fear_greed", "/fear-greed", force_refresh=force_refresh)
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning("Error fetching fear & greed index: %s", e)
+            return None
+    
+    async def aget_trending_cryptos(
+        self,
+        limit: int = 20,
+        force_refresh: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Async variant of get_trending_cryptos."""
+        try:
+            body = await self._aget("trending", "/trending", params={"limit": limit}, force_refresh=force_refresh)
+            return body.get("trending", [])
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning("Error fetching trending cryptos: %s", e)
+            return []
+    
+    async def aget_nft_data(
+        self,
+        collection: str,
+        force_refresh: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """Async variant of get_nft_data."""
+        try:
+            return await self._aget("nft", f"/nft/{collection}", force_refresh=force_refresh)
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning("Error fetching NFT data for %s: %s", collection, e)
             return None
@@ -1,35 +1,234 @@
 """Financial Datasets MCP Client for comprehensive financial data."""
 
+import asyncio
+import logging
 import os
-from typing import Dict, List, Optional, Any
+import re
+import string
+from typing import Dict, Iterator, List, Optional, Any, Sequence, Tuple
+import httpx
+import numpy as np
 import requests
-from datetime import datetime, timedelta
 
+from ..utils import fastjson, run_sync
+from .arrays import ohlcv_arrays
+from .base import BaseMCPClient, iso_date
+from .http_cache import HTTPCache
+from .schemas import (
+    BalanceSheet,
+    CashFlowStatement,
+    CompanyFacts,
+    FinancialMetrics,
+    IncomeStatement,
+    InsiderTrade,
+    PriceBar,
+)
 
-class FinancialDatasetsClient:
+logger = logging.getLogger(__name__)
+
+# Per-ticker endpoint name -> (path, description for error logs, whether it
+# returns a list). The name is also the response field holding the data and
+# the endpoint's key in CACHE_TTLS / LIMIT_FIELDS.
+_ENDPOINTS = {
+    "financial_metrics": ("/financial-metrics/", "financial metrics", True),
+    "income_statements": ("/financials/income-statements/", "income statement", True),
+    "balance_sheets": ("/financials/balance-sheets/", "balance sheet", True),
+    "cash_flow_statements": ("/financials/cash-flow-statements/", "cash flow statement", True),
+    "prices": ("/prices/", "prices", True),
+    "company_facts": ("/company/facts/", "company facts", False),
+    "insider_trades": ("/insider-trades/", "insider trades", True),
+}
+
+# Prebuilt query strings for hot endpoints, skipping per-call urlencoding.
+# An endpoint may have one template per param set it's called with; one is
+# only used when the params are exactly its fields and every value is
+# URL-safe. Endpoints in LIMIT_FIELDS need their params for cache keys, so
+# aren't here.
+_PRICES_QUERY = (
+    "/prices/?ticker={ticker}&start_date={start_date}&end_date={end_date}"
+    "&interval={interval}&interval_multiplier={interval_multiplier}"
+)
+
+_QUERY_TEMPLATES = {
+    "prices": (_PRICES_QUERY, _PRICES_QUERY + "&limit={limit}"),
+}
+
+# (endpoint, param names) -> template
+_TEMPLATES_BY_FIELDS = {
+    (endpoint, frozenset(field for _, field, _, _ in string.Formatter().parse(template) if field)): template
+    for endpoint, templates in _QUERY_TEMPLATES.items()
+    for template in templates
+}
+
+_URL_SAFE = re.compile(r"[A-Za-z0-9._~-]+\Z")
+
+
+def _request_target(endpoint: str, params: Dict[str, Any]) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """(path, params) to GET for an _ENDPOINTS endpoint, templated where possible."""
+    template = _TEMPLATES_BY_FIELDS.get((endpoint, frozenset(params)))
+    if (
+        template is not None
+        and all(_URL_SAFE.match(str(value)) for value in params.values())
+    ):
+        return template.format(**params), None
+    return _ENDPOINTS[endpoint][0], params
+
+
+def _prices_params(
+    ticker: str,
+    start_date: Optional[str],
+    end_date: Optional[str],
+    interval: str,
+    limit: Optional[int]
+) -> Dict[str, Any]:
+    """Query params for the prices endpoint; limit is only sent when set."""
+    params = {
+        "ticker": ticker,
+        "start_date": start_date or iso_date(365),
+        "end_date": end_date or iso_date(),
+        "interval": interval,
+        "interval_multiplier": 1
+    }
+    if limit is not None:
+        params["limit"] = limit
+    return params
+
+
+def _select_fields(rows: List[Dict[str, Any]], fields: Optional[Sequence[str]]) -> List[Dict[str, Any]]:
+    """Rows cut down to the given keys (missing ones skipped); all of them if fields is None."""
+    if fields is None:
+        return rows
+    return [{field: row[field] for field in fields if field in row} for row in rows]
+
+
+def _split_by_ticker(
+    results: List[Dict[str, Any]],
+    tickers: List[str],
+    limit: int
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Group multi-ticker search results per requested ticker, capped at limit each."""
+    by_ticker: Dict[str, List[Dict[str, Any]]] = {ticker: [] for ticker in tickers}
+    for row in results:
+        rows = by_ticker.get(row.get("ticker"))
+        if rows is not None and len(rows) < limit:
+            rows.append(row)
+    return by_ticker
+
+
+class FinancialDatasetsClient(BaseMCPClient):
     """Client for accessing comprehensive financial datasets via MCP protocol."""
     
-    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
+    # Seconds each endpoint's responses stay fresh in the HTTP cache.
+    # Statements and company facts only change with new filings.
+    CACHE_TTLS = {
+        "financial_metrics": 86400,
+        "income_statements": 86400,
+        "balance_sheets": 86400,
+        "cash_flow_statements": 86400,
+        "company_facts": 86400,
+        "insider_trades": 3600,
+        "prices": 60,
+    }
+    
+    # List endpoints whose "limit" keeps the newest N rows; the agents ask
+    # for different N, so smaller requests reuse a cached larger one
+    LIMIT_FIELDS = {
+        "financial_metrics": "financial_metrics",
+        "income_statements": "income_statements",
+        "balance_sheets": "balance_sheets",
+        "cash_flow_statements": "cash_flow_statements",
+        "insider_trades": "insider_trades",
+    }
+    
+    # Agents fan out every endpoint for several tickers at once
+    MAX_CONNECTIONS = 64
+    
+    # Tickers gather_statements fetches at once; each fans out to five endpoints
+    GATHER_CONCURRENCY = 8
+    
+    # Company facts are near-static and read by most agents, so they are also
+    # memoized in process for the day, ahead of the HTTP cache
+    COMPANY_FACTS_MEMO_SIZE = 4096
+    
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        cache: Optional[HTTPCache] = None
+    ):
         """
         Initialize Financial Datasets client.
         
         Args:
             api_key: API key for authentication
             base_url: Base URL for the API
+            cache: Response cache (defaults to the shared on-disk cache)
         """
-        self.api_key = api_key or os.getenv("FINANCIAL_DATASETS_API_KEY")
-        self.base_url = base_url or "https://api.financialdatasets.ai"
-        self.session = requests.Session()
-        if self.api_key:
-            self.session.headers.update({"X-API-KEY": self.api_key})
+        super().__init__(
+            api_key or os.getenv("FINANCIAL_DATASETS_API_KEY"),
+            base_url or "https://api.financialdatasets.ai",
+            cache
+        )
+        # ticker -> (day fetched, facts)
+        self._company_facts: Dict[str, Tuple[str, CompanyFacts]] = {}
+    
+    def _memo_company_facts(self, ticker: str, force_refresh: bool) -> Optional[CompanyFacts]:
+        """Today's memoized company facts for ticker, if any."""
+        entry = self._company_facts.get(ticker)
+        if entry is None or force_refresh or entry[0] != iso_date():
+            return None
+        return entry[1]
+    
+    def _remember_company_facts(self, ticker: str, facts: Optional[CompanyFacts]) -> Optional[CompanyFacts]:
+        """Memoize fetched company facts for the rest of the day."""
+        if facts is not None:
+            if len(self._company_facts) >= self.COMPANY_FACTS_MEMO_SIZE:
+                self._company_facts.pop(next(iter(self._company_facts)))
+            self._company_facts[ticker] = (iso_date(), facts)
+        return facts
+    
+    def _fetch(
+        self,
+        endpoint: str,
+        ticker: str,
+        params: Dict[str, Any],
+        force_refresh: bool
+    ) -> Any:
+        """GET an _ENDPOINTS endpoint and unwrap its data, logging failures."""
+        _, description, is_list = _ENDPOINTS[endpoint]
+        path, params = _request_target(endpoint, params)
+        try:
+            body = self._get(endpoint, path, params=params, force_refresh=force_refresh)
+            return body.get(endpoint, [] if is_list else None)
+        except requests.exceptions.RequestException as e:
+            logger.warning("Error fetching %s for %s: %s", description, ticker, e)
+            return [] if is_list else None
+    
+    async def _afetch(
+        self,
+        endpoint: str,
+        ticker: str,
+        params: Dict[str, Any],
+        force_refresh: bool
+    ) -> Any:
+        """Async variant of _fetch."""
+        _, description, is_list = _ENDPOINTS[endpoint]
+        path, params = _request_target(endpoint, params)
+        try:
+            body = await self._aget(endpoint, path, params=params, force_refresh=force_refresh)
+            return body.get(endpoint, [] if is_list else None)
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning("Error fetching %s for %s: %s", description, ticker, e)
+            return [] if is_list else None
     
     def get_financial_metrics(
         self,
         ticker: str,
         end_date: Optional[str] = None,
         period: str = "ttm",
-        limit: int = 10
-    ) -> List[Dict[str, Any]]:
+        limit: int = 10,
+        force_refresh: bool = False
+    ) -> List[FinancialMetrics]:
         """
         Get financial metrics for a stock.
         
@@ -38,37 +237,32 @@ class FinancialDatasetsClient:
             end_date: End date (YYYY-MM-DD)
             period: Period type ("ttm", "quarterly", "annual")
             limit: Maximum number of results
+            force_refresh: Bypass the response cache
             
         Returns:
             List of financial metrics
         """
-        if not end_date:
-            end_date = datetime.now().strftime("%Y-%m-%d")
-        
-        try:
-            response = self.session.get(
-                f"{self.base_url}/financial-metrics/",
-                params={
-                    "ticker": ticker,
-                    "report_period_lte": end_date,
-                    "period": period,
-                    "limit": limit
-                },
-                timeout=30
-            )
-            response.raise_for_status()
-            return response.json().get("financial_metrics", [])
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching financial metrics for {ticker}: {e}")
-            return []
+        return self._fetch(
+            "financial_metrics",
+            ticker,
+            {
+                "ticker": ticker,
+                "report_period_lte": end_date or iso_date(),
+                "period": period,
+                "limit": limit
+            },
+            force_refresh
+        )
     
     def get_income_statement(
         self,
         ticker: str,
         end_date: Optional[str] = None,
         period: str = "annual",
-        limit: int = 5
-    ) -> List[Dict[str, Any]]:
+        limit: int = 5,
+        force_refresh: bool = False,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[IncomeStatement]:
         """
         Get income statement data.
         
@@ -77,37 +271,35 @@ class FinancialDatasetsClient:
             end_date: End date (YYYY-MM-DD)
             period: Period type ("quarterly", "annual")
             limit: Maximum number of results
+            force_refresh: Bypass the response cache
+            fields: Keep only these keys of each row; the cache still holds
+                whole rows
             
         Returns:
             List of income statements
         """
-        if not end_date:
-            end_date = datetime.now().strftime("%Y-%m-%d")
-        
-        try:
-            response = self.session.get(
-                f"{self.base_url}/financials/income-statements/",
-                params={
-                    "ticker": ticker,
-                    "end_date": end_date,
-                    "period": period,
-                    "limit": limit
-                },
-                timeout=30
-            )
-            response.raise_for_status()
-            return response.json().get("income_statements", [])
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching income statement for {ticker}: {e}")
-            return []
+        rows = self._fetch(
+            "income_statements",
+            ticker,
+            {
+                "ticker": ticker,
+                "end_date": end_date or iso_date(),
+                "period": period,
+                "limit": limit
+            },
+            force_refresh
+        )
+        return _select_fields(rows, fields)
     
     def get_balance_sheet(
         self,
         ticker: str,
         end_date: Optional[str] = None,
         period: str = "annual",
-        limit: int = 5
-    ) -> List[Dict[str, Any]]:
+        limit: int = 5,
+        force_refresh: bool = False,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[BalanceSheet]:
         """
         Get balance sheet data.
         
@@ -116,37 +308,35 @@ class FinancialDatasetsClient:
             end_date: End date (YYYY-MM-DD)
             period: Period type ("quarterly", "annual")
             limit: Maximum number of results
+            force_refresh: Bypass the response cache
+            fields: Keep only these keys of each row; the cache still holds
+                whole rows
             
         Returns:
             List of balance sheets
         """
-        if not end_date:
-            end_date = datetime.now().strftime("%Y-%m-%d")
-        
-        try:
-            response = self.session.get(
-                f"{self.base_url}/financials/balance-sheets/",
-                params={
-                    "ticker": ticker,
-                    "end_date": end_date,
-                    "period": period,
-                    "limit": limit
-                },
-                timeout=30
-            )
-            response.raise_for_status()
-            return response.json().get("balance_sheets", [])
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching balance sheet for {ticker}: {e}")
-            return []
+        rows = self._fetch(
+            "balance_sheets",
+            ticker,
+            {
+                "ticker": ticker,
+                "end_date": end_date or iso_date(),
+                "period": period,
+                "limit": limit
+            },
+            force_refresh
+        )
+        return _select_fields(rows, fields)
     
     def get_cash_flow_statement(
         self,
         ticker: str,
         end_date: Optional[str] = None,
         period: str = "annual",
-        limit: int = 5
-    ) -> List[Dict[str, Any]]:
+        limit: int = 5,
+        force_refresh: bool = False,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[CashFlowStatement]:
         """
         Get cash flow statement data.
         
@@ -155,37 +345,35 @@ class FinancialDatasetsClient:
             end_date: End date (YYYY-MM-DD)
             period: Period type ("quarterly", "annual")
             limit: Maximum number of results
+            force_refresh: Bypass the response cache
+            fields: Keep only these keys of each row; the cache still holds
+                whole rows
             
         Returns:
             List of cash flow statements
         """
-        if not end_date:
-            end_date = datetime.now().strftime("%Y-%m-%d")
-        
-        try:
-            response = self.session.get(
-                f"{self.base_url}/financials/cash-flow-statements/",
-                params={
-                    "ticker": ticker,
-                    "end_date": end_date,
-                    "period": period,
-                    "limit": limit
-                },
-                timeout=30
-            )
-            response.raise_for_status()
-            return response.json().get("cash_flow_statements", [])
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching cash flow statement for {ticker}: {e}")
-            return []
+        rows = self._fetch(
+            "cash_flow_statements",
+            ticker,
+            {
+                "ticker": ticker,
+                "end_date": end_date or iso_date(),
+                "period": period,
+                "limit": limit
+            },
+            force_refresh
+        )
+        return _select_fields(rows, fields)
     
     def get_prices(
         self,
         ticker: str,
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
-        interval: str = "day"
-    ) -> List[Dict[str, Any]]:
+        interval: str = "day",
+        force_refresh: bool = False,
+        limit: Optional[int] = None
+    ) -> List[PriceBar]:
         """
         Get price data for a stock.
         
@@ -194,18 +382,95 @@ class FinancialDatasetsClient:
             start_date: Start date (YYYY-MM-DD)
             end_date: End date (YYYY-MM-DD)
             interval: Time interval ("minute", "hour", "day", "week", "month")
+            force_refresh: Bypass the response cache
+            limit: Return at most this many of the newest bars, asking the
+                API to truncate so the rest is never sent or decoded
             
         Returns:
             List of price data
         """
-        if not end_date:
-            end_date = datetime.now().strftime("%Y-%m-%d")
-        if not start_date:
-            start_date = (datetime.now() - timedelta(days=365)).strftime("%Y-%m-%d")
+        prices = self._fetch(
+            "prices",
+            ticker,
+            _prices_params(ticker, start_date, end_date, interval, limit),
+            force_refresh
+        )
+        return prices[:limit] if limit is not None else prices
+    
+    def get_prices_arrays(
+        self,
+        ticker: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        interval: str = "day",
+        force_refresh: bool = False
+    ) -> Dict[str, np.ndarray]:
+        """
+        Get price data as column arrays (see ohlcv_arrays).
+        
+        Args:
+            ticker: Stock ticker symbol
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD)
+            interval: Time interval ("minute", "hour", "day", "week", "month")
+            force_refresh: Bypass the response cache
+            
+        Returns:
+            "time" plus contiguous float64 open/high/low/close/volume arrays
+        """
+        return ohlcv_arrays(self.get_prices(ticker, start_date, end_date, interval, force_refresh), "time")
+    
+    def get_prices_many(
+        self,
+        tickers: List[str],
+        interval: str = "day",
+        limit: Optional[int] = None
+    ) -> Dict[str, List[PriceBar]]:
+        """
+        Get price data for several stocks at once.
+        
+        The API takes one ticker per request, so the requests are issued
+        concurrently over the pooled connections instead.
+        
+        Args:
+            tickers: Stock ticker symbols
+            interval: Time interval ("minute", "hour", "day", "week", "month")
+            limit: Return at most this many of the newest bars per ticker
+            
+        Returns:
+            Price data per ticker (empty where the fetch failed)
+        """
+        return run_sync(self.aget_prices_many(tickers, interval, limit))
+    
+    def iter_prices(
+        self,
+        ticker: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        interval: str = "minute"
+    ) -> Iterator[PriceBar]:
+        """
+        Stream price bars without holding the whole response in memory.
+        
+        Meant for long intraday ranges, where the body can run to hundreds
+        of thousands of bars and callers only need running aggregates.
+        Bypasses the response cache.
+        
+        Args:
+            ticker: Stock ticker symbol
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD)
+            interval: Time interval ("minute", "hour", "day", "week", "month")
+            
+        Yields:
+            Price bars in API order
+        """
+        end_date = end_date or iso_date()
+        start_date = start_date or iso_date(365)
         
         try:
-            response = self.session.get(
-                f"{self.base_url}/prices/",
+            with self.session.get(
+                f"{self.base_url}{_ENDPOINTS['prices'][0]}",
                 params={
                     "ticker": ticker,
                     "start_date": start_date,
@@ -213,46 +478,48 @@ class FinancialDatasetsClient:
                     "interval": interval,
                     "interval_multiplier": 1
                 },
-                timeout=30
-            )
-            response.raise_for_status()
-            return response.json().get("prices", [])
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching prices for {ticker}: {e}")
-            return []
+                # Streamed incrementally as JSON, whatever the session prefers
+                headers={"Accept": "application/json"},
+                timeout=(self.CONNECT_TIMEOUT, self.READ_TIMEOUT),
+                stream=True
+            ) as response:
+                response.raise_for_status()
+                yield from fastjson.iter_items(response.iter_content(chunk_size=65536), "prices")
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.warning("Error streaming prices for %s: %s", ticker, e)
     
     def get_company_facts(
         self,
-        ticker: str
-    ) -> Optional[Dict[str, Any]]:
+        ticker: str,
+        force_refresh: bool = False
+    ) -> Optional[CompanyFacts]:
         """
         Get company facts and overview.
         
         Args:
             ticker: Stock ticker symbol
+            force_refresh: Bypass the response cache
             
         Returns:
-            Company facts data
+            Company facts data. The dict is memoized and shared by every
+            caller for the day, so treat it as read-only.
         """
-        try:
-            response = self.session.get(
-                f"{self.base_url}/company/facts/",
-                params={"ticker": ticker},
-                timeout=30
-            )
-            response.raise_for_status()
-            return response.json().get("company_facts")
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching company facts for {ticker}: {e}")
-            return None
+        facts = self._memo_company_facts(ticker, force_refresh)
+        if facts is not None:
+            return facts
+        return self._remember_company_facts(
+            ticker,
+            self._fetch("company_facts", ticker, {"ticker": ticker}, force_refresh)
+        )
     
     def get_insider_trades(
         self,
         ticker: str,
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
-        limit: int = 100
-    ) -> List[Dict[str, Any]]:
+        limit: int = 100,
+        force_refresh: bool = False
+    ) -> List[InsiderTrade]:
         """
         Get insider trading data.
         
@@ -261,31 +528,22 @@ class FinancialDatasetsClient:
             start_date: Start date (YYYY-MM-DD)
             end_date: End date (YYYY-MM-DD)
             limit: Maximum number of results
+            force_refresh: Bypass the response cache
             
         Returns:
             List of insider trades
         """
-        if not end_date:
-            end_date = datetime.now().strftime("%Y-%m-%d")
-        if not start_date:
-            start_date = (datetime.now() - timedelta(days=365)).strftime("%Y-%m-%d")
-        
-        try:
-            response = self.session.get(
-                f"{self.base_url}/insider-trades/",
-                params={
-                    "ticker": ticker,
-                    "filing_date_gte": start_date,
-                    "filing_date_lte": end_date,
-                    "limit": limit
-                },
-                timeout=30
-            )
-            response.raise_for_status()
-            return response.json().get("insider_trades", [])
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching insider trades for {ticker}: {e}")
-            return []
+        return self._fetch(
+            "insider_trades",
+            ticker,
+            {
+                "ticker": ticker,
+                "filing_date_gte": start_date or iso_date(365),
+                "filing_date_lte": end_date or iso_date(),
+                "limit": limit
+            },
+            force_refresh
+        )
     
     def search_line_items(
         self,
@@ -308,23 +566,376 @@ class FinancialDatasetsClient:
         Returns:
             List of line item data
         """
-        if not end_date:
-            end_date = datetime.now().strftime("%Y-%m-%d")
+        end_date = end_date or iso_date()
         
         try:
-            response = self.session.post(
-                f"{self.base_url}/financials/search/line-items",
+            body = self._post(
+                "/financials/search/line-items",
                 json={
                     "tickers": [ticker],
                     "line_items": line_items,
                     "end_date": end_date,
                     "period": period,
                     "limit": limit
-                },
-                timeout=30
+                }
+            )
+            return body.get("search_results", [])
+        except requests.exceptions.RequestException as e:
+            logger.warning("Error searching line items for %s: %s", ticker, e)
+            return []
+    
+    def search_line_items_many(
+        self,
+        tickers: List[str],
+        line_items: List[str],
+        end_date: Optional[str] = None,
+        period: str = "ttm",
+        limit: int = 10
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Search line items for several tickers in a single request.
+        
+        Args:
+            tickers: Stock ticker symbols
+            line_items: List of line item names to search for
+            end_date: End date (YYYY-MM-DD)
+            period: Period type ("ttm", "quarterly", "annual")
+            limit: Maximum number of results per ticker
+            
+        Returns:
+            Line item data per ticker (empty lists if the search failed)
+        """
+        end_date = end_date or iso_date()
+        
+        try:
+            body = self._post(
+                "/financials/search/line-items",
+                json={
+                    "tickers": tickers,
+                    "line_items": line_items,
+                    "end_date": end_date,
+                    "period": period,
+                    "limit": limit
+                }
             )
-            response.raise_for_status()
-            return response.json().get("search_results", [])
+            return _split_by_ticker(body.get("search_results", []), tickers, limit)
         except requests.exceptions.RequestException as e:
-            print(f"Error searching line items for {ticker}: {e}")
+            logger.warning("Error searching line items for %s: %s", ", ".join(tickers), e)
+            return {ticker: [] for ticker in tickers}
+    
+    async def aget_financial_metrics(
+        self,
+        ticker: str,
+        end_date: Optional[str] = None,
+        period: str = "ttm",
+        limit: int = 10,
+        force_refresh: bool = False
+    ) -> List[FinancialMetrics]:
+        """Async variant of get_financial_metrics."""
+        return await self._afetch(
+            "financial_metrics",
+            ticker,
+            {
+                "ticker": ticker,
+                "report_period_lte": end_date or iso_date(),
+                "period": period,
+                "limit": limit
+            },
+            force_refresh
+        )
+    
+    async def aget_income_statement(
+        self,
+        ticker: str,
+        end_date: Optional[str] = None,
+        period: str = "annual",
+        limit: int = 5,
+        force_refresh: bool = False,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[IncomeStatement]:
+        """Async variant of get_income_statement."""
+        rows = await self._afetch(
+            "income_statements",
+            ticker,
+            {
+                "ticker": ticker,
+                "end_date": end_date or iso_date(),
+                "period": period,
+                "limit": limit
+            },
+            force_refresh
+        )
+        return _select_fields(rows, fields)
+    
+    async def aget_balance_sheet(
+        self,
+        ticker: str,
+        end_date: Optional[str] = None,
+        period: str = "annual",
+        limit: int = 5,
+        force_refresh: bool = False,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[BalanceSheet]:
+        """Async variant of get_balance_sheet."""
+        rows = await self._afetch(
+            "balance_sheets",
+            ticker,
+            {
+                "ticker": ticker,
+                "end_date": end_date or iso_date(),
+                "period": period,
+                "limit": limit
+            },
+            force_refresh
+        )
+        return _select_fields(rows, fields)
+    
+    async def aget_cash_flow_statement(
+        self,
+        ticker: str,
+        end_date: Optional[str] = None,
+        period: str = "annual",
+        limit: int = 5,
+        force_refresh: bool = False,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[CashFlowStatement]:
+        """Async variant of get_cash_flow_statement."""
+        rows = await self._afetch(
+            "cash_flow_statements",
+            ticker,
+            {
+                "ticker": ticker,
+                "end_date": end_date or iso_date(),
+                "period": period,
+                "limit": limit
+            },
+            force_refresh
+        )
+        return _select_fields(rows, fields)
+    
+    async def aget_prices(
+        self,
+        ticker: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        interval: str = "day",
+        force_refresh: bool = False,
+        limit: Optional[int] = None
+    ) -> List[PriceBar]:
+        """Async variant of get_prices."""
+        prices = await self._afetch(
+            "prices",
+            ticker,
+            _prices_params(ticker, start_date, end_date, interval, limit),
+            force_refresh
+        )
+        return prices[:limit] if limit is not None else prices
+    
+    async def aget_prices_arrays(
+        self,
+        ticker: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        interval: str = "day",
+        force_refresh: bool = False
+    ) -> Dict[str, np.ndarray]:
+        """Async variant of get_prices_arrays."""
+        return ohlcv_arrays(await self.aget_prices(ticker, start_date, end_date, interval, force_refresh), "time")
+    
+    async def aget_prices_many(
+        self,
+        tickers: List[str],
+        interval: str = "day",
+        limit: Optional[int] = None
+    ) -> Dict[str, List[PriceBar]]:
+        """Async variant of get_prices_many."""
+        prices = await asyncio.gather(*[
+            self.aget_prices(ticker, interval=interval, limit=limit) for ticker in tickers
+        ])
+        return dict(zip(tickers, prices))
+    
+    async def aget_company_facts(
+        self,
+        ticker: str,
+        force_refresh: bool = False
+    ) -> Optional[CompanyFacts]:
+        """Async variant of get_company_facts."""
+        facts = self._memo_company_facts(ticker, force_refresh)
+        if facts is not None:
+            return facts
+        return self._remember_company_facts(
+            ticker,
+            await self._afetch("company_facts", ticker, {"ticker": ticker}, force_refresh)
+        )
+    
+    async def aget_insider_trades(
+        self,
+        ticker: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        limit: int = 100,
+        force_refresh: bool = False
+    ) -> List[InsiderTrade]:
+        """Async variant of get_insider_trades."""
+        return await self._afetch(
+            "insider_trades",
+            ticker,
+            {
+                "ticker": ticker,
+                "filing_date_gte": start_date or iso_date(365),
+                "filing_date_lte": end_date or iso_date(),
+                "limit": limit
+            },
+            force_refresh
+        )
+    
+    async def asearch_line_items(
+        self,
+        ticker: str,
+        line_items: List[str],
+        end_date: Optional[str] = None,
+        period: str = "ttm",
+        limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Async variant of search_line_items."""
+        end_date = end_date or iso_date()
+        
+        try:
+            body = await self._apost(
+                "/financials/search/line-items",
+                json={
+                    "tickers": [ticker],
+                    "line_items": line_items,
+                    "end_date": end_date,
+                    "period": period,
+                    "limit": limit
+                }
+            )
+            return body.get("search_results", [])
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning("Error searching line items for %s: %s", ticker, e)
             return []
+    
+    async def asearch_line_items_many(
+        self,
+        tickers: List[str],
+        line_items: List[str],
+        end_date: Optional[str] = None,
+        period: str = "ttm",
+        limit: int = 10
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Async variant of search_line_items_many."""
+        end_date = end_date or iso_date()
+        
+        try:
+            body = await self._apost(
+                "/financials/search/line-items",
+                json={
+                    "tickers": tickers,
+                    "line_items": line_items,
+                    "end_date": end_date,
+                    "period": period,
+                    "limit": limit
+                }
+            )
+            return _split_by_ticker(body.get("search_results", []), tickers, limit)
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning("Error searching line items for %s: %s", ", ".join(tickers), e)
+            return {ticker: [] for ticker in tickers}
+    
+    def gather_statements(
+        self,
+        tickers: List[str],
+        force_refresh: bool = False
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch metrics, statements and prices for several tickers concurrently.
+        
+        Args:
+            tickers: Stock ticker symbols
+            force_refresh: Bypass the response cache
+            
+        Returns:
+            Per ticker, a dict with financial_metrics, income_statements,
+            balance_sheets, cash_flow_statements and prices
+        """
+        return run_sync(self.agather_statements(tickers, force_refresh))
+    
+    async def agather_statements(
+        self,
+        tickers: List[str],
+        force_refresh: bool = False
+    ) -> Dict[str, Dict[str, Any]]:
+        """Async variant of gather_statements."""
+        semaphore = asyncio.Semaphore(self.GATHER_CONCURRENCY)
+        
+        async def fetch(ticker: str) -> Dict[str, Any]:
+            async with semaphore:
+                metrics, income, balance, cash_flow, prices = await asyncio.gather(
+                    self.aget_financial_metrics(ticker, force_refresh=force_refresh),
+                    self.aget_income_statement(ticker, force_refresh=force_refresh),
+                    self.aget_balance_sheet(ticker, force_refresh=force_refresh),
+                    self.aget_cash_flow_statement(ticker, force_refresh=force_refresh),
+                    self.aget_prices(ticker, force_refresh=force_refresh)
+                )
+            return {
+                "financial_metrics": metrics,
+                "income_statements": income,
+                "balance_sheets": balance,
+                "cash_flow_statements": cash_flow,
+                "prices": prices
+            }
+        
+        results = await asyncio.gather(*[fetch(ticker) for ticker in tickers])
+        return dict(zip(tickers, results))
+    
+    def prefetch(
+        self,
+        ticker: str,
+        force_refresh: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Fetch every dataset for a ticker concurrently, with default arguments.
+        
+        Agents that need several datasets read them from the returned dict
+        instead of awaiting the endpoints one after another.
+        
+        Args:
+            ticker: Stock ticker symbol
+            force_refresh: Bypass the response cache
+            
+        Returns:
+            Dict with financial_metrics, income_statements, balance_sheets,
+            cash_flow_statements, prices, company_facts and insider_trades;
+            a dataset that failed to load is empty (None for company_facts)
+        """
+        return run_sync(self.aprefetch(ticker, force_refresh))
+    
+    async def aprefetch(
+        self,
+        ticker: str,
+        force_refresh: bool = False
+    ) -> Dict[str, Any]:
+        """Async variant of prefetch."""
+        fetchers = {
+            "financial_metrics": self.aget_financial_metrics,
+            "income_statements": self.aget_income_statement,
+            "balance_sheets": self.aget_balance_sheet,
+            "cash_flow_statements": self.aget_cash_flow_statement,
+            "prices": self.aget_prices,
+            "company_facts": self.aget_company_facts,
+            "insider_trades": self.aget_insider_trades,
+        }
+        results = await asyncio.gather(
+            *[fetch(ticker, force_refresh=force_refresh) for fetch in fetchers.values()],
+            return_exceptions=True
+        )
+        
+        datasets = {}
+        for endpoint, result in zip(fetchers, results):
+            if isinstance(result, Exception):
+                _, description, is_list = _ENDPOINTS[endpoint]
+                logger.warning("Error fetching %s for %s: %s", description, ticker, result)
+                result = [] if is_list else None
+            datasets[endpoint] = result
+        return datasets
@@ -0,0 +1,239 @@
+"""Persistent SQLite cache for MCP client HTTP responses."""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from ..utils import fastjson
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "agenticseek", "http_cache.sqlite"
+)
+
+
+def _usable(expires_at: float, allow_stale: bool, max_stale: Optional[float]) -> bool:
+    """Whether an entry expiring at expires_at may be served now."""
+    overdue = time.time() - expires_at
+    if overdue <= 0:
+        return True
+    return allow_stale and (max_stale is None or overdue <= max_stale)
+
+
+class HTTPCache:
+    """
+    Small on-disk cache of decoded JSON responses with per-entry expiry.
+    
+    Repeat lookups of slow-moving endpoints (fear & greed, exchanges, news)
+    become local SQLite reads instead of network round-trips, and survive
+    across CLI runs. Database errors (another process holding the lock, a
+    full disk) are logged and treated as misses, like RedisCache.
+    """
+    
+    # Writes between size checks; pruning scans the table, so it is amortized
+    PRUNE_EVERY = 256
+    
+    # Expired entries are kept this long as stale fallbacks, then dropped
+    STALE_GRACE = 7 * 86400
+    
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_entries: int = 50_000):
+        """
+        Initialize the cache.
+        
+        Args:
+            path: SQLite database file (":memory:" for a process-local cache)
+            max_entries: Entries kept before the least recently written are evicted
+        """
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, expires_at REAL NOT NULL, body TEXT NOT NULL)"
+            )
+    
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Build a cache key from a URL and its query parameters."""
+        if not params:
+            return url
+        query = "&".join(f"{k}={params[k]}" for k in sorted(params))
+        return f"{url}?{query}"
+    
+    def get(self, key: str, allow_stale: bool = False, max_stale: Optional[float] = None) -> Optional[Any]:
+        """
+        Return the cached body for key, or None if missing or expired.
+        
+        Expired entries are kept until purge_expired() so that allow_stale
+        can still return them when the upstream API is failing; max_stale
+        caps how many seconds past expiry such an entry may be.
+        """
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT expires_at, body FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning("HTTP cache read failed: %s", e)
+            return None
+        if row is None or not _usable(row[0], allow_stale, max_stale):
+            return None
+        return fastjson.loads(row[1])
+    
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """Store a JSON-serializable body under key for ttl seconds."""
+        if ttl <= 0:
+            return
+        body = fastjson.dumps(value)
+        try:
+            with self._lock, self._conn:
+                # REPLACE assigns a new rowid, so rowid order is write recency
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, expires_at, body) VALUES (?, ?, ?)",
+                    (key, time.time() + ttl, body)
+                )
+                self._writes += 1
+                if self._writes >= self.PRUNE_EVERY:
+                    self._writes = 0
+                    self._prune()
+        except sqlite3.Error as e:
+            logger.warning("HTTP cache write failed: %s", e)
+    
+    def _prune(self) -> None:
+        """Drop long-expired entries, then evict the oldest writes over max_entries."""
+        self._conn.execute(
+            "DELETE FROM responses WHERE expires_at < ?", (time.time() - self.STALE_GRACE,)
+        )
+        self._conn.execute(
+            "DELETE FROM responses WHERE rowid IN ("
+            "SELECT rowid FROM responses ORDER BY rowid DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+    
+    def purge_expired(self) -> None:
+        """Delete expired entries."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses WHERE expires_at < ?", (time.time(),))
+    
+    def clear(self) -> None:
+        """Delete all entries."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+
+
+class RedisCache(HTTPCache):
+    """
+    HTTPCache backed by Redis, shared by every process and host using it.
+    
+    Entries carry their own expiry so stale fallbacks still work; Redis
+    drops them once STALE_GRACE has passed. Cache errors are logged and
+    treated as misses so an unreachable server only costs the round-trip.
+    """
+    
+    KEY_PREFIX = "mcp:http:"
+    
+    def __init__(self, url: str):
+        """
+        Initialize the cache.
+        
+        Args:
+            url: Redis URL, e.g. redis://localhost:6379/0
+        """
+        if not REDIS_AVAILABLE:
+            raise ImportError("RedisCache requires the redis package")
+        self.path = url
+        self._redis = redis.Redis.from_url(url)
+    
+    def _redis_key(self, key: str) -> str:
+        """Fixed-size Redis key for a (possibly long) request key."""
+        return self.KEY_PREFIX + hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+    
+    def get(self, key: str, allow_stale: bool = False, max_stale: Optional[float] = None) -> Optional[Any]:
+        """Return the cached body for key, or None if missing or expired."""
+        try:
+            raw = self._redis.get(self._redis_key(key))
+        except redis.RedisError as e:
+            logger.warning("Redis cache read failed: %s", e)
+            return None
+        if raw is None:
+            return None
+        expires_at, body = fastjson.loads(raw)
+        if not _usable(expires_at, allow_stale, max_stale):
+            return None
+        return body
+    
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """Store a JSON-serializable body under key for ttl seconds."""
+        if ttl <= 0:
+            return
+        try:
+            self._redis.set(
+                self._redis_key(key),
+                fastjson.dumps([time.time() + ttl, value]),
+                ex=int(ttl + self.STALE_GRACE) + 1
+            )
+        except redis.RedisError as e:
+            logger.warning("Redis cache write failed: %s", e)
+    
+    def purge_expired(self) -> None:
+        """No-op: Redis evicts entries itself after the stale grace period."""
+    
+    def clear(self) -> None:
+        """Delete all entries."""
+        keys = list(self._redis.scan_iter(match=self.KEY_PREFIX + "*", count=1000))
+        if keys:
+            self._redis.delete(*keys)
+
+
+_default_cache: Optional[HTTPCache] = None
+_default_cache_failed = False
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> Optional[HTTPCache]:
+    """
+    Get the process-wide HTTP cache.
+    
+    Set MCP_HTTP_CACHE=0 to disable it, MCP_HTTP_CACHE_PATH to relocate it,
+    or MCP_HTTP_CACHE_URL to a redis:// URL to share it between processes.
+    Returns None when disabled or when the database can't be opened.
+    """
+    global _default_cache, _default_cache_failed
+    
+    if os.getenv("MCP_HTTP_CACHE", "1") == "0" or _default_cache_failed:
+        return None
+    
+    with _default_cache_lock:
+        if _default_cache is None:
+            url = os.getenv("MCP_HTTP_CACHE_URL")
+            if url:
+                try:
+                    _default_cache = RedisCache(url)
+                    return _default_cache
+                except ImportError as e:
+                    logger.warning("Falling back to the SQLite HTTP cache: %s", e)
+            
+            path = os.getenv("MCP_HTTP_CACHE_PATH", DEFAULT_CACHE_PATH)
+            try:
+                _default_cache = HTTPCache(path)
+            except (OSError, sqlite3.Error) as e:
+                logger.warning("HTTP cache disabled, unable to open %s: %s", path, e)
+                _default_cache_failed = True
+                return None
+        return _default_cache
@@ -0,0 +1,170 @@
+"""
+Typed shapes of the Financial Datasets and TradingView API records.
+
+The clients return the decoded JSON dicts unchanged (they round-trip through
+the HTTP cache as-is); these TypedDicts document the fields the agents read
+and let type checkers catch misspelled keys. Every key is optional because
+the APIs omit fields they have no data for.
+"""
+
+from typing import List, TypedDict
+
+
+class ReportRow(TypedDict, total=False):
+    """Fields shared by every per-period financial record."""
+    
+    ticker: str
+    report_period: str
+    fiscal_year: int
+    period: str
+    currency: str
+
+
+class IncomeStatement(ReportRow, total=False):
+    """One period of an income statement."""
+    
+    revenue: float
+    gross_profit: float
+    operating_income: float
+    net_income: float
+    earnings_per_share: float
+
+
+class BalanceSheet(ReportRow, total=False):
+    """One period of a balance sheet."""
+    
+    total_assets: float
+    total_liabilities: float
+    total_equity: float
+    cash_and_equivalents: float
+    total_debt: float
+
+
+class CashFlowStatement(ReportRow, total=False):
+    """One period of a cash flow statement."""
+    
+    operating_cash_flow: float
+    investing_cash_flow: float
+    financing_cash_flow: float
+    free_cash_flow: float
+
+
+class FinancialMetrics(ReportRow, total=False):
+    """Valuation, profitability and leverage ratios for one period."""
+    
+    market_cap: float
+    price_to_earnings_ratio: float
+    price_to_book_ratio: float
+    price_to_sales_ratio: float
+    return_on_equity: float
+    return_on_assets: float
+    current_ratio: float
+    quick_ratio: float
+    debt_to_equity: float
+    revenue_growth: float
+    earnings_growth: float
+
+
+class PriceBar(TypedDict, total=False):
+    """One OHLCV bar."""
+    
+    time: str
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: int
+
+
+class InsiderTrade(TypedDict, total=False):
+    """One insider transaction filing."""
+    
+    ticker: str
+    name: str
+    title: str
+    transaction_type: str
+    transaction_date: str
+    transaction_shares: float
+    transaction_price_per_share: float
+    transaction_value: float
+    filing_date: str
+
+
+class CompanyFacts(TypedDict, total=False):
+    """Company overview."""
+    
+    ticker: str
+    name: str
+    sector: str
+    industry: str
+    market_cap: float
+    description: str
+
+
+class RSI(TypedDict, total=False):
+    """Relative Strength Index reading."""
+    
+    value: float
+    signal: str
+
+
+class MACD(TypedDict, total=False):
+    """MACD line, signal line and histogram."""
+    
+    macd: float
+    signal: float
+    histogram: float
+    macd_signal: str
+
+
+class BollingerBands(TypedDict, total=False):
+    """Bollinger Bands and where price sits within them."""
+    
+    upper: float
+    middle: float
+    lower: float
+    position: str
+
+
+class Stochastic(TypedDict, total=False):
+    """Stochastic oscillator reading."""
+    
+    k: float
+    d: float
+    signal: str
+
+
+class PivotPoints(TypedDict, total=False):
+    """Pivot level with three resistance and three support levels."""
+    
+    pivot: float
+    r1: float
+    r2: float
+    r3: float
+    s1: float
+    s2: float
+    s3: float
+
+
+class TechnicalSummary(TypedDict, total=False):
+    """Aggregate buy/sell rating across indicators."""
+    
+    summary: str
+    trend: str
+    momentum: str
+    rsi: float
+    macd_signal: str
+
+
+class SupportResistance(TypedDict, total=False):
+    """Support and resistance price levels."""
+    
+    support: List[float]
+    resistance: List[float]
+
+
+class ChartPattern(TypedDict, total=False):
+    """One detected chart pattern."""
+    
+    name: str
+    signal: str
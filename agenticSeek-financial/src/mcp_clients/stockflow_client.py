@@ -1,27 +1,57 @@
 """StockFlow MCP Client for analyzing stock flow and volume patterns."""
 
+import logging
 import os
 from typing import Dict, List, Optional, Any
+import httpx
 import requests
-from datetime import datetime, timedelta
 
+from .base import BaseMCPClient, iso_date
+from .http_cache import HTTPCache
 
-class StockFlowClient:
+logger = logging.getLogger(__name__)
+
+
+class StockFlowClient(BaseMCPClient):
     """Client for analyzing stock flow, volume patterns, and order flow via MCP protocol."""
     
-    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
+    # Seconds each endpoint's responses stay fresh in the HTTP cache.
+    # Order flow is near real-time; institutional and dark pool data are
+    # reported with a lag.
+    CACHE_TTLS = {
+        "orderflow": 10,
+        "unusual_volume": 60,
+        "volume": 300,
+        "mfi": 300,
+        "block_trades": 300,
+        "volume_profile": 3600,
+        "darkpool": 3600,
+        "institutional_flow": 3600,
+    }
+    
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        cache: Optional[HTTPCache] = None
+    ):
         """
         Initialize StockFlow client.
         
         Args:
             api_key: API key for authentication
             base_url: Base URL for the MCP server
+            cache: Response cache (defaults to the shared on-disk cache)
         """
-        self.api_key = api_key or os.getenv("STOCKFLOW_API_KEY")
-        self.base_url = base_url or os.getenv("STOCKFLOW_BASE_URL", "https://api.stockflow.io/v1")
-        self.session = requests.Session()
-        if self.api_key:
-            self.session.headers.update({"Authorization": f"Bearer {self.api_key}"})
+        super().__init__(
+            api_key or os.getenv("STOCKFLOW_API_KEY"),
+            base_url or os.getenv("STOCKFLOW_BASE_URL", "https://api.stockflow.io/v1"),
+            cache
+        )
+    
+    def _auth_headers(self) -> Dict[str, str]:
+        """StockFlow authenticates with a bearer token."""
+        return {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
     
     def get_volume_analysis(
         self,
@@ -40,24 +70,20 @@ class StockFlowClient:
         Returns:
             Volume analysis data
         """
-        if not end_date:
-            end_date = datetime.now().strftime("%Y-%m-%d")
-        if not start_date:
-            start_date = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")
+        end_date = end_date or iso_date()
+        start_date = start_date or iso_date(30)
         
         try:
-            response = self.session.get(
-                f"{self.base_url}/volume/{ticker}",
+            return self._get(
+                "volume",
+                f"/volume/{ticker}",
                 params={
                     "start_date": start_date,
                     "end_date": end_date
-                },
-                timeout=30
+                }
             )
-            response.raise_for_status()
-            return response.json()
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching volume analysis for {ticker}: {e}")
+            logger.warning("Error fetching volume analysis for %s: %s", ticker, e)
             return None
     
     def get_order_flow(
@@ -76,15 +102,9 @@ class StockFlowClient:
             Order flow data including buy/sell pressure
         """
         try:
-            response = self.session.get(
-                f"{self.base_url}/orderflow/{ticker}",
-                params={"interval": interval},
-                timeout=30
-            )
-            response.raise_for_status()
-            return response.json()
+            return self._get("orderflow", f"/orderflow/{ticker}", params={"interval": interval})
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching order flow for {ticker}: {e}")
+            logger.warning("Error fetching order flow for %s: %s", ticker, e)
             return None
     
     def get_money_flow_index(
@@ -103,15 +123,9 @@ class StockFlowClient:
             MFI data
         """
         try:
-            response = self.session.get(
-                f"{self.base_url}/indicators/mfi/{ticker}",
-                params={"period": period},
-                timeout=30
-            )
-            response.raise_for_status()
-            return response.json()
+            return self._get("mfi", f"/indicators/mfi/{ticker}", params={"period": period})
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching MFI for {ticker}: {e}")
+            logger.warning("Error fetching MFI for %s: %s", ticker, e)
             return None
     
     def get_volume_profile(
@@ -131,24 +145,20 @@ class StockFlowClient:
         Returns:
             Volume profile data
         """
-        if not end_date:
-            end_date = datetime.now().strftime("%Y-%m-%d")
-        if not start_date:
-            start_date = (datetime.now() - timedelta(days=90)).strftime("%Y-%m-%d")
+        end_date = end_date or iso_date()
+        start_date = start_date or iso_date(90)
         
         try:
-            response = self.session.get(
-                f"{self.base_url}/volume-profile/{ticker}",
+            return self._get(
+                "volume_profile",
+                f"/volume-profile/{ticker}",
                 params={
                     "start_date": start_date,
                     "end_date": end_date
-                },
-                timeout=30
+                }
             )
-            response.raise_for_status()
-            return response.json()
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching volume profile for {ticker}: {e}")
+            logger.warning("Error fetching volume profile for %s: %s", ticker, e)
             return None
     
     def get_dark_pool_activity(
@@ -167,15 +177,9 @@ class StockFlowClient:
             Dark pool activity data
         """
         try:
-            response = self.session.get(
-                f"{self.base_url}/darkpool/{ticker}",
-                params={"days": days},
-                timeout=30
-            )
-            response.raise_for_status()
-            return response.json()
+            return self._get("darkpool", f"/darkpool/{ticker}", params={"days": days})
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching dark pool activity for {ticker}: {e}")
+            logger.warning("Error fetching dark pool activity for %s: %s", ticker, e)
             return None
     
     def get_institutional_flow(
@@ -194,15 +198,13 @@ class StockFlowClient:
             Institutional flow data
         """
         try:
-            response = self.session.get(
-                f"{self.base_url}/institutional-flow/{ticker}",
-                params={"period": period},
-                timeout=30
+            return self._get(
+                "institutional_flow",
+                f"/institutional-flow/{ticker}",
+                params={"period": period}
             )
-            response.raise_for_status()
-            return response.json()
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching institutional flow for {ticker}: {e}")
+            logger.warning("Error fetching institutional flow for %s: %s", ticker, e)
             return None
     
     def get_unusual_volume(
@@ -221,18 +223,17 @@ class StockFlowClient:
             List of stocks with unusual volume
         """
         try:
-            response = self.session.get(
-                f"{self.base_url}/unusual-volume",
+            body = self._get(
+                "unusual_volume",
+                "/unusual-volume",
                 params={
                     "min_ratio": min_volume_ratio,
                     "limit": limit
-                },
-                timeout=30
+                }
             )
-            response.raise_for_status()
-            return response.json().get("stocks", [])
+            return body.get("stocks", [])
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching unusual volume stocks: {e}")
+            logger.warning("Error fetching unusual volume stocks: %s", e)
             return []
     
     def get_block_trades(
@@ -253,16 +254,154 @@ class StockFlowClient:
             List of block trades
         """
         try:
-            response = self.session.get(
-                f"{self.base_url}/block-trades/{ticker}",
+            body = self._get(
+                "block_trades",
+                f"/block-trades/{ticker}",
                 params={
                     "min_size": min_size,
                     "days": days
-                },
-                timeout=30
+                }
             )
-            response.raise_for_status()
-            return response.json().get("trades", [])
+            return body.get("trades", [])
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching block trades for {ticker}: {e}")
+            logger.warning("Error fetching block trades for %s: %s", ticker, e)
+            return []
+    
+    async def aget_volume_analysis(
+        self,
+        ticker: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Async variant of get_volume_analysis."""
+        end_date = end_date or iso_date()
+        start_date = start_date or iso_date(30)
+        
+        try:
+            return await self._aget(
+                "volume",
+                f"/volume/{ticker}",
+                params={
+                    "start_date": start_date,
+                    "end_date": end_date
+                }
+            )
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning("Error fetching volume analysis for %s: %s", ticker, e)
+            return None
+    
+    async def aget_order_flow(
+        self,
+        ticker: str,
+        interval: str = "1h"
+    ) -> Optional[Dict[str, Any]]:
+        """Async variant of get_order_flow."""
+        try:
+            return await self._aget("orderflow", f"/orderflow/{ticker}", params={"interval": interval})
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning("Error fetching order flow for %s: %s", ticker, e)
+            return None
+    
+    async def aget_money_flow_index(
+        self,
+        ticker: str,
+        period: int = 14
+    ) -> Optional[Dict[str, Any]]:
+        """Async variant of get_money_flow_index."""
+        try:
+            return await self._aget("mfi", f"/indicators/mfi/{ticker}", params={"period": period})
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning("Error fetching MFI for %s: %s", ticker, e)
+            return None
+    
+    async def aget_volume_profile(
+        self,
+        ticker: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Async variant of get_volume_profile."""
+        end_date = end_date or iso_date()
+        start_date = start_date or iso_date(90)
+        
+        try:
+            return await self._aget(
+                "volume_profile",
+                f"/volume-profile/{ticker}",
+                params={
+                    "start_date": start_date,
+                    "end_date": end_date
+                }
+            )
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning("Error fetching volume profile for %s: %s", ticker, e)
+            return None
+    
+    async def aget_dark_pool_activity(
+        self,
+        ticker: str,
+        days: int = 30
+    ) -> Optional[Dict[str, Any]]:
+        """Async variant of get_dark_pool_activity."""
+        try:
+            return await self._aget("darkpool", f"/darkpool/{ticker}", params={"days": days})
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning("Error fetching dark pool activity for %s: %s", ticker, e)
+            return None
+    
+    async def aget_institutional_flow(
+        self,
+        ticker: str,
+        period: str = "1m"
+    ) -> Optional[Dict[str, Any]]:
+        """Async variant of get_institutional_flow."""
+        try:
+            return await self._aget(
+                "institutional_flow",
+                f"/institutional-flow/{ticker}",
+                params={"period": period}
+            )
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning("Error fetching institutional flow for %s: %s", ticker, e)
+            return None
+    
+    async def aget_unusual_volume(
+        self,
+        min_volume_ratio: float = 2.0,
+        limit: int = 50
+    ) -> List[Dict[str, Any]]:
+        """Async variant of get_unusual_volume."""
+        try:
+            body = await self._aget(
+                "unusual_volume",
+                "/unusual-volume",
+                params={
+                    "min_ratio": min_volume_ratio,
+                    "limit": limit
+                }
+            )
+            return body.get("stocks", [])
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning("Error fetching unusual volume stocks: %s", e)
+            return []
+    
+    async def aget_block_trades(
+        self,
+        ticker: str,
+        min_size: int = 10000,
+        days: int = 7
+    ) -> List[Dict[str, Any]]:
+        """Async variant of get_block_trades."""
+        try:
+            body = await self._aget(
+                "block_trades",
+                f"/block-trades/{ticker}",
+                params={
+                    "min_size": min_size,
+                    "days": days
+                }
+            )
+            return body.get("trades", [])
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning("Error fetching block trades for %s: %s", ticker, e)
             return []
@@ -1,27 +1,102 @@
 """StockScreen MCP Client for screening stocks based on fundamental criteria."""
 
+import asyncio
+import heapq
+import logging
 import os
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
+import httpx
 import requests
-from datetime import datetime
 
+from ..utils import run_sync
+from .base import BaseMCPClient
+from .http_cache import HTTPCache
 
-class StockScreenClient:
+logger = logging.getLogger(__name__)
+
+
+def _value_criteria(
+    min_market_cap: float = 1_000_000_000,
+    max_pe_ratio: float = 15,
+    min_dividend_yield: float = 2.0
+) -> Dict[str, Any]:
+    """Common value investing screen."""
+    return {
+        "market_cap": {"min": min_market_cap},
+        "pe_ratio": {"max": max_pe_ratio},
+        "dividend_yield": {"min": min_dividend_yield},
+        "debt_to_equity": {"max": 1.0}
+    }
+
+
+def _growth_criteria(
+    min_revenue_growth: float = 15.0,
+    min_earnings_growth: float = 15.0,
+    min_market_cap: float = 1_000_000_000
+) -> Dict[str, Any]:
+    """Revenue and earnings growth screen."""
+    return {
+        "market_cap": {"min": min_market_cap},
+        "revenue_growth": {"min": min_revenue_growth},
+        "earnings_growth": {"min": min_earnings_growth}
+    }
+
+
+def _momentum_criteria(
+    min_price_change_1m: float = 10.0,
+    min_price_change_3m: float = 20.0,
+    min_volume: float = 1_000_000
+) -> Dict[str, Any]:
+    """Price performance screen."""
+    return {
+        "price_change_1m": {"min": min_price_change_1m},
+        "price_change_3m": {"min": min_price_change_3m},
+        "avg_volume": {"min": min_volume}
+    }
+
+
+# Investment style -> builder of its default screening criteria
+_STYLE_CRITERIA = {
+    "value": _value_criteria,
+    "growth": _growth_criteria,
+    "momentum": _momentum_criteria,
+}
+
+
+class StockScreenClient(BaseMCPClient):
     """Client for screening stocks using fundamental criteria via MCP protocol."""
     
-    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
+    # Seconds each endpoint's responses stay fresh in the HTTP cache
+    CACHE_TTLS = {
+        "stock_details": 3600,
+    }
+    
+    # Screens are evaluated server-side over the whole universe
+    READ_TIMEOUT = 30
+    
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        cache: Optional[HTTPCache] = None
+    ):
         """
         Initialize StockScreen client.
         
         Args:
             api_key: API key for authentication
             base_url: Base URL for the MCP server
+            cache: Response cache (defaults to the shared on-disk cache)
         """
-        self.api_key = api_key or os.getenv("STOCKSCREEN_API_KEY")
-        self.base_url = base_url or os.getenv("STOCKSCREEN_BASE_URL", "https://api.stockscreen.io/v1")
-        self.session = requests.Session()
-        if self.api_key:
-            self.session.headers.update({"Authorization": f"Bearer {self.api_key}"})
+        super().__init__(
+            api_key or os.getenv("STOCKSCREEN_API_KEY"),
+            base_url or os.getenv("STOCKSCREEN_BASE_URL", "https://api.stockscreen.io/v1"),
+            cache
+        )
+    
+    def _auth_headers(self) -> Dict[str, str]:
+        """StockScreen authenticates with a bearer token."""
+        return {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
     
     def screen_stocks(
         self,
@@ -41,19 +116,17 @@ class StockScreenClient:
             List of stocks matching the criteria
         """
         try:
-            response = self.session.post(
-                f"{self.base_url}/screen",
+            body = self._post(
+                "/screen",
                 json={
                     "criteria": criteria,
                     "limit": limit,
                     "offset": offset
-                },
-                timeout=30
+                }
             )
-            response.raise_for_status()
-            return response.json().get("stocks", [])
+            return body.get("stocks", [])
         except requests.exceptions.RequestException as e:
-            print(f"Error screening stocks: {e}")
+            logger.warning("Error screening stocks: %s", e)
             return []
     
     def get_value_stocks(
@@ -75,12 +148,7 @@ class StockScreenClient:
         Returns:
             List of value stocks
         """
-        criteria = {
-            "market_cap": {"min": min_market_cap},
-            "pe_ratio": {"max": max_pe_ratio},
-            "dividend_yield": {"min": min_dividend_yield},
-            "debt_to_equity": {"max": 1.0}
-        }
+        criteria = _value_criteria(min_market_cap, max_pe_ratio, min_dividend_yield)
         return self.screen_stocks(criteria, limit=limit)
     
     def get_growth_stocks(
@@ -102,11 +170,7 @@ class StockScreenClient:
         Returns:
             List of growth stocks
         """
-        criteria = {
-            "market_cap": {"min": min_market_cap},
-            "revenue_growth": {"min": min_revenue_growth},
-            "earnings_growth": {"min": min_earnings_growth}
-        }
+        criteria = _growth_criteria(min_revenue_growth, min_earnings_growth, min_market_cap)
         return self.screen_stocks(criteria, limit=limit)
     
     def get_momentum_stocks(
@@ -128,13 +192,26 @@ class StockScreenClient:
         Returns:
             List of momentum stocks
         """
-        criteria = {
-            "price_change_1m": {"min": min_price_change_1m},
-            "price_change_3m": {"min": min_price_change_3m},
-            "avg_volume": {"min": min_volume}
-        }
+        criteria = _momentum_criteria(min_price_change_1m, min_price_change_3m, min_volume)
         return self.screen_stocks(criteria, limit=limit)
     
+    def get_multi_style(
+        self,
+        styles: Tuple[str, ...] = ("value", "growth", "momentum"),
+        limit: int = 50
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Run several style screens (with their default criteria) at once.
+        
+        Args:
+            styles: Any of "value", "growth" and "momentum"
+            limit: Maximum number of results per style
+            
+        Returns:
+            Matching stocks per style
+        """
+        return run_sync(self.aget_multi_style(styles, limit))
+    
     def get_stock_details(self, ticker: str) -> Optional[Dict[str, Any]]:
         """
         Get detailed information for a specific stock.
@@ -146,16 +223,23 @@ class StockScreenClient:
             Stock details or None if not found
         """
         try:
-            response = self.session.get(
-                f"{self.base_url}/stocks/{ticker}",
-                timeout=30
-            )
-            response.raise_for_status()
-            return response.json()
+            return self._get("stock_details", f"/stocks/{ticker}")
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching stock details for {ticker}: {e}")
+            logger.warning("Error fetching stock details for %s: %s", ticker, e)
             return None
     
+    def get_stock_details_many(self, tickers: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Get details for several stocks at once.
+        
+        Args:
+            tickers: Stock ticker symbols
+            
+        Returns:
+            Stock details per ticker (None where the fetch failed)
+        """
+        return run_sync(self.aget_stock_details_many(tickers))
+    
     def get_sector_leaders(
         self,
         sector: str,
@@ -178,11 +262,51 @@ class StockScreenClient:
         }
         stocks = self.screen_stocks(criteria, limit=limit * 2)
         
-        # Sort by the specified metric
-        sorted_stocks = sorted(
-            stocks,
-            key=lambda x: x.get(metric, 0),
-            reverse=True
-        )
-        
-        return sorted_stocks[:limit]
+        # Top stocks by the specified metric, without sorting the rest
+        return heapq.nlargest(limit, stocks, key=lambda x: x.get(metric, 0))
+    
+    async def ascreen_stocks(
+        self,
+        criteria: Dict[str, Any],
+        limit: int = 100,
+        offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """Async variant of screen_stocks."""
+        try:
+            body = await self._apost(
+                "/screen",
+                json={
+                    "criteria": criteria,
+                    "limit": limit,
+                    "offset": offset
+                }
+            )
+            return body.get("stocks", [])
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning("Error screening stocks: %s", e)
+            return []
+    
+    async def aget_stock_details(self, ticker: str) -> Optional[Dict[str, Any]]:
+        """Async variant of get_stock_details."""
+        try:
+            return await self._aget("stock_details", f"/stocks/{ticker}")
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning("Error fetching stock details for %s: %s", ticker, e)
+            return None
+    
+    async def aget_stock_details_many(self, tickers: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Async variant of get_stock_details_many; the requests share one pooled connection set."""
+        details = await asyncio.gather(*[self.aget_stock_details(ticker) for ticker in tickers])
+        return dict(zip(tickers, details))
+    
+    async def aget_multi_style(
+        self,
+        styles: Tuple[str, ...] = ("value", "growth", "momentum"),
+        limit: int = 50
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Async variant of get_multi_style; the screens run concurrently."""
+        results = await asyncio.gather(*[
+            self.ascreen_stocks(_STYLE_CRITERIA[style](), limit=limit)
+            for style in styles
+        ])
+        return dict(zip(styles, results))
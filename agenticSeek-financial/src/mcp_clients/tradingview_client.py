@@ -1,27 +1,91 @@
 """TradingView MCP Client for technical analysis and indicators."""
 
+import asyncio
+import logging
 import os
-from typing import Dict, List, Optional, Any
+import re
+import time
+from typing import Dict, Iterator, List, Optional, Any
+import httpx
 import requests
-from datetime import datetime, timedelta
 
+from ..utils import fastjson, run_sync
+from .base import BaseMCPClient
+from .http_cache import HTTPCache
+from .schemas import (
+    MACD,
+    RSI,
+    BollingerBands,
+    ChartPattern,
+    PivotPoints,
+    Stochastic,
+    SupportResistance,
+    TechnicalSummary,
+)
 
-class TradingViewClient:
+logger = logging.getLogger(__name__)
+
+# Minute intervals ("1m", "5m", ...); their bars close on wall-clock multiples
+_MINUTE_INTERVAL = re.compile(r"(\d+)m")
+
+
+class TradingViewClient(BaseMCPClient):
     """Client for accessing TradingView technical indicators and chart data via MCP protocol."""
     
-    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
+    # Seconds each endpoint's responses stay fresh in the HTTP cache.
+    # Oscillators move with every bar; levels and patterns drift slowly.
+    CACHE_TTLS = {
+        "technical_indicators": 60,
+        "rsi": 60,
+        "macd": 60,
+        "moving_averages": 60,
+        "bollinger_bands": 60,
+        "stochastic": 60,
+        "technical_summary": 60,
+        "chart_patterns": 300,
+        "support_resistance": 300,
+        "pivot_points": 300,
+    }
+    
+    # The technical agent fetches ten endpoints for up to ten tickers at once
+    MAX_CONNECTIONS = 100
+    
+    # Set these to the account's quota to pace fan-outs instead of hitting 429s
+    REQUESTS_PER_MINUTE = float(os.getenv("TRADINGVIEW_QPM", "0"))
+    MAX_IN_FLIGHT = int(os.getenv("TRADINGVIEW_MAX_CONCURRENCY", "0")) or None
+    
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        cache: Optional[HTTPCache] = None
+    ):
         """
         Initialize TradingView client.
         
         Args:
             api_key: API key for authentication
             base_url: Base URL for the MCP server
+            cache: Response cache (defaults to the shared on-disk cache)
         """
-        self.api_key = api_key or os.getenv("TRADINGVIEW_API_KEY")
-        self.base_url = base_url or os.getenv("TRADINGVIEW_BASE_URL", "https://api.tradingview.com/v1")
-        self.session = requests.Session()
-        if self.api_key:
-            self.session.headers.update({"Authorization": f"Bearer {self.api_key}"})
+        super().__init__(
+            api_key or os.getenv("TRADINGVIEW_API_KEY"),
+            base_url or os.getenv("TRADINGVIEW_BASE_URL", "https://api.tradingview.com/v1"),
+            cache
+        )
+    
+    def _auth_headers(self) -> Dict[str, str]:
+        """TradingView authenticates with a bearer token."""
+        return {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+    
+    def _entry_ttl(self, endpoint: str, params: Optional[Dict[str, Any]]) -> float:
+        """Endpoint TTL, cut short at the next bar close for minute intervals."""
+        ttl = self._cache_ttl(endpoint)
+        match = _MINUTE_INTERVAL.fullmatch(str((params or {}).get("interval", "")))
+        if match:
+            bar = int(match.group(1)) * 60
+            ttl = min(ttl, bar - time.time() % bar)
+        return ttl
     
     def get_technical_indicators(
         self,
@@ -44,18 +108,16 @@ class TradingViewClient:
             indicators = ["RSI", "MACD", "EMA", "SMA", "BB", "STOCH"]
         
         try:
-            response = self.session.get(
-                f"{self.base_url}/technical-analysis/{ticker}",
+            return self._get(
+                "technical_indicators",
+                f"/technical-analysis/{ticker}",
                 params={
                     "interval": interval,
                     "indicators": ",".join(indicators)
-                },
-                timeout=30
+                }
             )
-            response.raise_for_status()
-            return response.json()
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching technical indicators for {ticker}: {e}")
+            logger.warning("Error fetching technical indicators for %s: %s", ticker, e)
             return None
     
     def get_rsi(
@@ -63,7 +125,7 @@ class TradingViewClient:
         ticker: str,
         interval: str = "1D",
         period: int = 14
-    ) -> Optional[Dict[str, Any]]:
+    ) -> Optional[RSI]:
         """
         Get Relative Strength Index (RSI) for a stock.
         
@@ -76,18 +138,16 @@ class TradingViewClient:
             RSI data
         """
         try:
-            response = self.session.get(
-                f"{self.base_url}/indicators/rsi/{ticker}",
+            return self._get(
+                "rsi",
+                f"/indicators/rsi/{ticker}",
                 params={
                     "interval": interval,
                     "period": period
-                },
-                timeout=30
+                }
             )
-            response.raise_for_status()
-            return response.json()
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching RSI for {ticker}: {e}")
+            logger.warning("Error fetching RSI for %s: %s", ticker, e)
             return None
     
     def get_macd(
@@ -97,7 +157,7 @@ class TradingViewClient:
         fast_period: int = 12,
         slow_period: int = 26,
         signal_period: int = 9
-    ) -> Optional[Dict[str, Any]]:
+    ) -> Optional[MACD]:
         """
         Get MACD (Moving Average Convergence Divergence) for a stock.
         
@@ -112,20 +172,18 @@ class TradingViewClient:
             MACD data
         """
         try:
-            response = self.session.get(
-                f"{self.base_url}/indicators/macd/{ticker}",
+            return self._get(
+                "macd",
+                f"/indicators/macd/{ticker}",
                 params={
                     "interval": interval,
                     "fast": fast_period,
                     "slow": slow_period,
                     "signal": signal_period
-                },
-                timeout=30
+                }
             )
-            response.raise_for_status()
-            return response.json()
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching MACD for {ticker}: {e}")
+            logger.warning("Error fetching MACD for %s: %s", ticker, e)
             return None
     
     def get_moving_averages(
@@ -149,18 +207,16 @@ class TradingViewClient:
             periods = [20, 50, 100, 200]
         
         try:
-            response = self.session.get(
-                f"{self.base_url}/indicators/ma/{ticker}",
+            return self._get(
+                "moving_averages",
+                f"/indicators/ma/{ticker}",
                 params={
                     "interval": interval,
                     "periods": ",".join(map(str, periods))
-                },
-                timeout=30
+                }
             )
-            response.raise_for_status()
-            return response.json()
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching moving averages for {ticker}: {e}")
+            logger.warning("Error fetching moving averages for %s: %s", ticker, e)
             return None
     
     def get_bollinger_bands(
@@ -169,7 +225,7 @@ class TradingViewClient:
         interval: str = "1D",
         period: int = 20,
         std_dev: float = 2.0
-    ) -> Optional[Dict[str, Any]]:
+    ) -> Optional[BollingerBands]:
         """
         Get Bollinger Bands for a stock.
         
@@ -183,19 +239,17 @@ class TradingViewClient:
             Bollinger Bands data
         """
         try:
-            response = self.session.get(
-                f"{self.base_url}/indicators/bb/{ticker}",
+            return self._get(
+                "bollinger_bands",
+                f"/indicators/bb/{ticker}",
                 params={
                     "interval": interval,
                     "period": period,
                     "std_dev": std_dev
-                },
-                timeout=30
+                }
             )
-            response.raise_for_status()
-            return response.json()
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching Bollinger Bands for {ticker}: {e}")
+            logger.warning("Error fetching Bollinger Bands for %s: %s", ticker, e)
             return None
     
     def get_stochastic(
@@ -204,7 +258,7 @@ class TradingViewClient:
         interval: str = "1D",
         k_period: int = 14,
         d_period: int = 3
-    ) -> Optional[Dict[str, Any]]:
+    ) -> Optional[Stochastic]:
         """
         Get Stochastic Oscillator for a stock.
         
@@ -218,26 +272,24 @@ class TradingViewClient:
             Stochastic data
         """
         try:
-            response = self.session.get(
-                f"{self.base_url}/indicators/stoch/{ticker}",
+            return self._get(
+                "stochastic",
+                f"/indicators/stoch/{ticker}",
                 params={
                     "interval": interval,
                     "k_period": k_period,
                     "d_period": d_period
-                },
-                timeout=30
+                }
             )
-            response.raise_for_status()
-            return response.json()
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching Stochastic for {ticker}: {e}")
+            logger.warning("Error fetching Stochastic for %s: %s", ticker, e)
             return None
     
     def get_chart_patterns(
         self,
         ticker: str,
         interval: str = "1D"
-    ) -> List[Dict[str, Any]]:
+    ) -> List[ChartPattern]:
         """
         Detect chart patterns for a stock.
         
@@ -249,23 +301,54 @@ class TradingViewClient:
             List of detected chart patterns
         """
         try:
-            response = self.session.get(
-                f"{self.base_url}/patterns/{ticker}",
-                params={"interval": interval},
-                timeout=30
+            body = self._get(
+                "chart_patterns",
+                f"/patterns/{ticker}",
+                params={"interval": interval}
             )
-            response.raise_for_status()
-            return response.json().get("patterns", [])
+            return body.get("patterns", [])
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching chart patterns for {ticker}: {e}")
+            logger.warning("Error fetching chart patterns for %s: %s", ticker, e)
             return []
     
+    def iter_chart_patterns(
+        self,
+        ticker: str,
+        interval: str = "1D"
+    ) -> Iterator[ChartPattern]:
+        """
+        Stream detected chart patterns as the response arrives.
+        
+        For deep histories, where the pattern list is large and callers may
+        stop after the first few. Bypasses the response cache.
+        
+        Args:
+            ticker: Stock ticker symbol
+            interval: Time interval
+            
+        Yields:
+            Chart patterns in API order
+        """
+        try:
+            with self.session.get(
+                f"{self.base_url}/patterns/{ticker}",
+                params={"interval": interval},
+                # Streamed incrementally as JSON, whatever the session prefers
+                headers={"Accept": "application/json"},
+                timeout=(self.CONNECT_TIMEOUT, self.READ_TIMEOUT),
+                stream=True
+            ) as response:
+                response.raise_for_status()
+                yield from fastjson.iter_items(response.iter_content(chunk_size=65536), "patterns")
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.warning("Error streaming chart patterns for %s: %s", ticker, e)
+    
     def get_support_resistance(
         self,
         ticker: str,
         interval: str = "1D",
         lookback_periods: int = 100
-    ) -> Optional[Dict[str, Any]]:
+    ) -> Optional[SupportResistance]:
         """
         Get support and resistance levels for a stock.
         
@@ -278,25 +361,23 @@ class TradingViewClient:
             Support and resistance levels
         """
         try:
-            response = self.session.get(
-                f"{self.base_url}/levels/{ticker}",
+            return self._get(
+                "support_resistance",
+                f"/levels/{ticker}",
                 params={
                     "interval": interval,
                     "lookback": lookback_periods
-                },
-                timeout=30
+                }
             )
-            response.raise_for_status()
-            return response.json()
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching support/resistance for {ticker}: {e}")
+            logger.warning("Error fetching support/resistance for %s: %s", ticker, e)
             return None
     
     def get_technical_summary(
         self,
         ticker: str,
         interval: str = "1D"
-    ) -> Optional[Dict[str, Any]]:
+    ) -> Optional[TechnicalSummary]:
         """
         Get comprehensive technical analysis summary.
         
@@ -308,15 +389,13 @@ class TradingViewClient:
             Technical summary with buy/sell/neutral signals
         """
         try:
-            response = self.session.get(
-                f"{self.base_url}/summary/{ticker}",
-                params={"interval": interval},
-                timeout=30
+            return self._get(
+                "technical_summary",
+                f"/summary/{ticker}",
+                params={"interval": interval}
             )
-            response.raise_for_status()
-            return response.json()
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching technical summary for {ticker}: {e}")
+            logger.warning("Error fetching technical summary for %s: %s", ticker, e)
             return None
     
     def get_pivot_points(
@@ -324,7 +403,7 @@ class TradingViewClient:
         ticker: str,
         interval: str = "1D",
         method: str = "standard"
-    ) -> Optional[Dict[str, Any]]:
+    ) -> Optional[PivotPoints]:
         """
         Calculate pivot points for a stock.
         
@@ -337,16 +416,306 @@ class TradingViewClient:
             Pivot points data
         """
         try:
-            response = self.session.get(
-                f"{self.base_url}/indicators/pivot/{ticker}",
+            return self._get(
+                "pivot_points",
+                f"/indicators/pivot/{ticker}",
                 params={
                     "interval": interval,
                     "method": method
-                },
-                timeout=30
+                }
             )
-            response.raise_for_status()
-            return response.json()
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching pivot points for {ticker}: {e}")
+            logger.warning("Error fetching pivot points for %s: %s", ticker, e)
+            return None
+    
+    def get_full_analysis(
+        self,
+        ticker: str,
+        interval: str = "1D",
+        include_patterns: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Fetch every indicator endpoint for a ticker concurrently.
+        
+        Args:
+            ticker: Stock ticker symbol
+            interval: Time interval
+            include_patterns: Also fetch chart patterns
+            
+        Returns:
+            Dict with indicators, summary, rsi, macd, moving_averages,
+            bollinger_bands, stochastic, support_resistance, pivot_points and
+            (if requested) patterns; endpoints that failed map to None
+        """
+        return run_sync(self.aget_full_analysis(ticker, interval, include_patterns))
+    
+    def batch(
+        self,
+        method: str,
+        tickers: List[str],
+        **kwargs: Any
+    ) -> Dict[str, Any]:
+        """
+        Call one indicator method for several tickers concurrently.
+        
+        Args:
+            method: Name of a get_* method, e.g. "get_rsi"
+            tickers: Stock ticker symbols
+            **kwargs: Arguments passed to every call
+            
+        Returns:
+            The method's result per ticker
+        """
+        return run_sync(self.abatch(method, tickers, **kwargs))
+    
+    async def aget_technical_indicators(
+        self,
+        ticker: str,
+        interval: str = "1D",
+        indicators: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Async variant of get_technical_indicators."""
+        if indicators is None:
+            indicators = ["RSI", "MACD", "EMA", "SMA", "BB", "STOCH"]
+        
+        try:
+            return await self._aget(
+                "technical_indicators",
+                f"/technical-analysis/{ticker}",
+                params={
+                    "interval": interval,
+                    "indicators": ",".join(indicators)
+                }
+            )
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning("Error fetching technical indicators for %s: %s", ticker, e)
+            return None
+    
+    async def aget_rsi(
+        self,
+        ticker: str,
+        interval: str = "1D",
+        period: int = 14
+    ) -> Optional[RSI]:
+        """Async variant of get_rsi."""
+        try:
+            return await self._aget(
+                "rsi",
+                f"/indicators/rsi/{ticker}",
+                params={
+                    "interval": interval,
+                    "period": period
+                }
+            )
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning("Error fetching RSI for %s: %s", ticker, e)
+            return None
+    
+    async def aget_macd(
+        self,
+        ticker: str,
+        interval: str = "1D",
+        fast_period: int = 12,
+        slow_period: int = 26,
+        signal_period: int = 9
+    ) -> Optional[MACD]:
+        """Async variant of get_macd."""
+        try:
+            return await self._aget(
+                "macd",
+                f"/indicators/macd/{ticker}",
+                params={
+                    "interval": interval,
+                    "fast": fast_period,
+                    "slow": slow_period,
+                    "signal": signal_period
+                }
+            )
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning("Error fetching MACD for %s: %s", ticker, e)
+            return None
+    
+    async def aget_moving_averages(
+        self,
+        ticker: str,
+        interval: str = "1D",
+        periods: Optional[List[int]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Async variant of get_moving_averages."""
+        if periods is None:
+            periods = [20, 50, 100, 200]
+        
+        try:
+            return await self._aget(
+                "moving_averages",
+                f"/indicators/ma/{ticker}",
+                params={
+                    "interval": interval,
+                    "periods": ",".join(map(str, periods))
+                }
+            )
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning("Error fetching moving averages for %s: %s", ticker, e)
+            return None
+    
+    async def aget_bollinger_bands(
+        self,
+        ticker: str,
+        interval: str = "1D",
+        period: int = 20,
+        std_dev: float = 2.0
+    ) -> Optional[BollingerBands]:
+        """Async variant of get_bollinger_bands."""
+        try:
+            return await self._aget(
+                "bollinger_bands",
+                f"/indicators/bb/{ticker}",
+                params={
+                    "interval": interval,
+                    "period": period,
+                    "std_dev": std_dev
+                }
+            )
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning("Error fetching Bollinger Bands for %s: %s", ticker, e)
+            return None
+    
+    async def aget_stochastic(
+        self,
+        ticker: str,
+        interval: str = "1D",
+        k_period: int = 14,
+        d_period: int = 3
+    ) -> Optional[Stochastic]:
+        """Async variant of get_stochastic."""
+        try:
+            return await self._aget(
+                "stochastic",
+                f"/indicators/stoch/{ticker}",
+                params={
+                    "interval": interval,
+                    "k_period": k_period,
+                    "d_period": d_period
+                }
+            )
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning("Error fetching Stochastic for %s: %s", ticker, e)
             return None
+    
+    async def aget_chart_patterns(
+        self,
+        ticker: str,
+        interval: str = "1D"
+    ) -> List[ChartPattern]:
+        """Async variant of get_chart_patterns."""
+        try:
+            body = await self._aget(
+                "chart_patterns",
+                f"/patterns/{ticker}",
+                params={"interval": interval}
+            )
+            return body.get("patterns", [])
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning("Error fetching chart patterns for %s: %s", ticker, e)
+            return []
+    
+    async def aget_support_resistance(
+        self,
+        ticker: str,
+        interval: str = "1D",
+        lookback_periods: int = 100
+    ) -> Optional[SupportResistance]:
+        """Async variant of get_support_resistance."""
+        try:
+            return await self._aget(
+                "support_resistance",
+                f"/levels/{ticker}",
+                params={
+                    "interval": interval,
+                    "lookback": lookback_periods
+                }
+            )
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning("Error fetching support/resistance for %s: %s", ticker, e)
+            return None
+    
+    async def aget_technical_summary(
+        self,
+        ticker: str,
+        interval: str = "1D"
+    ) -> Optional[TechnicalSummary]:
+        """Async variant of get_technical_summary."""
+        try:
+            return await self._aget(
+                "technical_summary",
+                f"/summary/{ticker}",
+                params={"interval": interval}
+            )
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning("Error fetching technical summary for %s: %s", ticker, e)
+            return None
+    
+    async def aget_pivot_points(
+        self,
+        ticker: str,
+        interval: str = "1D",
+        method: str = "standard"
+    ) -> Optional[PivotPoints]:
+        """Async variant of get_pivot_points."""
+        try:
+            return await self._aget(
+                "pivot_points",
+                f"/indicators/pivot/{ticker}",
+                params={
+                    "interval": interval,
+                    "method": method
+                }
+            )
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning("Error fetching pivot points for %s: %s", ticker, e)
+            return None
+    
+    async def aget_full_analysis(
+        self,
+        ticker: str,
+        interval: str = "1D",
+        include_patterns: bool = True
+    ) -> Dict[str, Any]:
+        """Async variant of get_full_analysis."""
+        fetchers = {
+            "indicators": self.aget_technical_indicators,
+            "summary": self.aget_technical_summary,
+            "rsi": self.aget_rsi,
+            "macd": self.aget_macd,
+            "moving_averages": self.aget_moving_averages,
+            "bollinger_bands": self.aget_bollinger_bands,
+            "stochastic": self.aget_stochastic,
+            "support_resistance": self.aget_support_resistance,
+            "pivot_points": self.aget_pivot_points,
+        }
+        if include_patterns:
+            fetchers["patterns"] = self.aget_chart_patterns
+        
+        results = await asyncio.gather(
+            *[fetch(ticker, interval) for fetch in fetchers.values()],
+            return_exceptions=True
+        )
+        
+        data = {}
+        for name, result in zip(fetchers, results):
+            if isinstance(result, Exception):
+                logger.warning("Failed to fetch %s for %s: %s", name, ticker, result)
+                result = None
+            data[name] = result
+        return data
+    
+    async def abatch(
+        self,
+        method: str,
+        tickers: List[str],
+        **kwargs: Any
+    ) -> Dict[str, Any]:
+        """Async variant of batch; the requests share the client's async pool."""
+        fetch = getattr(self, f"a{method}")
+        results = await asyncio.gather(*[fetch(ticker, **kwargs) for ticker in tickers])
+        return dict(zip(tickers, results))
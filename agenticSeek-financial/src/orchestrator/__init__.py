@@ -1,9 +1,19 @@
 """Orchestrator module for coordinating agents and routing LLM tasks."""
 
-from .multi_llm_router import MultiLLMRouter
-from .task_coordinator import TaskCoordinator
+from .multi_llm_router import MultiLLMRouter, TaskComplexity
 
 __all__ = [
     "MultiLLMRouter",
+    "TaskComplexity",
     "TaskCoordinator",
 ]
+
+
+def __getattr__(name):
+    # TaskCoordinator pulls in the coordinator's caching and event-loop
+    # plumbing, so load it on first use rather than whenever the router is
+    # imported. Its agents are imported lazily in turn.
+    if name == "TaskCoordinator":
+        from .task_coordinator import TaskCoordinator
+        return TaskCoordinator
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,16 +1,23 @@
 """Multi-LLM Router for intelligent task routing based on complexity and cost."""
 
+import logging
 import os
-from typing import Dict, Any, Optional, List
+from functools import lru_cache
+from typing import Dict, Any, Optional, List, Union
 from enum import Enum
-from langchain_openai import ChatOpenAI
-from langchain_anthropic import ChatAnthropic
-from langchain_groq import ChatGroq
-from langchain_google_genai import ChatGoogleGenerativeAI
 
+from ..llm import get_llm
 
-class TaskComplexity(Enum):
-    """Task complexity levels."""
+logger = logging.getLogger(__name__)
+
+
+class TaskComplexity(str, Enum):
+    """
+    Task complexity levels.
+    
+    Members are also their string values, so routing accepts either and
+    lookups keyed by a member match the plain string.
+    """
     SIMPLE = "simple"  # Quick lookups, simple queries
     MODERATE = "moderate"  # Standard analysis
     COMPLEX = "complex"  # Deep analysis, reasoning
@@ -25,6 +32,22 @@ class LLMProvider(Enum):
     GOOGLE = "google"
 
 
+@lru_cache(maxsize=1)
+def _provider_availability() -> Dict[str, bool]:
+    """
+    Which LLM providers have API keys configured.
+    
+    Keys don't change during a run, so the environment is read once and the
+    dict is shared by every router.
+    """
+    return {
+        "openai": bool(os.getenv("OPENAI_API_KEY")),
+        "anthropic": bool(os.getenv("ANTHROPIC_API_KEY")),
+        "groq": bool(os.getenv("GROQ_API_KEY")),
+        "google": bool(os.getenv("GOOGLE_API_KEY")),
+    }
+
+
 class MultiLLMRouter:
     """
     Intelligent router that selects the best LLM for a given task based on:
@@ -48,6 +71,12 @@ class MultiLLMRouter:
         "gemini-1.5-pro": {"input": 1.25, "output": 5.00},
     }
     
+    # model -> (input, output, average) cost, so routing does no per-call arithmetic
+    _MODEL_COSTS = {
+        model: (costs["input"], costs["output"], (costs["input"] + costs["output"]) / 2)
+        for model, costs in COST_MAP.items()
+    }
+    
     # Model recommendations by complexity
     COMPLEXITY_MODELS = {
         TaskComplexity.SIMPLE: [
@@ -94,20 +123,30 @@ class MultiLLMRouter:
         self.cost_optimization = cost_optimization
         self.temperature = temperature
         self.available_providers = self._check_available_providers()
+        
+        # Per complexity, the available (provider, model, average cost per 1M
+        # tokens) in preference order, so routing only applies the cost limit
+        self._candidates = {
+            complexity: [
+                (provider, model, self._average_cost(model))
+                for provider, model in models
+                if self.available_providers.get(provider, False)
+            ]
+            for complexity, models in self.COMPLEXITY_MODELS.items()
+        }
     
     def _check_available_providers(self) -> Dict[str, bool]:
         """Check which LLM providers have API keys configured."""
-        return {
-            "openai": bool(os.getenv("OPENAI_API_KEY")),
-            "anthropic": bool(os.getenv("ANTHROPIC_API_KEY")),
-            "groq": bool(os.getenv("GROQ_API_KEY")),
-            "google": bool(os.getenv("GOOGLE_API_KEY")),
-        }
+        return _provider_availability()
+    
+    def _average_cost(self, model: str) -> float:
+        """Mean of a model's input and output cost per 1M tokens."""
+        return self._MODEL_COSTS.get(model, (0, 0, 0))[2]
     
     def route_task(
         self,
         task_description: str,
-        complexity: TaskComplexity = TaskComplexity.MODERATE,
+        complexity: Union[TaskComplexity, str] = TaskComplexity.MODERATE,
         max_cost: Optional[float] = None
     ) -> tuple[Any, str, str]:
         """
@@ -115,7 +154,7 @@ class MultiLLMRouter:
         
         Args:
             task_description: Description of the task
-            complexity: Task complexity level
+            complexity: Task complexity level, or its value (e.g. "complex")
             max_cost: Maximum acceptable cost per 1M tokens
             
         Returns:
@@ -127,27 +166,18 @@ class MultiLLMRouter:
                 llm = self._create_llm(self.default_provider, self.default_model)
                 return llm, self.default_provider, self.default_model
         
-        # Get recommended models for this complexity
-        recommended_models = self.COMPLEXITY_MODELS.get(complexity, [])
-        
-        # Filter by availability and cost
-        for provider, model in recommended_models:
-            if not self.available_providers.get(provider, False):
-                continue
-            
+        # Recommended models for this complexity, already filtered by availability
+        for provider, model, avg_cost in self._candidates.get(complexity, []):
             # Check cost constraint
-            if max_cost and self.cost_optimization:
-                model_cost = self.COST_MAP.get(model, {})
-                avg_cost = (model_cost.get("input", 0) + model_cost.get("output", 0)) / 2
-                if avg_cost > max_cost:
-                    continue
+            if max_cost and self.cost_optimization and avg_cost > max_cost:
+                continue
             
             # Create and return LLM
             try:
                 llm = self._create_llm(provider, model)
                 return llm, provider, model
             except Exception as e:
-                print(f"Failed to create LLM {provider}/{model}: {e}")
+                logger.warning("Failed to create LLM %s/%s: %s", provider, model, e)
                 continue
         
         # Fallback: try any available provider
@@ -158,23 +188,14 @@ class MultiLLMRouter:
                     llm = self._create_llm(provider, fallback_model)
                     return llm, provider, fallback_model
                 except Exception as e:
-                    print(f"Failed to create fallback LLM {provider}/{fallback_model}: {e}")
+                    logger.warning("Failed to create fallback LLM %s/%s: %s", provider, fallback_model, e)
                     continue
         
         raise RuntimeError("No LLM providers available. Please configure API keys.")
     
     def _create_llm(self, provider: str, model: str) -> Any:
-        """Create an LLM instance."""
-        if provider == "openai":
-            return ChatOpenAI(model=model, temperature=self.temperature)
-        elif provider == "anthropic":
-            return ChatAnthropic(model=model, temperature=self.temperature)
-        elif provider == "groq":
-            return ChatGroq(model=model, temperature=self.temperature)
-        elif provider == "google":
-            return ChatGoogleGenerativeAI(model=model, temperature=self.temperature)
-        else:
-            raise ValueError(f"Unsupported provider: {provider}")
+        """Get the shared LLM instance for a provider and model."""
+        return get_llm(provider, model, self.temperature)
     
     def _get_fallback_model(self, provider: str) -> str:
         """Get a fallback model for a provider."""
@@ -205,22 +226,18 @@ class MultiLLMRouter:
         Returns:
             Estimated cost in USD
         """
-        costs = self.COST_MAP.get(model, {"input": 0, "output": 0})
-        input_cost = (input_tokens / 1_000_000) * costs["input"]
-        output_cost = (output_tokens / 1_000_000) * costs["output"]
+        input_price, output_price, _ = self._MODEL_COSTS.get(model, (0, 0, 0))
+        input_cost = (input_tokens / 1_000_000) * input_price
+        output_cost = (output_tokens / 1_000_000) * output_price
         return input_cost + output_cost
     
     def get_available_models(self) -> Dict[str, List[str]]:
         """Get available models by provider."""
-        available = {}
-        for provider, is_available in self.available_providers.items():
-            if is_available:
-                models = [
-                    model for p, model in sum(self.COMPLEXITY_MODELS.values(), [])
-                    if p == provider
-                ]
-                available[provider] = list(set(models))
-        return available
+        return {
+            provider: list(_PROVIDER_MODELS.get(provider, ()))
+            for provider, is_available in self.available_providers.items()
+            if is_available
+        }
     
     def recommend_model(
         self,
@@ -248,20 +265,11 @@ class MultiLLMRouter:
         
         complexity = task_complexity_map.get(task_type, TaskComplexity.MODERATE)
         
-        # Get recommended models
-        recommended = self.COMPLEXITY_MODELS.get(complexity, [])
-        
-        # Filter by budget and availability
-        for provider, model in recommended:
-            if not self.available_providers.get(provider, False):
+        # Recommended models, already filtered by availability; filter by budget
+        for provider, model, avg_cost in self._candidates.get(complexity, []):
+            if budget and avg_cost > budget:
                 continue
             
-            if budget:
-                costs = self.COST_MAP.get(model, {})
-                avg_cost = (costs.get("input", 0) + costs.get("output", 0)) / 2
-                if avg_cost > budget:
-                    continue
-            
             return provider, model
         
         # Fallback
@@ -270,3 +278,15 @@ class MultiLLMRouter:
                 return provider, self._get_fallback_model(provider)
         
         raise RuntimeError("No suitable model found")
+
+
+def _models_by_provider() -> Dict[str, List[str]]:
+    """Distinct models each provider serves across COMPLEXITY_MODELS, in first-use order."""
+    by_provider: Dict[str, Dict[str, None]] = {}
+    for models in MultiLLMRouter.COMPLEXITY_MODELS.values():
+        for provider, model in models:
+            by_provider.setdefault(provider, {})[model] = None
+    return {provider: list(models) for provider, models in by_provider.items()}
+
+
+_PROVIDER_MODELS = _models_by_provider()
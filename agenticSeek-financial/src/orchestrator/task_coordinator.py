@@ -1,18 +1,51 @@
 """Task Coordinator for orchestrating multiple agents in parallel and aggregating results."""
 
 import asyncio
-from typing import Dict, List, Any, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from datetime import datetime
+import copy
+import logging
+import re
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import AsyncIterator, Dict, Iterator, List, Any, Optional, Tuple
 
-from ..agents import (
-    StockAnalystAgent,
-    CryptoAnalystAgent,
-    TechnicalAgent,
-    FundamentalAgent
-)
+from .. import agents
+from ..llm.generative_cache import GenerativeCache, make_key
+from ..utils import iter_sync, now_iso, run_sync
 from .multi_llm_router import MultiLLMRouter, TaskComplexity
 
+logger = logging.getLogger(__name__)
+
+# "Confidence: 8" style score in an agent's free-text analysis
+_CONFIDENCE_RE = re.compile(r"confidence[:\s]+(\d+)", re.IGNORECASE)
+# Whole-word recommendations, so "buyback" or "threshold" don't vote
+_VOTE_RE = re.compile(r"\b(BUY|SELL|HOLD)\b")
+_VOTES = ("BUY", "SELL", "HOLD")
+
+# agent_type -> (agent class name in ..agents, analysis method, async analysis
+# method). Classes are resolved on first use, so only the agents a run needs
+# (and their LangChain dependencies) are imported.
+_AGENT_REGISTRY = {
+    "stock_analyst": ("StockAnalystAgent", "analyze_stock", "aanalyze_stock"),
+    "crypto_analyst": ("CryptoAnalystAgent", "analyze_crypto", "aanalyze_crypto"),
+    "technical": ("TechnicalAgent", "analyze_technical", "aanalyze_technical"),
+    "fundamental": ("FundamentalAgent", "analyze_fundamentals", "aanalyze_fundamentals"),
+}
+
+
+def _registration(agent_type: str) -> Tuple[str, str, str]:
+    """Look up an agent type's class name and methods."""
+    try:
+        return _AGENT_REGISTRY[agent_type]
+    except KeyError:
+        raise ValueError(f"Unknown agent type: {agent_type}") from None
+
+
+def _agent_class(agent_type: str) -> type:
+    """Import and return an agent type's class."""
+    return getattr(agents, _registration(agent_type)[0])
+
 
 class TaskCoordinator:
     """
@@ -20,51 +53,133 @@ class TaskCoordinator:
     Handles parallel execution, result aggregation, and conflict resolution.
     """
     
+    # Seconds an agent's result is reused for identical inputs. Fundamentals
+    # move with quarterly filings; everything else tracks prices.
+    RESULT_TTLS = {
+        "stock_analyst": 300,
+        "crypto_analyst": 300,
+        "technical": 300,
+        "fundamental": 3600,
+    }
+    RESULT_CACHE_SIZE = 256
+    
+    # Agents kept per (agent_type, provider, model), and seconds an unused
+    # one survives before its clients are dropped
+    AGENT_POOL_SIZE = 32
+    AGENT_IDLE_TTL = 600.0
+    
     def __init__(
         self,
         llm_router: Optional[MultiLLMRouter] = None,
-        max_workers: int = 4
+        max_workers: int = 4,
+        max_inflight: int = 4
     ):
         """
         Initialize Task Coordinator.
         
         Args:
             llm_router: Multi-LLM router for intelligent model selection
-            max_workers: Maximum number of parallel workers
+            max_workers: Maximum number of assets analyzed at once in
+                batch_analyze and compare_assets
+            max_inflight: Maximum number of agent calls in flight at once,
+                across all assets; keeps bulk runs under upstream rate limits
         """
         self.llm_router = llm_router or MultiLLMRouter()
         self.max_workers = max_workers
-        self.agents = {}
+        self.max_inflight = max_inflight
+        self._agent_pool: "OrderedDict[Tuple[str, str, str], Tuple[Any, float]]" = OrderedDict()
+        self._agent_pool_lock = threading.Lock()
+        # (agent_type, complexity) -> (provider, model, monotonic time routed);
+        # routes expire with idle agents so availability changes are picked up
+        self._routes: Dict[Tuple[str, TaskComplexity], Tuple[str, str, float]] = {}
+        self._results = {
+            agent_type: GenerativeCache(ttl=ttl, max_entries=self.RESULT_CACHE_SIZE)
+            for agent_type, ttl in self.RESULT_TTLS.items()
+        }
+        # asyncio primitives are bound to one loop, so keep limiters per loop
+        self._limits: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = (
+            weakref.WeakKeyDictionary()
+        )
+    
+    def _limit(self, scope: str = "agent") -> asyncio.Semaphore:
+        """
+        Get the running loop's semaphore for a concurrency scope.
+        
+        Args:
+            scope: "agent" for single agent calls (max_inflight) or "asset"
+                for whole-asset analyses (max_workers)
+        """
+        loop = asyncio.get_running_loop()
+        limits = self._limits.get(loop)
+        if limits is None:
+            limits = {
+                "agent": asyncio.Semaphore(self.max_inflight),
+                "asset": asyncio.Semaphore(self.max_workers),
+            }
+            self._limits[loop] = limits
+        return limits[scope]
     
     def _get_or_create_agent(
         self,
         agent_type: str,
         complexity: TaskComplexity = TaskComplexity.MODERATE
     ) -> Any:
-        """Get or create an agent instance."""
-        if agent_type in self.agents:
-            return self.agents[agent_type]
+        """
+        Get a pooled agent for the model the router picks, creating it on a miss.
+        
+        Agents are pooled per (agent_type, provider, model), so a type routed
+        to different models at different complexities keeps one of each.
+        """
+        agent_class = _agent_class(agent_type)
+        
+        provider, model = self._route(agent_type, complexity)
+        key = (agent_type, provider, model)
+        
+        with self._agent_pool_lock:
+            self._reap_idle_agents()
+            entry = self._agent_pool.get(key)
+            if entry is not None:
+                self._agent_pool[key] = (entry[0], time.monotonic())
+                self._agent_pool.move_to_end(key)
+                return entry[0]
+        
+        # Create agent
+        agent = agent_class(llm_provider=provider, model_name=model)
+        
+        with self._agent_pool_lock:
+            # Another task may have built the same agent meanwhile; keep the first
+            entry = self._agent_pool.get(key)
+            if entry is not None:
+                agent = entry[0]
+            self._agent_pool[key] = (agent, time.monotonic())
+            self._agent_pool.move_to_end(key)
+            while len(self._agent_pool) > self.AGENT_POOL_SIZE:
+                self._agent_pool.popitem(last=False)
+        return agent
+    
+    def _route(self, agent_type: str, complexity: TaskComplexity) -> Tuple[str, str]:
+        """Provider and model for an agent type, routed at most once per AGENT_IDLE_TTL."""
+        route = self._routes.get((agent_type, complexity))
+        if route is not None and time.monotonic() - route[2] < self.AGENT_IDLE_TTL:
+            return route[0], route[1]
         
         # Route to appropriate LLM
         llm, provider, model = self.llm_router.route_task(
             f"{agent_type} analysis",
             complexity=complexity
         )
-        
-        # Create agent
-        if agent_type == "stock_analyst":
-            agent = StockAnalystAgent(llm_provider=provider, model_name=model)
-        elif agent_type == "crypto_analyst":
-            agent = CryptoAnalystAgent(llm_provider=provider, model_name=model)
-        elif agent_type == "technical":
-            agent = TechnicalAgent(llm_provider=provider, model_name=model)
-        elif agent_type == "fundamental":
-            agent = FundamentalAgent(llm_provider=provider, model_name=model)
-        else:
-            raise ValueError(f"Unknown agent type: {agent_type}")
-        
-        self.agents[agent_type] = agent
-        return agent
+        self._routes[(agent_type, complexity)] = (provider, model, time.monotonic())
+        return provider, model
+    
+    def _reap_idle_agents(self) -> None:
+        """Drop agents unused for AGENT_IDLE_TTL seconds; caller holds the pool lock."""
+        cutoff = time.monotonic() - self.AGENT_IDLE_TTL
+        # Least recently used first, so stop at the first agent still in use
+        while self._agent_pool:
+            key, (_, last_used) = next(iter(self._agent_pool.items()))
+            if last_used >= cutoff:
+                break
+            del self._agent_pool[key]
     
     def analyze_stock_comprehensive(
         self,
@@ -85,29 +200,63 @@ class TaskCoordinator:
         Returns:
             Aggregated analysis results
         """
-        tasks = []
-        
-        # Define analysis tasks
-        if include_fundamental:
-            tasks.append(("fundamental", ticker))
-        
-        if include_technical:
-            tasks.append(("technical", ticker))
-        
-        # Always include stock analyst for comprehensive view
-        tasks.append(("stock_analyst", ticker))
-        
-        # Execute tasks
         if parallel:
-            results = self._execute_parallel(tasks)
-        else:
-            results = self._execute_sequential(tasks)
+            return run_sync(self.aanalyze_stock_comprehensive(ticker, include_fundamental, include_technical))
+        
+        tasks = self._stock_tasks(ticker, include_fundamental, include_technical)
+        results = self._execute_sequential(tasks)
         
         # Aggregate results
         aggregated = self._aggregate_stock_results(ticker, results)
         
         return aggregated
     
+    async def aanalyze_stock_comprehensive(
+        self,
+        ticker: str,
+        include_fundamental: bool = True,
+        include_technical: bool = True
+    ) -> Dict[str, Any]:
+        """Async variant of analyze_stock_comprehensive; agents run concurrently."""
+        tasks = self._stock_tasks(ticker, include_fundamental, include_technical)
+        results = await self._aexecute_parallel(tasks)
+        return self._aggregate_stock_results(ticker, results)
+    
+    def analyze_stock_comprehensive_stream(
+        self,
+        ticker: str,
+        include_fundamental: bool = True,
+        include_technical: bool = True
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Run a comprehensive stock analysis, yielding each agent's result as it lands.
+        
+        Args:
+            ticker: Stock ticker symbol
+            include_fundamental: Include fundamental analysis
+            include_technical: Include technical analysis
+            
+        Yields:
+            (agent_type, result) per agent in completion order, then
+            ("aggregate", aggregated results)
+        """
+        return iter_sync(self.astream_stock_comprehensive(ticker, include_fundamental, include_technical))
+    
+    async def astream_stock_comprehensive(
+        self,
+        ticker: str,
+        include_fundamental: bool = True,
+        include_technical: bool = True
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Async variant of analyze_stock_comprehensive_stream."""
+        results = {}
+        async for agent_type, result in self._astream_parallel(
+            self._stock_tasks(ticker, include_fundamental, include_technical)
+        ):
+            results[agent_type] = result
+            yield agent_type, result
+        yield "aggregate", self._aggregate_stock_results(ticker, results)
+    
     def analyze_crypto_comprehensive(
         self,
         symbol: str,
@@ -127,6 +276,90 @@ class TaskCoordinator:
         Returns:
             Aggregated analysis results
         """
+        if parallel:
+            return run_sync(self.aanalyze_crypto_comprehensive(symbol, include_onchain, include_technical))
+        
+        tasks = self._crypto_tasks(symbol, include_onchain, include_technical)
+        results = self._execute_sequential(tasks)
+        
+        # Aggregate results
+        aggregated = self._aggregate_crypto_results(symbol, results)
+        
+        return aggregated
+    
+    async def aanalyze_crypto_comprehensive(
+        self,
+        symbol: str,
+        include_onchain: bool = True,
+        include_technical: bool = True
+    ) -> Dict[str, Any]:
+        """Async variant of analyze_crypto_comprehensive; agents run concurrently."""
+        tasks = self._crypto_tasks(symbol, include_onchain, include_technical)
+        results = await self._aexecute_parallel(tasks)
+        return self._aggregate_crypto_results(symbol, results)
+    
+    def analyze_crypto_comprehensive_stream(
+        self,
+        symbol: str,
+        include_onchain: bool = True,
+        include_technical: bool = True
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Run a comprehensive crypto analysis, yielding each agent's result as it lands.
+        
+        Args:
+            symbol: Crypto symbol (e.g., "BTC", "ETH")
+            include_onchain: Include on-chain metrics
+            include_technical: Include technical analysis
+            
+        Yields:
+            (agent_type, result) per agent in completion order, then
+            ("aggregate", aggregated results)
+        """
+        return iter_sync(self.astream_crypto_comprehensive(symbol, include_onchain, include_technical))
+    
+    async def astream_crypto_comprehensive(
+        self,
+        symbol: str,
+        include_onchain: bool = True,
+        include_technical: bool = True
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Async variant of analyze_crypto_comprehensive_stream."""
+        results = {}
+        async for agent_type, result in self._astream_parallel(
+            self._crypto_tasks(symbol, include_onchain, include_technical)
+        ):
+            results[agent_type] = result
+            yield agent_type, result
+        yield "aggregate", self._aggregate_crypto_results(symbol, results)
+    
+    def _stock_tasks(
+        self,
+        ticker: str,
+        include_fundamental: bool = True,
+        include_technical: bool = True
+    ) -> List[tuple]:
+        """Agent tasks making up a comprehensive stock analysis."""
+        tasks = []
+        
+        # Define analysis tasks
+        if include_fundamental:
+            tasks.append(("fundamental", ticker))
+        
+        if include_technical:
+            tasks.append(("technical", ticker))
+        
+        # Always include stock analyst for comprehensive view
+        tasks.append(("stock_analyst", ticker))
+        return tasks
+    
+    def _crypto_tasks(
+        self,
+        symbol: str,
+        include_onchain: bool = True,
+        include_technical: bool = True
+    ) -> List[tuple]:
+        """Agent tasks making up a comprehensive crypto analysis."""
         tasks = []
         
         # Crypto analyst
@@ -135,17 +368,7 @@ class TaskCoordinator:
         # Technical analysis
         if include_technical:
             tasks.append(("technical", symbol))
-        
-        # Execute tasks
-        if parallel:
-            results = self._execute_parallel(tasks)
-        else:
-            results = self._execute_sequential(tasks)
-        
-        # Aggregate results
-        aggregated = self._aggregate_crypto_results(symbol, results)
-        
-        return aggregated
+        return tasks
     
     def compare_assets(
         self,
@@ -162,50 +385,69 @@ class TaskCoordinator:
         Returns:
             Comparison results
         """
+        return run_sync(self.acompare_assets(tickers, asset_type))
+    
+    async def acompare_assets(
+        self,
+        tickers: List[str],
+        asset_type: str = "stock"
+    ) -> Dict[str, Any]:
+        """Async variant of compare_assets."""
         if asset_type == "stock":
             agent = self._get_or_create_agent("fundamental", TaskComplexity.MODERATE)
-            return agent.compare_companies(tickers)
+            return await agent.acompare_companies(tickers)
         elif asset_type == "crypto":
-            # Analyze each crypto and compare
+            # Analyze each crypto concurrently and compare
             results = {}
             agent = self._get_or_create_agent("crypto_analyst", TaskComplexity.MODERATE)
             
-            for ticker in tickers:
-                results[ticker] = agent.analyze_crypto(ticker)
+            async def analyze(ticker: str) -> Dict[str, Any]:
+                async with self._limit("asset"), self._limit():
+                    return await agent.aanalyze_crypto(ticker)
+            
+            outcomes = await asyncio.gather(
+                *[analyze(ticker) for ticker in tickers],
+                return_exceptions=True
+            )
+            
+            for ticker, outcome in zip(tickers, outcomes):
+                if isinstance(outcome, Exception):
+                    logger.warning("Analysis failed for %s: %s", ticker, outcome)
+                    outcome = {"error": str(outcome)}
+                results[ticker] = outcome
             
             return {
                 "comparison_type": "crypto",
                 "assets": tickers,
                 "results": results,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": now_iso()
             }
         else:
             raise ValueError(f"Unsupported asset type: {asset_type}")
     
-    def _execute_parallel(self, tasks: List[tuple]) -> Dict[str, Any]:
-        """Execute tasks in parallel using ThreadPoolExecutor."""
-        results = {}
-        
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            future_to_task = {}
-            
-            for task in tasks:
-                agent_type = task[0]
-                args = task[1:] if len(task) > 1 else ()
-                
-                future = executor.submit(self._execute_agent_task, agent_type, *args)
-                future_to_task[future] = agent_type
-            
-            for future in as_completed(future_to_task):
-                agent_type = future_to_task[future]
-                try:
-                    result = future.result()
-                    results[agent_type] = result
-                except Exception as e:
-                    print(f"Agent {agent_type} failed: {e}")
-                    results[agent_type] = {"error": str(e)}
-        
-        return results
+    async def _aexecute_parallel(self, tasks: List[tuple]) -> Dict[str, Any]:
+        """Execute tasks concurrently on the running event loop."""
+        return dict(await asyncio.gather(*[self._aguarded(task) for task in tasks]))
+    
+    async def _astream_parallel(self, tasks: List[tuple]) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Execute tasks concurrently, yielding (agent_type, result) as each finishes."""
+        running = [asyncio.ensure_future(self._aguarded(task)) for task in tasks]
+        try:
+            for next_done in asyncio.as_completed(running):
+                yield await next_done
+        finally:
+            # The consumer stopped early; don't leave agents running
+            for future in running:
+                future.cancel()
+    
+    async def _aguarded(self, task: tuple) -> Tuple[str, Dict[str, Any]]:
+        """Run one task, turning a failure into an error result."""
+        agent_type = task[0]
+        try:
+            return agent_type, await self._aexecute_agent_task(agent_type, *task[1:])
+        except Exception as e:
+            logger.warning("Agent %s failed: %s", agent_type, e)
+            return agent_type, {"error": str(e)}
     
     def _execute_sequential(self, tasks: List[tuple]) -> Dict[str, Any]:
         """Execute tasks sequentially."""
@@ -219,13 +461,52 @@ class TaskCoordinator:
                 result = self._execute_agent_task(agent_type, *args)
                 results[agent_type] = result
             except Exception as e:
-                print(f"Agent {agent_type} failed: {e}")
+                logger.warning("Agent %s failed: %s", agent_type, e)
                 results[agent_type] = {"error": str(e)}
         
         return results
     
     def _execute_agent_task(self, agent_type: str, *args) -> Dict[str, Any]:
-        """Execute a single agent task."""
+        """Execute a single agent task, reusing a copy of a fresh result for identical inputs."""
+        cache = self._results.get(agent_type)
+        key = self._result_key(*args)
+        result = cache.get(key) if cache is not None else None
+        if result is not None:
+            return copy.deepcopy(result)
+        result = self._run_agent_task(agent_type, *args)
+        self._remember_result(agent_type, key, result)
+        return result
+    
+    async def _aexecute_agent_task(self, agent_type: str, *args) -> Dict[str, Any]:
+        """Async variant of _execute_agent_task."""
+        cache = self._results.get(agent_type)
+        key = self._result_key(*args)
+        result = cache.get(key) if cache is not None else None
+        if result is not None:
+            return copy.deepcopy(result)
+        async with self._limit():
+            result = await self._arun_agent_task(agent_type, *args)
+        self._remember_result(agent_type, key, result)
+        return result
+    
+    @staticmethod
+    def _result_key(*args) -> str:
+        """Cache key for a task's arguments; "aapl " and "AAPL" share an entry."""
+        return make_key(*(a.strip().upper() if isinstance(a, str) else a for a in args))
+    
+    def _remember_result(self, agent_type: str, key: str, result: Any) -> None:
+        """Cache a copy of a successful agent result; hits are copied out too."""
+        cache = self._results.get(agent_type)
+        if cache is not None and not (isinstance(result, dict) and "error" in result):
+            cache.put(key, copy.deepcopy(result))
+    
+    def clear_cache(self) -> None:
+        """Drop all cached agent results."""
+        for cache in self._results.values():
+            cache.clear()
+    
+    def _run_agent_task(self, agent_type: str, *args) -> Dict[str, Any]:
+        """Dispatch a single agent task to its agent."""
         agent = self._get_or_create_agent(agent_type)
         
         # Extract kwargs if present
@@ -235,16 +516,21 @@ class TaskCoordinator:
             args = args[:-1]
         
         # Call appropriate method based on agent type
-        if agent_type == "stock_analyst":
-            return agent.analyze_stock(args[0])
-        elif agent_type == "crypto_analyst":
-            return agent.analyze_crypto(args[0], **kwargs)
-        elif agent_type == "technical":
-            return agent.analyze_technical(args[0])
-        elif agent_type == "fundamental":
-            return agent.analyze_fundamentals(args[0])
-        else:
-            raise ValueError(f"Unknown agent type: {agent_type}")
+        method = _registration(agent_type)[1]
+        return getattr(agent, method)(args[0], **kwargs)
+    
+    async def _arun_agent_task(self, agent_type: str, *args) -> Dict[str, Any]:
+        """Async variant of _run_agent_task, using the agents' async methods."""
+        agent = self._get_or_create_agent(agent_type)
+        
+        # Extract kwargs if present
+        kwargs = {}
+        if args and isinstance(args[-1], dict):
+            kwargs = args[-1]
+            args = args[:-1]
+        
+        method = _registration(agent_type)[2]
+        return await getattr(agent, method)(args[0], **kwargs)
     
     def _aggregate_stock_results(
         self,
@@ -254,7 +540,7 @@ class TaskCoordinator:
         """Aggregate results from multiple stock analysis agents."""
         aggregated = {
             "ticker": ticker,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now_iso(),
             "analyses": results,
             "summary": self._create_summary(results),
             "consensus": self._determine_consensus(results)
@@ -270,7 +556,7 @@ class TaskCoordinator:
         """Aggregate results from multiple crypto analysis agents."""
         aggregated = {
             "symbol": symbol,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now_iso(),
             "analyses": results,
             "summary": self._create_summary(results),
             "consensus": self._determine_consensus(results)
@@ -304,21 +590,16 @@ class TaskCoordinator:
             
             analysis = result.get("analysis", "")
             
-            # Simple keyword extraction (in production, use more sophisticated NLP)
-            if "BUY" in analysis.upper():
-                recommendations.append("BUY")
-            elif "SELL" in analysis.upper():
-                recommendations.append("SELL")
-            elif "HOLD" in analysis.upper():
-                recommendations.append("HOLD")
+            # Simple keyword vote in one pass (in production, use more
+            # sophisticated NLP); ties go to BUY, then SELL, then HOLD
+            tokens = _VOTE_RE.findall(analysis.upper())
+            if tokens:
+                recommendations.append(max(_VOTES, key=tokens.count))
             
             # Extract confidence if present
-            if "confidence" in analysis.lower():
-                # Try to extract number
-                import re
-                confidence_match = re.search(r'confidence[:\s]+(\d+)', analysis.lower())
-                if confidence_match:
-                    confidence_scores.append(int(confidence_match.group(1)))
+            confidence_match = _CONFIDENCE_RE.search(analysis)
+            if confidence_match:
+                confidence_scores.append(int(confidence_match.group(1)))
         
         # Determine consensus
         if not recommendations:
@@ -379,40 +660,50 @@ class TaskCoordinator:
         Returns:
             Batch analysis results
         """
-        results = {}
+        return run_sync(self.abatch_analyze(tickers, asset_type, analysis_type))
+    
+    async def abatch_analyze(
+        self,
+        tickers: List[str],
+        asset_type: str = "stock",
+        analysis_type: str = "comprehensive"
+    ) -> Dict[str, Any]:
+        """
+        Async variant of batch_analyze.
         
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            future_to_ticker = {}
-            
-            for ticker in tickers:
-                if asset_type == "stock":
-                    future = executor.submit(
-                        self.analyze_stock_comprehensive,
-                        ticker
-                    )
-                elif asset_type == "crypto":
-                    future = executor.submit(
-                        self.analyze_crypto_comprehensive,
-                        ticker
-                    )
-                else:
-                    continue
-                
-                future_to_ticker[future] = ticker
-            
-            for future in as_completed(future_to_ticker):
-                ticker = future_to_ticker[future]
-                try:
-                    result = future.result()
-                    results[ticker] = result
-                except Exception as e:
-                    print(f"Analysis failed for {ticker}: {e}")
-                    results[ticker] = {"error": str(e)}
+        At most max_workers tickers are analyzed at a time, and max_inflight
+        bounds their agent calls across the whole batch. Tickers are pulled
+        by max_workers workers as they free up, so a long list never holds
+        more than max_workers analyses in memory at once.
+        """
+        if asset_type == "stock":
+            analyze_one = self.aanalyze_stock_comprehensive
+        elif asset_type == "crypto":
+            analyze_one = self.aanalyze_crypto_comprehensive
+        else:
+            analyze_one = None
+        
+        # Pre-keyed so results keep input order whatever order they finish in
+        results = dict.fromkeys(tickers) if analyze_one else {}
+        pending = iter(results)
+        
+        async def worker() -> None:
+            # Workers share one iterator; the loop is single-threaded, so
+            # each ticker is handed out exactly once
+            for ticker in pending:
+                async with self._limit("asset"):
+                    try:
+                        results[ticker] = await analyze_one(ticker)
+                    except Exception as e:
+                        logger.warning("Analysis failed for %s: %s", ticker, e)
+                        results[ticker] = {"error": str(e)}
+        
+        await asyncio.gather(*[worker() for _ in range(min(self.max_workers, len(results)))])
         
         return {
             "batch_analysis": True,
             "asset_type": asset_type,
             "total_analyzed": len(results),
             "results": results,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now_iso()
         }
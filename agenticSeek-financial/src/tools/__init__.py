@@ -2,26 +2,39 @@
 
 from .stock_tools import (
     get_stock_price_tool,
+    get_stock_prices_batch_tool,
     get_financial_metrics_tool,
     get_technical_indicators_tool,
-    screen_stocks_tool
+    screen_stocks_tool,
+    aggregate_ticker_tool,
+    STOCK_TOOLS
 )
 from .crypto_tools import (
     get_crypto_price_tool,
     get_crypto_market_data_tool,
     get_onchain_metrics_tool,
-    get_top_cryptos_tool
+    get_top_cryptos_tool,
+    CRYPTO_TOOLS
 )
 
+# Every tool, shared so callers binding tools to a model don't rebuild the list
+ALL_TOOLS = STOCK_TOOLS + CRYPTO_TOOLS
+
 __all__ = [
     # Stock tools
     "get_stock_price_tool",
+    "get_stock_prices_batch_tool",
     "get_financial_metrics_tool",
     "get_technical_indicators_tool",
     "screen_stocks_tool",
+    "aggregate_ticker_tool",
     # Crypto tools
     "get_crypto_price_tool",
     "get_crypto_market_data_tool",
     "get_onchain_metrics_tool",
     "get_top_cryptos_tool",
+    # Tool collections
+    "STOCK_TOOLS",
+    "CRYPTO_TOOLS",
+    "ALL_TOOLS",
 ]
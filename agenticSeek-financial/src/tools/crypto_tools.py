@@ -1,13 +1,28 @@
 """LangChain-compatible tools for cryptocurrency analysis."""
 
+import asyncio
 from typing import Optional, Dict, Any
+import httpx
+import requests
 from langchain_core.tools import tool
 
 from ..mcp_clients import CryptoClient
+from ..utils import run_sync
 
 
-# Initialize client
-crypto_client = CryptoClient()
+# Network failures the clients let through become an error result the agent
+# can read; the transports have already retried them. Anything else is a bug
+# and propagates.
+_FETCH_ERRORS = (requests.exceptions.RequestException, httpx.HTTPError)
+
+
+# The client is built on first use (.shared() is memoized), so importing the
+# tools doesn't open a session or the on-disk cache. The old module-level
+# name still resolves through __getattr__.
+def __getattr__(name):
+    if name == "crypto_client":
+        return CryptoClient.shared()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 @tool
@@ -23,7 +38,7 @@ def get_crypto_price_tool(symbol: str, vs_currency: str = "usd") -> Dict[str, An
         Current price data including 24h and 7d changes
     """
     try:
-        price_data = crypto_client.get_crypto_price(symbol, vs_currency=vs_currency)
+        price_data = CryptoClient.shared().get_crypto_price(symbol, vs_currency=vs_currency)
         
         if not price_data:
             return {"error": f"No price data found for {symbol}"}
@@ -33,7 +48,7 @@ def get_crypto_price_tool(symbol: str, vs_currency: str = "usd") -> Dict[str, An
             "vs_currency": vs_currency,
             "price_data": price_data
         }
-    except Exception as e:
+    except _FETCH_ERRORS as e:
         return {"error": str(e)}
 
 
@@ -49,7 +64,7 @@ def get_crypto_market_data_tool(symbol: str) -> Dict[str, Any]:
         Market data including market cap, volume, supply, rank
     """
     try:
-        market_data = crypto_client.get_market_data(symbol)
+        market_data = CryptoClient.shared().get_market_data(symbol)
         
         if not market_data:
             return {"error": f"No market data found for {symbol}"}
@@ -58,7 +73,7 @@ def get_crypto_market_data_tool(symbol: str) -> Dict[str, Any]:
             "symbol": symbol,
             "market_data": market_data
         }
-    except Exception as e:
+    except _FETCH_ERRORS as e:
         return {"error": str(e)}
 
 
@@ -80,21 +95,18 @@ def get_crypto_ohlcv_tool(
         OHLCV data
     """
     try:
-        ohlcv_data = crypto_client.get_crypto_ohlcv(symbol, interval=interval)
+        ohlcv_data = CryptoClient.shared().get_crypto_ohlcv(symbol, interval=interval, limit=limit)
         
         if not ohlcv_data:
             return {"error": f"No OHLCV data found for {symbol}"}
         
-        # Limit results
-        limited_data = ohlcv_data[:limit] if len(ohlcv_data) > limit else ohlcv_data
-        
         return {
             "symbol": symbol,
             "interval": interval,
-            "data_points": len(limited_data),
-            "ohlcv": limited_data
+            "data_points": len(ohlcv_data),
+            "ohlcv": ohlcv_data
         }
-    except Exception as e:
+    except _FETCH_ERRORS as e:
         return {"error": str(e)}
 
 
@@ -111,14 +123,14 @@ def get_top_cryptos_tool(limit: int = 20, sort_by: str = "market_cap") -> Dict[s
         List of top cryptocurrencies
     """
     try:
-        cryptos = crypto_client.get_top_cryptocurrencies(limit=limit, sort_by=sort_by)
+        cryptos = CryptoClient.shared().get_top_cryptocurrencies(limit=limit, sort_by=sort_by)
         
         return {
             "sort_by": sort_by,
             "count": len(cryptos),
             "cryptocurrencies": cryptos
         }
-    except Exception as e:
+    except _FETCH_ERRORS as e:
         return {"error": str(e)}
 
 
@@ -134,7 +146,7 @@ def get_onchain_metrics_tool(symbol: str) -> Dict[str, Any]:
         On-chain metrics including active addresses, transaction count, network activity
     """
     try:
-        metrics = crypto_client.get_on_chain_metrics(symbol)
+        metrics = CryptoClient.shared().get_on_chain_metrics(symbol)
         
         if not metrics:
             return {"error": f"No on-chain metrics found for {symbol}"}
@@ -143,7 +155,7 @@ def get_onchain_metrics_tool(symbol: str) -> Dict[str, Any]:
             "symbol": symbol,
             "onchain_metrics": metrics
         }
-    except Exception as e:
+    except _FETCH_ERRORS as e:
         return {"error": str(e)}
 
 
@@ -159,7 +171,7 @@ def get_defi_metrics_tool(protocol: str) -> Dict[str, Any]:
         DeFi metrics including TVL, volume, revenue
     """
     try:
-        metrics = crypto_client.get_defi_metrics(protocol)
+        metrics = CryptoClient.shared().get_defi_metrics(protocol)
         
         if not metrics:
             return {"error": f"No DeFi metrics found for {protocol}"}
@@ -168,7 +180,7 @@ def get_defi_metrics_tool(protocol: str) -> Dict[str, Any]:
             "protocol": protocol,
             "defi_metrics": metrics
         }
-    except Exception as e:
+    except _FETCH_ERRORS as e:
         return {"error": str(e)}
 
 
@@ -181,7 +193,7 @@ def get_fear_greed_index_tool() -> Dict[str, Any]:
         Fear & Greed Index value and classification
     """
     try:
-        index = crypto_client.get_fear_greed_index()
+        index = CryptoClient.shared().get_fear_greed_index()
         
         if not index:
             return {"error": "Failed to fetch Fear & Greed Index"}
@@ -189,7 +201,7 @@ def get_fear_greed_index_tool() -> Dict[str, Any]:
         return {
             "fear_greed_index": index
         }
-    except Exception as e:
+    except _FETCH_ERRORS as e:
         return {"error": str(e)}
 
 
@@ -206,14 +218,14 @@ def get_crypto_news_tool(symbol: str, limit: int = 10) -> Dict[str, Any]:
         Recent news articles
     """
     try:
-        news = crypto_client.get_crypto_news(symbol, limit=limit)
+        news = CryptoClient.shared().get_crypto_news(symbol, limit=limit)
         
         return {
             "symbol": symbol,
             "count": len(news),
             "news": news
         }
-    except Exception as e:
+    except _FETCH_ERRORS as e:
         return {"error": str(e)}
 
 
@@ -229,14 +241,14 @@ def get_crypto_exchanges_tool(symbol: str) -> Dict[str, Any]:
         List of exchanges where the crypto is traded
     """
     try:
-        exchanges = crypto_client.get_crypto_exchanges(symbol)
+        exchanges = CryptoClient.shared().get_crypto_exchanges(symbol)
         
         return {
             "symbol": symbol,
             "exchange_count": len(exchanges),
             "exchanges": exchanges
         }
-    except Exception as e:
+    except _FETCH_ERRORS as e:
         return {"error": str(e)}
 
 
@@ -252,20 +264,42 @@ def compare_cryptos_tool(symbols: list[str]) -> Dict[str, Any]:
         Comparison data for the cryptocurrencies
     """
     try:
-        comparison = {}
-        
-        for symbol in symbols:
-            price_data = crypto_client.get_crypto_price(symbol)
-            market_data = crypto_client.get_market_data(symbol)
-            
-            comparison[symbol] = {
-                "price": price_data,
-                "market": market_data
-            }
+        comparison = run_sync(_acompare_cryptos(symbols))
         
         return {
             "symbols": symbols,
             "comparison": comparison
         }
-    except Exception as e:
+    except _FETCH_ERRORS as e:
         return {"error": str(e)}
+
+
+async def _acompare_cryptos(symbols: list[str]) -> Dict[str, Any]:
+    """Fetch price and market data for every symbol concurrently."""
+    prices, markets = await asyncio.gather(
+        asyncio.gather(*[CryptoClient.shared().aget_crypto_price(symbol) for symbol in symbols]),
+        asyncio.gather(*[CryptoClient.shared().aget_market_data(symbol) for symbol in symbols])
+    )
+    
+    return {
+        symbol: {
+            "price": price_data,
+            "market": market_data
+        }
+        for symbol, price_data, market_data in zip(symbols, prices, markets)
+    }
+
+
+# Every cryptocurrency tool, built once at import for binding to a model
+CRYPTO_TOOLS = (
+    get_crypto_price_tool,
+    get_crypto_market_data_tool,
+    get_crypto_ohlcv_tool,
+    get_top_cryptos_tool,
+    get_onchain_metrics_tool,
+    get_defi_metrics_tool,
+    get_fear_greed_index_tool,
+    get_crypto_news_tool,
+    get_crypto_exchanges_tool,
+    compare_cryptos_tool,
+)
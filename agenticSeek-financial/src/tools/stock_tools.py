@@ -1,6 +1,9 @@
 """LangChain-compatible tools for stock analysis."""
 
-from typing import Optional, Dict, Any
+import asyncio
+from typing import Optional, Dict, List, Any
+import httpx
+import requests
 from langchain_core.tools import tool
 
 from ..mcp_clients import (
@@ -9,13 +12,43 @@ from ..mcp_clients import (
     StockScreenClient,
     StockFlowClient
 )
+from ..mcp_clients.schemas import BalanceSheet, CashFlowStatement, IncomeStatement
+from ..utils import run_sync
 
 
-# Initialize clients
-financial_client = FinancialDatasetsClient()
-tradingview_client = TradingViewClient()
-stockscreen_client = StockScreenClient()
-stockflow_client = StockFlowClient()
+# Network failures the clients let through become an error result the agent
+# can read; the transports have already retried them. Anything else is a bug
+# and propagates.
+_FETCH_ERRORS = (requests.exceptions.RequestException, httpx.HTTPError)
+
+
+# Bars of history the price tools return, and the fields of the newest one
+# surfaced at the top level
+_PRICE_HISTORY = 30
+_LATEST_FIELDS = ("open", "high", "low", "volume", "date")
+
+# Statement line items the tools hand back: the ones the schemas document as
+# read by the agents, rather than every GAAP field the API returns
+_INCOME_FIELDS = tuple(IncomeStatement.__annotations__)
+_BALANCE_FIELDS = tuple(BalanceSheet.__annotations__)
+_CASH_FLOW_FIELDS = tuple(CashFlowStatement.__annotations__)
+
+
+# Clients are built on first use (each .shared() is memoized), so importing
+# the tools doesn't open sessions or the on-disk cache. The old module-level
+# names still resolve through __getattr__.
+_CLIENTS = {
+    "financial_client": FinancialDatasetsClient,
+    "tradingview_client": TradingViewClient,
+    "stockscreen_client": StockScreenClient,
+    "stockflow_client": StockFlowClient,
+}
+
+
+def __getattr__(name):
+    if name in _CLIENTS:
+        return _CLIENTS[name].shared()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 @tool
@@ -31,25 +64,34 @@ def get_stock_price_tool(ticker: str, interval: str = "day") -> Dict[str, Any]:
         Price data including current price, historical prices, and changes
     """
     try:
-        prices = financial_client.get_prices(ticker, interval=interval)
-        
-        if not prices:
-            return {"error": f"No price data found for {ticker}"}
-        
-        # Get latest price
-        latest = prices[0] if prices else {}
+        prices = FinancialDatasetsClient.shared().get_prices(ticker, interval=interval, limit=_PRICE_HISTORY)
+        return _price_payload(ticker, prices)
+    except _FETCH_ERRORS as e:
+        return {"error": str(e)}
+
+
+@tool
+def get_stock_prices_batch_tool(tickers: List[str], interval: str = "day") -> Dict[str, Any]:
+    """
+    Get current and historical price data for several stocks in one call.
+    
+    Prefer this over calling get_stock_price_tool once per ticker.
+    
+    Args:
+        tickers: Stock ticker symbols (e.g., ["AAPL", "MSFT"])
+        interval: Time interval ("minute", "hour", "day", "week", "month")
+    
+    Returns:
+        Price data per ticker, as get_stock_price_tool returns it
+    """
+    try:
+        prices = FinancialDatasetsClient.shared().get_prices_many(tickers, interval=interval, limit=_PRICE_HISTORY)
         
         return {
-            "ticker": ticker,
-            "current_price": latest.get("close"),
-            "open": latest.get("open"),
-            "high": latest.get("high"),
-            "low": latest.get("low"),
-            "volume": latest.get("volume"),
-            "date": latest.get("date"),
-            "historical_data": prices[:30]  # Last 30 data points
+            "interval": interval,
+            "prices": {ticker: _price_payload(ticker, bars) for ticker, bars in prices.items()}
         }
-    except Exception as e:
+    except _FETCH_ERRORS as e:
         return {"error": str(e)}
 
 
@@ -66,7 +108,7 @@ def get_financial_metrics_tool(ticker: str, period: str = "ttm") -> Dict[str, An
         Financial metrics including P/E, ROE, debt ratios, margins, etc.
     """
     try:
-        metrics = financial_client.get_financial_metrics(ticker, period=period, limit=1)
+        metrics = FinancialDatasetsClient.shared().get_financial_metrics(ticker, period=period, limit=1)
         
         if not metrics:
             return {"error": f"No financial metrics found for {ticker}"}
@@ -76,7 +118,7 @@ def get_financial_metrics_tool(ticker: str, period: str = "ttm") -> Dict[str, An
             "period": period,
             "metrics": metrics[0]
         }
-    except Exception as e:
+    except _FETCH_ERRORS as e:
         return {"error": str(e)}
 
 
@@ -94,7 +136,9 @@ def get_income_statement_tool(ticker: str, period: str = "annual", limit: int =
         Income statement data including revenue, expenses, and net income
     """
     try:
-        statements = financial_client.get_income_statement(ticker, period=period, limit=limit)
+        statements = FinancialDatasetsClient.shared().get_income_statement(
+            ticker, period=period, limit=limit, fields=_INCOME_FIELDS
+        )
         
         if not statements:
             return {"error": f"No income statement data found for {ticker}"}
@@ -104,7 +148,7 @@ def get_income_statement_tool(ticker: str, period: str = "annual", limit: int =
             "period": period,
             "statements": statements
         }
-    except Exception as e:
+    except _FETCH_ERRORS as e:
         return {"error": str(e)}
 
 
@@ -122,7 +166,9 @@ def get_balance_sheet_tool(ticker: str, period: str = "annual", limit: int = 3)
         Balance sheet data including assets, liabilities, and equity
     """
     try:
-        sheets = financial_client.get_balance_sheet(ticker, period=period, limit=limit)
+        sheets = FinancialDatasetsClient.shared().get_balance_sheet(
+            ticker, period=period, limit=limit, fields=_BALANCE_FIELDS
+        )
         
         if not sheets:
             return {"error": f"No balance sheet data found for {ticker}"}
@@ -132,7 +178,7 @@ def get_balance_sheet_tool(ticker: str, period: str = "annual", limit: int = 3)
             "period": period,
             "balance_sheets": sheets
         }
-    except Exception as e:
+    except _FETCH_ERRORS as e:
         return {"error": str(e)}
 
 
@@ -150,7 +196,9 @@ def get_cash_flow_tool(ticker: str, period: str = "annual", limit: int = 3) -> D
         Cash flow data including operating, investing, and financing cash flows
     """
     try:
-        statements = financial_client.get_cash_flow_statement(ticker, period=period, limit=limit)
+        statements = FinancialDatasetsClient.shared().get_cash_flow_statement(
+            ticker, period=period, limit=limit, fields=_CASH_FLOW_FIELDS
+        )
         
         if not statements:
             return {"error": f"No cash flow data found for {ticker}"}
@@ -160,7 +208,7 @@ def get_cash_flow_tool(ticker: str, period: str = "annual", limit: int = 3) -> D
             "period": period,
             "cash_flows": statements
         }
-    except Exception as e:
+    except _FETCH_ERRORS as e:
         return {"error": str(e)}
 
 
@@ -177,8 +225,7 @@ def get_technical_indicators_tool(ticker: str, interval: str = "1D") -> Dict[str
         Technical indicators including RSI, MACD, moving averages, etc.
     """
     try:
-        indicators = tradingview_client.get_technical_indicators(ticker, interval=interval)
-        summary = tradingview_client.get_technical_summary(ticker, interval=interval)
+        indicators, summary = run_sync(_atechnical_indicators(ticker, interval))
         
         return {
             "ticker": ticker,
@@ -186,7 +233,7 @@ def get_technical_indicators_tool(ticker: str, interval: str = "1D") -> Dict[str
             "indicators": indicators,
             "summary": summary
         }
-    except Exception as e:
+    except _FETCH_ERRORS as e:
         return {"error": str(e)}
 
 
@@ -203,14 +250,14 @@ def get_support_resistance_tool(ticker: str, interval: str = "1D") -> Dict[str,
         Support and resistance levels
     """
     try:
-        levels = tradingview_client.get_support_resistance(ticker, interval=interval)
+        levels = TradingViewClient.shared().get_support_resistance(ticker, interval=interval)
         
         return {
             "ticker": ticker,
             "interval": interval,
             "levels": levels
         }
-    except Exception as e:
+    except _FETCH_ERRORS as e:
         return {"error": str(e)}
 
 
@@ -219,7 +266,8 @@ def screen_stocks_tool(
     min_market_cap: Optional[float] = None,
     max_pe_ratio: Optional[float] = None,
     min_revenue_growth: Optional[float] = None,
-    limit: int = 20
+    limit: int = 20,
+    enrich: bool = False
 ) -> Dict[str, Any]:
     """
     Screen stocks based on fundamental criteria.
@@ -229,6 +277,8 @@ def screen_stocks_tool(
         max_pe_ratio: Maximum P/E ratio
         min_revenue_growth: Minimum revenue growth percentage
         limit: Maximum number of results
+        enrich: Attach each hit's latest TTM financial metrics, fetched
+            concurrently, so they needn't be looked up one by one afterwards
     
     Returns:
         List of stocks matching the criteria
@@ -243,14 +293,16 @@ def screen_stocks_tool(
         if min_revenue_growth:
             criteria["revenue_growth"] = {"min": min_revenue_growth}
         
-        stocks = stockscreen_client.screen_stocks(criteria, limit=limit)
+        stocks = StockScreenClient.shared().screen_stocks(criteria, limit=limit)
+        if enrich:
+            stocks = run_sync(_aenrich_with_metrics(stocks))
         
         return {
             "criteria": criteria,
             "count": len(stocks),
             "stocks": stocks
         }
-    except Exception as e:
+    except _FETCH_ERRORS as e:
         return {"error": str(e)}
 
 
@@ -266,13 +318,13 @@ def get_volume_analysis_tool(ticker: str) -> Dict[str, Any]:
         Volume analysis including trends and unusual activity
     """
     try:
-        volume_data = stockflow_client.get_volume_analysis(ticker)
+        volume_data = StockFlowClient.shared().get_volume_analysis(ticker)
         
         return {
             "ticker": ticker,
             "volume_analysis": volume_data
         }
-    except Exception as e:
+    except _FETCH_ERRORS as e:
         return {"error": str(e)}
 
 
@@ -289,14 +341,14 @@ def get_insider_trades_tool(ticker: str, limit: int = 20) -> Dict[str, Any]:
         Recent insider trades
     """
     try:
-        trades = financial_client.get_insider_trades(ticker, limit=limit)
+        trades = FinancialDatasetsClient.shared().get_insider_trades(ticker, limit=limit)
         
         return {
             "ticker": ticker,
             "insider_trades": trades,
             "count": len(trades)
         }
-    except Exception as e:
+    except _FETCH_ERRORS as e:
         return {"error": str(e)}
 
 
@@ -312,11 +364,102 @@ def get_company_facts_tool(ticker: str) -> Dict[str, Any]:
         Company facts including name, sector, industry, description
     """
     try:
-        facts = financial_client.get_company_facts(ticker)
+        facts = FinancialDatasetsClient.shared().get_company_facts(ticker)
         
         return {
             "ticker": ticker,
             "company_facts": facts
         }
-    except Exception as e:
+    except _FETCH_ERRORS as e:
         return {"error": str(e)}
+
+
+@tool
+def aggregate_ticker_tool(ticker: str) -> Dict[str, Any]:
+    """
+    Get every dataset for a stock in one call, fetched concurrently.
+    
+    Covers prices, financial metrics, income statements, balance sheets,
+    cash flows, insider trades, company facts, technical summary and
+    volume analysis.
+    
+    Args:
+        ticker: Stock ticker symbol
+    
+    Returns:
+        All datasets for the ticker; any that failed to load is empty
+    """
+    try:
+        return run_sync(_aaggregate_ticker(ticker))
+    except _FETCH_ERRORS as e:
+        return {"error": str(e)}
+
+
+def _price_payload(ticker: str, prices: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Price tool result for one ticker's bars, newest first."""
+    if not prices:
+        return {"error": f"No price data found for {ticker}"}
+    
+    latest = prices[0]
+    
+    return {
+        "ticker": ticker,
+        "current_price": latest.get("close"),
+        **{field: latest.get(field) for field in _LATEST_FIELDS},
+        "historical_data": prices
+    }
+
+
+async def _atechnical_indicators(ticker: str, interval: str) -> tuple:
+    """Fetch indicators and summary concurrently."""
+    return await asyncio.gather(
+        TradingViewClient.shared().aget_technical_indicators(ticker, interval=interval),
+        TradingViewClient.shared().aget_technical_summary(ticker, interval=interval)
+    )
+
+
+async def _aenrich_with_metrics(stocks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Copy each screened stock with its latest TTM metrics, fetched concurrently."""
+    client = FinancialDatasetsClient.shared()
+    metrics = await asyncio.gather(*[
+        client.aget_financial_metrics(stock["ticker"], period="ttm", limit=1)
+        for stock in stocks
+    ])
+    return [
+        {**stock, "metrics": rows[0] if rows else None}
+        for stock, rows in zip(stocks, metrics)
+    ]
+
+
+async def _aaggregate_ticker(ticker: str) -> Dict[str, Any]:
+    """Fetch all per-ticker datasets from every client concurrently."""
+    datasets, technical_summary, volume_analysis = await asyncio.gather(
+        FinancialDatasetsClient.shared().aprefetch(ticker),
+        TradingViewClient.shared().aget_technical_summary(ticker),
+        StockFlowClient.shared().aget_volume_analysis(ticker)
+    )
+    
+    return {
+        "ticker": ticker,
+        **datasets,
+        "technical_summary": technical_summary,
+        "volume_analysis": volume_analysis
+    }
+
+
+# Every stock tool, built once at import for binding to a model
+STOCK_TOOLS = (
+    get_stock_price_tool,
+    get_stock_prices_batch_tool,
+    get_financial_metrics_tool,
+    get_income_statement_tool,
+    get_balance_sheet_tool,
+    get_cash_flow_tool,
+    get_technical_indicators_tool,
+    get_support_resistance_tool,
+    screen_stocks_tool,
+    get_volume_analysis_tool,
+    get_insider_trades_tool,
+    get_company_facts_tool,
+    aggregate_ticker_tool,
+)
@@ -0,0 +1,17 @@
+"""Shared utilities."""
+
+from . import fastjson
+from .aio import install_uvloop, iter_sync, run_in_background, run_sync
+from .clock import now_iso
+from .tickers import normalize_ticker, normalize_tickers
+
+__all__ = [
+    "fastjson",
+    "install_uvloop",
+    "iter_sync",
+    "normalize_ticker",
+    "normalize_tickers",
+    "now_iso",
+    "run_in_background",
+    "run_sync",
+]
@@ -0,0 +1,123 @@
+"""Event loop helpers."""
+
+import asyncio
+import concurrent.futures
+import threading
+from typing import Any, AsyncIterator, Coroutine, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Long-lived loop that runs the agents' coroutines for sync callers
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def install_uvloop() -> bool:
+    """
+    Use uvloop's libuv-based event loop for asyncio when it is installed.
+    
+    Affects every loop created afterwards, including the one run_sync uses
+    for the agents' async fan-out. uvloop is optional (and unavailable on Windows).
+    
+    Returns:
+        True if uvloop was installed
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    """Get the shared background event loop, starting it on first use."""
+    global _loop
+    
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="agent-event-loop", daemon=True).start()
+            _loop = loop
+    return _loop
+
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Run a coroutine to completion from synchronous code.
+    
+    Unlike asyncio.run, which builds and tears down a loop per call, every
+    call shares one persistent loop on a daemon thread. Loop-bound resources
+    (pooled httpx clients, LLM pool semaphores) therefore survive between
+    calls, and calls from several threads run concurrently on that loop.
+    
+    Args:
+        coro: Coroutine to run
+        
+    Returns:
+        The coroutine's result
+        
+    Raises:
+        RuntimeError: If called from a thread with a running event loop;
+            await the async variant there instead
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run_coroutine_threadsafe(coro, _background_loop()).result()
+    
+    coro.close()
+    raise RuntimeError("run_sync() called from a running event loop; await the coroutine instead")
+
+
+def run_in_background(coro: Coroutine[Any, Any, T]) -> "concurrent.futures.Future[T]":
+    """
+    Start a coroutine on run_sync's shared loop without waiting for it.
+    
+    For fire-and-forget work whose loop-bound resources later run_sync calls
+    should find ready, such as warmed connection pools.
+    
+    Args:
+        coro: Coroutine to run
+        
+    Returns:
+        Future for the coroutine's result
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _background_loop())
+
+
+def iter_sync(agen: AsyncIterator[T]) -> Iterator[T]:
+    """
+    Iterate an async generator from synchronous code.
+    
+    Each item is produced on run_sync's shared background loop, so the
+    generator's loop-bound resources behave exactly as under run_sync.
+    Stopping iteration early closes the generator.
+    
+    Args:
+        agen: Async generator to drain
+        
+    Yields:
+        The generator's items, as they are produced
+        
+    Raises:
+        RuntimeError: If called from a thread with a running event loop;
+            use async for there instead
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        raise RuntimeError("iter_sync() called from a running event loop; use async for instead")
+    
+    loop = _background_loop()
+    try:
+        while True:
+            try:
+                yield asyncio.run_coroutine_threadsafe(agen.__anext__(), loop).result()
+            except StopAsyncIteration:
+                return
+    finally:
+        asyncio.run_coroutine_threadsafe(agen.aclose(), loop).result()
@@ -0,0 +1,20 @@
+"""Wall-clock timestamps for result payloads."""
+
+import functools
+import time
+from datetime import datetime
+
+
+@functools.lru_cache(maxsize=1)
+def _now_iso(second: int) -> str:
+    return datetime.fromtimestamp(second).isoformat(timespec="seconds")
+
+
+def now_iso() -> str:
+    """
+    Current local time as an ISO 8601 string, to the second.
+    
+    Rendered at most once a second, since a batch stamps every agent result
+    and aggregate with effectively the same time.
+    """
+    return _now_iso(int(time.time()))
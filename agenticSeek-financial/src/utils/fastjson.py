@@ -0,0 +1,139 @@
+"""
+JSON encoding with orjson when it is installed.
+
+orjson serializes straight to UTF-8 bytes and is several times faster than the
+stdlib on the nested result dicts produced by the agents. The stdlib json
+module is used as a fallback so orjson stays optional.
+"""
+
+import codecs
+import json
+import re
+from typing import Any, Iterable, Iterator
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
+# What may follow a number's prefix and still be part of the number
+_NUMBER_TAIL = re.compile(r"[0-9.eE+-]*\Z")
+
+
+def dumps(obj: Any, indent: bool = False, sort_keys: bool = False) -> bytes:
+    """
+    Serialize obj to UTF-8 JSON bytes.
+    
+    Values JSON can't represent natively (datetimes, numpy scalars, enums, ...)
+    are converted with str().
+    
+    Args:
+        obj: Object to serialize
+        indent: Pretty-print with two-space indentation
+        sort_keys: Emit dict keys in sorted order, for stable hashing
+        
+    Returns:
+        Encoded JSON
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=str, option=option)
+    
+    return json.dumps(
+        obj, default=str, indent=2 if indent else None, sort_keys=sort_keys, ensure_ascii=False
+    ).encode("utf-8")
+
+
+def loads(data: Any) -> Any:
+    """Deserialize JSON from str or bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def iter_items(chunks: Iterable[bytes], key: str) -> Iterator[Any]:
+    """
+    Lazily yield the elements of a top-level array field of a streamed object.
+    
+    Only one element is held decoded at a time, so very long arrays (a year
+    of minute bars) never materialize as a single list. Other top-level
+    fields are decoded and discarded.
+    
+    Args:
+        chunks: UTF-8 encoded pieces of a JSON object, e.g. a streamed body
+        key: Name of the array field to iterate
+        
+    Raises:
+        ValueError: If the stream is not a JSON object or is truncated
+    """
+    chunks = iter(chunks)
+    text = codecs.getincrementaldecoder("utf-8")()
+    decoder = json.JSONDecoder()
+    buf, pos, eof = "", 0, False
+    
+    def more() -> None:
+        nonlocal buf, pos, eof
+        if eof:
+            raise ValueError("Truncated JSON stream")
+        chunk = next(chunks, None)
+        eof = chunk is None
+        buf = buf[pos:] + text.decode(chunk or b"", final=eof)
+        pos = 0
+    
+    def peek() -> str:
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n":
+                pos += 1
+            if pos < len(buf):
+                return buf[pos]
+            more()
+    
+    def value() -> Any:
+        nonlocal pos
+        peek()
+        while True:
+            try:
+                obj, end = decoder.raw_decode(buf, pos)
+                # A number cut at the buffer edge ("12" of "123", "1." of
+                # "1.5") decodes as a shorter one, so wait for more
+                number = isinstance(obj, (int, float)) and not isinstance(obj, bool)
+                if eof or not (number and _NUMBER_TAIL.match(buf, end)):
+                    pos = end
+                    return obj
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            more()
+    
+    if peek() != "{":
+        raise ValueError("Expected a JSON object")
+    pos += 1
+    while True:
+        char = peek()
+        if char == "}":
+            return
+        if char == ",":
+            pos += 1
+            continue
+        name = value()
+        if peek() != ":":
+            raise ValueError("Expected ':' after object key")
+        pos += 1
+        if name != key or peek() != "[":
+            value()
+            continue
+        pos += 1
+        while True:
+            char = peek()
+            if char == "]":
+                pos += 1
+                break
+            if char == ",":
+                pos += 1
+                continue
+            yield value()
@@ -0,0 +1,36 @@
+"""Ticker symbol normalization."""
+
+import re
+from typing import Iterable, List
+
+# Exchange tickers: letters/digits with optional class or venue suffix (BRK.B, RDS-A)
+TICKER_PATTERN = re.compile(r"^[A-Z0-9.\-]{1,10}$")
+
+
+def normalize_ticker(ticker: str) -> str:
+    """
+    Strip and upper-case a ticker, validating its shape.
+    
+    Args:
+        ticker: Raw ticker symbol
+    
+    Returns:
+        Normalized ticker
+    
+    Raises:
+        ValueError: If the ticker is not a plausible symbol
+    """
+    normalized = ticker.strip().upper()
+    if not TICKER_PATTERN.match(normalized):
+        raise ValueError(f"Invalid ticker symbol: {ticker!r}")
+    return normalized
+
+
+def normalize_tickers(tickers: Iterable[str]) -> List[str]:
+    """
+    Normalize a batch of tickers once, before fanning out work per ticker.
+    
+    Raises:
+        ValueError: On the first invalid ticker
+    """
+    return [normalize_ticker(ticker) for ticker in tickers]
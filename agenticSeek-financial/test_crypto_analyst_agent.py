@@ -0,0 +1,99 @@
+"""Tests for the crypto agent's batch comparison."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.agents.crypto_analyst_agent import CryptoAnalystAgent, _compile_section_formatter
+from src.llm.generative_cache import response_cache
+
+
+class FakeLLM:
+    """Answers every prompt with the same reply, counting calls."""
+    
+    def __init__(self, content):
+        self.content = content
+        self.calls = 0
+    
+    async def ainvoke(self, messages):
+        self.calls += 1
+        return SimpleNamespace(content=self.content)
+
+
+def comparing_agent(content):
+    """Agent wired to a FakeLLM and canned market data."""
+    agent = CryptoAnalystAgent.__new__(CryptoAnalystAgent)
+    agent.llm = FakeLLM(content)
+    agent.model_name = "fake"
+    agent.system_prompt = "You compare cryptos."
+    agent._format_section = _compile_section_formatter("openai")
+    agent._recent_analysis = lambda symbol: None
+    
+    async def gather_many(symbols, include_onchain=True):
+        return {symbol: {"price": {"price": 0.5}} for symbol in symbols}
+    
+    agent._agather_many = gather_many
+    return agent
+
+
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    response_cache.clear()
+    yield
+    response_cache.clear()
+
+
+@pytest.fixture
+def agent():
+    # Parsing needs no LLM or data clients
+    return CryptoAnalystAgent.__new__(CryptoAnalystAgent)
+
+
+def test_parses_object_wrapped_in_prose(agent):
+    content = 'Here is the analysis:\n```json\n{"analyses": [{"symbol": "BTC"}], "ranking": ["BTC"]}\n```'
+    
+    assert agent._parse_batch_analysis(content) == {"analyses": [{"symbol": "BTC"}], "ranking": ["BTC"]}
+
+
+@pytest.mark.parametrize("content", [
+    "",
+    "No JSON here",
+    "} backwards {",
+    '{"analyses": [{"symbol": "BTC"},',
+    '{"analyses": [{"symbol": "BTC"}] trailing }',
+    '{"analyses": {"symbol": "BTC"}}',
+    '{"ranking": ["BTC"]}',
+])
+def test_malformed_reply_is_none(agent, content):
+    assert agent._parse_batch_analysis(content) is None
+
+
+def test_non_list_ranking_is_dropped():
+    agent = comparing_agent('{"analyses": [{"symbol": "BTC", "recommendation": "BUY"}], "ranking": "BTC, ETH"}')
+    
+    result = agent.compare_cryptos(["BTC", "ETH"])
+    
+    assert result["ranking"] == []
+    assert result["comparison"] == ""
+    assert result["cryptos"][0]["recommendation"] == "BUY"
+
+
+def test_repeat_comparison_is_cached():
+    agent = comparing_agent('{"analyses": [], "ranking": ["ETH", "BTC"], "rationale": "r"}')
+    
+    first = agent.compare_cryptos(["BTC", "ETH"])
+    second = agent.compare_cryptos(["BTC", "ETH"])
+    
+    assert agent.llm.calls == 1
+    assert first["comparison"] == second["comparison"] == "Ranking: ETH, BTC\n\nr"
+
+
+def test_unparseable_reply_is_not_cached():
+    agent = comparing_agent("I'd rather not use JSON.")
+    
+    agent.compare_cryptos(["BTC"])
+    result = agent.compare_cryptos(["BTC"])
+    
+    assert agent.llm.calls == 2
+    assert result["comparison"] == "I'd rather not use JSON."
+    assert result["ranking"] == []
@@ -0,0 +1,38 @@
+"""Tests for the streaming JSON helpers."""
+
+import pytest
+
+from src.utils import fastjson
+
+BODY = '{"meta": {"n": 3}, "bars": [1.5, -2e3, {"p": "café", "ok": true}, 123], "next": null}'.encode("utf-8")
+BARS = [1.5, -2000.0, {"p": "café", "ok": True}, 123]
+
+
+def test_iter_items_whole_body():
+    assert list(fastjson.iter_items([BODY], "bars")) == BARS
+
+
+@pytest.mark.parametrize("cut", range(1, len(BODY)))
+def test_iter_items_split_anywhere(cut):
+    # Cuts land inside keys, numbers, literals and the multi-byte character
+    assert list(fastjson.iter_items([BODY[:cut], BODY[cut:]], "bars")) == BARS
+
+
+def test_iter_items_byte_at_a_time():
+    chunks = [BODY[i:i + 1] for i in range(len(BODY))]
+    
+    assert list(fastjson.iter_items(chunks, "bars")) == BARS
+
+
+def test_iter_items_missing_key_yields_nothing():
+    assert list(fastjson.iter_items([BODY], "missing")) == []
+
+
+def test_iter_items_truncated_stream():
+    with pytest.raises(ValueError):
+        list(fastjson.iter_items([BODY[:40]], "bars"))
+
+
+def test_iter_items_non_object():
+    with pytest.raises(ValueError):
+        list(fastjson.iter_items([b"[1, 2]"], "bars"))
@@ -0,0 +1,52 @@
+"""Tests for the SQLite HTTP response cache."""
+
+import sqlite3
+import time
+
+from src.mcp_clients.http_cache import HTTPCache
+
+
+class LockedConnection:
+    """Stands in for a connection whose database another process has locked."""
+    
+    def execute(self, *args):
+        raise sqlite3.OperationalError("database is locked")
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+
+
+def test_hit_and_miss():
+    cache = HTTPCache(":memory:")
+    cache.set("k", {"a": [1, 2]}, ttl=60)
+    
+    assert cache.get("k") == {"a": [1, 2]}
+    assert cache.get("missing") is None
+
+
+def test_expired_entry_is_a_miss_unless_stale_allowed():
+    cache = HTTPCache(":memory:")
+    cache.set("k", {"a": 1}, ttl=60)
+    with cache._lock, cache._conn:
+        cache._conn.execute("UPDATE responses SET expires_at = ?", (time.time() - 1,))
+    
+    assert cache.get("k") is None
+    assert cache.get("k", allow_stale=True) == {"a": 1}
+
+
+def test_non_positive_ttl_is_not_stored():
+    cache = HTTPCache(":memory:")
+    cache.set("k", {"a": 1}, ttl=0)
+    
+    assert cache.get("k") is None
+
+
+def test_sqlite_errors_are_misses():
+    cache = HTTPCache(":memory:")
+    cache._conn = LockedConnection()
+    
+    cache.set("k", {"a": 1}, ttl=60)
+    assert cache.get("k") is None
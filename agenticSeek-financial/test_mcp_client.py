@@ -0,0 +1,162 @@
+"""Tests for the shared MCP client plumbing, against a fake transport."""
+
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+
+from src.mcp_clients.base import BaseMCPClient
+from src.mcp_clients.http_cache import HTTPCache
+
+
+class FakeAdapter(BaseAdapter):
+    """Transport that answers every request with the next queued outcome."""
+    
+    def __init__(self, *outcomes):
+        super().__init__()
+        self.outcomes = list(outcomes)
+        self.requests = []
+    
+    def send(self, request, **kwargs):
+        self.requests.append(request)
+        outcome = self.outcomes.pop(0) if len(self.outcomes) > 1 else self.outcomes[0]
+        if isinstance(outcome, Exception):
+            raise outcome
+        response = requests.Response()
+        response.status_code = 200
+        response.headers["Content-Type"] = "application/json"
+        response._content = outcome
+        response.request = request
+        response.url = request.url
+        return response
+    
+    def close(self):
+        pass
+
+
+class BlockingAdapter(FakeAdapter):
+    """FakeAdapter whose responses wait until release is set."""
+    
+    def __init__(self, *outcomes):
+        super().__init__(*outcomes)
+        self.entered = threading.Event()
+        self.release = threading.Event()
+    
+    def send(self, request, **kwargs):
+        self.entered.set()
+        self.release.wait(5)
+        return super().send(request, **kwargs)
+
+
+class QuoteClient(BaseMCPClient):
+    CACHE_TTLS = {"quote": 60}
+
+
+def make_client(adapter):
+    client = QuoteClient(None, "https://api.test", HTTPCache(":memory:"))
+    client.session.mount("https://", adapter)
+    return client
+
+
+def expire(client, seconds_ago):
+    """Make every cached entry expire seconds_ago."""
+    with client.cache._lock, client.cache._conn:
+        client.cache._conn.execute("UPDATE responses SET expires_at = ?", (time.time() - seconds_ago,))
+
+
+def test_fresh_entry_is_served_from_cache():
+    adapter = FakeAdapter(b'{"price": 1}')
+    client = make_client(adapter)
+    
+    assert client._get("quote", "/quote/A") == {"price": 1}
+    assert client._get("quote", "/quote/A") == {"price": 1}
+    assert len(adapter.requests) == 1
+
+
+def test_recently_expired_entry_is_served_after_an_error():
+    adapter = FakeAdapter(b'{"price": 1}', requests.exceptions.ConnectionError("down"))
+    client = make_client(adapter)
+    client._get("quote", "/quote/A")
+    expire(client, 2 * 60)
+    
+    assert client._get("quote", "/quote/A") == {"price": 1}
+
+
+def test_entry_past_the_stale_limit_is_not_served():
+    adapter = FakeAdapter(b'{"price": 1}', requests.exceptions.ConnectionError("down"))
+    client = make_client(adapter)
+    client._get("quote", "/quote/A")
+    expire(client, (QuoteClient.STALE_TTL_MULTIPLE + 1) * 60)
+    
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client._get("quote", "/quote/A")
+
+
+def test_concurrent_identical_gets_share_one_request():
+    adapter = BlockingAdapter(b'{"bars": [1, 2]}')
+    client = make_client(adapter)
+    results = []
+    
+    def fetch():
+        # Uncached endpoint: a caller that missed the flight would re-request
+        results.append(client._get("live", "/live/A"))
+    
+    threads = [threading.Thread(target=fetch) for _ in range(4)]
+    threads[0].start()
+    assert adapter.entered.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    time.sleep(0.2)
+    adapter.release.set()
+    for thread in threads:
+        thread.join(5)
+    
+    assert len(adapter.requests) == 1
+    assert results == [{"bars": [1, 2]}] * 4
+    results[0]["bars"].append(3)
+    assert all(result == {"bars": [1, 2]} for result in results[1:])
+
+
+def test_concurrent_identical_agets_share_one_request():
+    client = make_client(FakeAdapter(b"{}"))
+    requests_seen = []
+    
+    async def handler(request):
+        requests_seen.append(request)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"bars": [1, 2]})
+    
+    async def run():
+        client._async_clients[asyncio.get_running_loop()] = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler)
+        )
+        return await asyncio.gather(*[client._aget("live", "/live/A") for _ in range(4)])
+    
+    results = asyncio.run(run())
+    
+    assert len(requests_seen) == 1
+    assert results == [{"bars": [1, 2]}] * 4
+    results[0]["bars"].append(3)
+    assert all(result == {"bars": [1, 2]} for result in results[1:])
+
+
+def test_circuit_lets_one_probe_through_after_cooldown():
+    adapter = FakeAdapter(requests.exceptions.ConnectionError("down"))
+    client = make_client(adapter)
+    for _ in range(QuoteClient.CIRCUIT_FAILURES):
+        with pytest.raises(requests.exceptions.ConnectionError):
+            client._get("live", "/live/A")
+    
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client._get("live", "/live/A")
+    assert len(adapter.requests) == QuoteClient.CIRCUIT_FAILURES
+    
+    failures, last = client._outages["live"]
+    client._outages["live"] = (failures, last - QuoteClient.CIRCUIT_COOLDOWN)
+    
+    assert not client._circuit_open("live")
+    assert client._circuit_open("live")